@@ -117,10 +117,12 @@ type bls12381G1MultiExp struct{}
 func (c *bls12381G1MultiExp) RequiredGas(input []byte) uint64 {
 	k := len(input) / 160
 	maxDiscountLen := len(params.Bls12381MultiExpDiscountTable)
-	if k >= maxDiscountLen {
-		k = maxDiscountLen - 1
+	// Inputs longer than the table get the last discount, k itself is not
+	// clamped so that gas keeps growing with the number of pairs
+	discount := params.Bls12381MultiExpDiscountTable[maxDiscountLen-1]
+	if k < maxDiscountLen {
+		discount = params.Bls12381MultiExpDiscountTable[k]
 	}
-	discount := params.Bls12381MultiExpDiscountTable[k]
 	return (uint64(k) * params.Bls12381G1MulGas * discount) / 1000
 }
 
@@ -238,12 +240,14 @@ type bls12381G2MultiExp struct{}
 
 // RequiredGas returns the gas required to execute the pre-compiled contract.
 func (c *bls12381G2MultiExp) RequiredGas(input []byte) uint64 {
-	k := len(input) / 160
+	k := len(input) / 288
 	maxDiscountLen := len(params.Bls12381MultiExpDiscountTable)
-	if k >= maxDiscountLen {
-		k = maxDiscountLen
+	// Inputs longer than the table get the last discount, k itself is not
+	// clamped so that gas keeps growing with the number of pairs
+	discount := params.Bls12381MultiExpDiscountTable[maxDiscountLen-1]
+	if k < maxDiscountLen {
+		discount = params.Bls12381MultiExpDiscountTable[k]
 	}
-	discount := params.Bls12381MultiExpDiscountTable[k]
 	return (uint64(k) * params.Bls12381G2MulGas * discount) / 1000
 }
 
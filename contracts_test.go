@@ -22,6 +22,7 @@ import (
 	"math/big"
 	"reflect"
 	"testing"
+	"time"
 
 	"github.com/ethereum/go-ethereum/common"
 	"github.com/ethereum/go-ethereum/core/vm"
@@ -30,6 +31,7 @@ import (
 // precompiledTest defines the input/output pairs for precompiled contract tests.
 type precompiledTest struct {
 	input, expected string
+	gas             uint64
 	name            string
 	noBenchmark     bool // Benchmark primarily the worst-cases
 }
@@ -45,9 +47,15 @@ type precompiledFailureTest struct {
 func testPrecompiled(addr string, test precompiledTest, t *testing.T) {
 	p := PrecompiledContractsBerlinOnly[common.HexToAddress(addr)]
 	in := common.Hex2Bytes(test.input)
+	reqGas := p.RequiredGas(in)
 	contract := vm.NewContract(vm.AccountRef(common.HexToAddress("1337")),
-		nil, new(big.Int), p.RequiredGas(in))
+		nil, new(big.Int), reqGas)
 	t.Run(fmt.Sprintf("%s-Gas=%d", test.name, contract.Gas), func(t *testing.T) {
+		// RunPrecompiledContract uses up the gas of the contract, so the
+		// expected gas is compared against RequiredGas.
+		if test.gas != reqGas {
+			t.Errorf("Expected gas %d, got %d", test.gas, reqGas)
+		}
 		if res, err := vm.RunPrecompiledContract(p, in, contract); err != nil {
 			t.Error(err)
 		} else if common.Bytes2Hex(res) != test.expected {
@@ -80,6 +88,53 @@ func testPrecompiledFailure(addr string, test precompiledFailureTest, t *testing
 	})
 }
 
+func benchmarkPrecompiled(addr string, test precompiledTest, bench *testing.B) {
+	if test.noBenchmark {
+		return
+	}
+	p := PrecompiledContractsBerlinOnly[common.HexToAddress(addr)]
+	in := common.Hex2Bytes(test.input)
+	reqGas := p.RequiredGas(in)
+
+	var (
+		res  []byte
+		err  error
+		data = make([]byte, len(in))
+	)
+
+	bench.Run(fmt.Sprintf("%s-Gas=%d", test.name, reqGas), func(bench *testing.B) {
+		if test.gas != reqGas {
+			bench.Errorf("Expected gas %d, got %d", test.gas, reqGas)
+		}
+		bench.ReportAllocs()
+		start := time.Now()
+		bench.ResetTimer()
+		for i := 0; i < bench.N; i++ {
+			copy(data, in)
+			res, err = p.Run(data)
+		}
+		bench.StopTimer()
+		elapsed := uint64(time.Since(start))
+		if elapsed < 1 {
+			elapsed = 1
+		}
+		gasUsed := reqGas * uint64(bench.N)
+		bench.ReportMetric(float64(reqGas), "gas/op")
+		// Keep it as uint64, multiply 100 to get two digit float later
+		mgasps := (100 * 1000 * gasUsed) / elapsed
+		bench.ReportMetric(float64(mgasps)/100, "mgas/s")
+		// Check if it is correct
+		if err != nil {
+			bench.Error(err)
+			return
+		}
+		if common.Bytes2Hex(res) != test.expected {
+			bench.Errorf("Expected %v, got %v", test.expected, common.Bytes2Hex(res))
+			return
+		}
+	})
+}
+
 func TestPrecompiledBLS12381G1Add(t *testing.T) {
 	for _, test := range blsG1AddTests {
 		testPrecompiled("0a", test, t)
@@ -187,3 +242,57 @@ func TestPrecompiledBLS12381MapG2Fail(t *testing.T) {
 		testPrecompiledFailure("12", test, t)
 	}
 }
+
+func BenchmarkPrecompiledBLS12381G1Add(b *testing.B) {
+	for _, test := range blsG1AddTests {
+		benchmarkPrecompiled("0a", test, b)
+	}
+}
+
+func BenchmarkPrecompiledBLS12381G1Mul(b *testing.B) {
+	for _, test := range blsG1MulTests {
+		benchmarkPrecompiled("0b", test, b)
+	}
+}
+
+func BenchmarkPrecompiledBLS12381G1MultiExp(b *testing.B) {
+	for _, test := range blsG1MultiExpTests {
+		benchmarkPrecompiled("0c", test, b)
+	}
+}
+
+func BenchmarkPrecompiledBLS12381G2Add(b *testing.B) {
+	for _, test := range blsG2AddTests {
+		benchmarkPrecompiled("0d", test, b)
+	}
+}
+
+func BenchmarkPrecompiledBLS12381G2Mul(b *testing.B) {
+	for _, test := range blsG2MulTests {
+		benchmarkPrecompiled("0e", test, b)
+	}
+}
+
+func BenchmarkPrecompiledBLS12381G2MultiExp(b *testing.B) {
+	for _, test := range blsG2MultiExpTests {
+		benchmarkPrecompiled("0f", test, b)
+	}
+}
+
+func BenchmarkPrecompiledBLS12381Pairing(b *testing.B) {
+	for _, test := range blsPairingTests {
+		benchmarkPrecompiled("10", test, b)
+	}
+}
+
+func BenchmarkPrecompiledBLS12381MapG1(b *testing.B) {
+	for _, test := range blsMapG1Tests {
+		benchmarkPrecompiled("11", test, b)
+	}
+}
+
+func BenchmarkPrecompiledBLS12381MapG2(b *testing.B) {
+	for _, test := range blsMapG2Tests {
+		benchmarkPrecompiled("12", test, b)
+	}
+}
@@ -0,0 +1,171 @@
+// Copyright 2017 The go-ethereum Authors
+// This file is part of the go-ethereum library.
+//
+// The go-ethereum library is free software: you can redistribute it and/or modify
+// it under the terms of the GNU Lesser General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// The go-ethereum library is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+// GNU Lesser General Public License for more details.
+//
+// You should have received a copy of the GNU Lesser General Public License
+// along with the go-ethereum library. If not, see <http://www.gnu.org/licenses/>.
+
+package eip2537
+
+import (
+	"bytes"
+	"encoding/binary"
+	"encoding/json"
+	"fmt"
+	"os"
+	"strings"
+	"testing"
+
+	"github.com/ethereum/go-ethereum/common"
+)
+
+// corpusMagic is the prefix of binary vector corpora written by
+// test/gen_eip2537_api_tests.py.
+var corpusMagic = []byte("EIP2537\x02")
+
+// corpusErrors maps non zero error codes of corpus records to precompile
+// errors. Order must match ERRORS of the generator.
+var corpusErrors = []error{
+	errBLS12381InvalidInputLength,
+	errBLS12381InvalidFieldElementTopBytes,
+	errBLS12381InvalidFieldElement,
+	errBLS12381G1PointIsNotOnCurve,
+	errBLS12381G2PointIsNotOnCurve,
+	errBLS12381G1PointSubgroup,
+	errBLS12381G2PointSubgroup,
+}
+
+// corpusRecordHeaderSize is the size of op id, error code, input length,
+// expected length, name length and gas fields of a record.
+const corpusRecordHeaderSize = 1 + 1 + 4 + 4 + 2 + 8
+
+// corpusSection is a section of a binary vector corpus read from disk with
+// address of the precompile its vectors are for.
+type corpusSection struct {
+	name     string
+	addr     string
+	tests    []precompiledTest
+	failures []precompiledFailureTest
+}
+
+// corpusIndex is the json index written next to a binary vector corpus.
+type corpusIndex struct {
+	Sections []struct {
+		Name   string `json:"name"`
+		Op     int    `json:"op"`
+		Offset int    `json:"offset"`
+		Length int    `json:"length"`
+	} `json:"sections"`
+}
+
+// decodeCorpus splits records of a binary vector corpus into tests that are
+// expected to succeed and tests that are expected to fail. Corpora are
+// embedded at compile time so malformed data panics.
+func decodeCorpus(data []byte) ([]precompiledTest, []precompiledFailureTest) {
+	if !bytes.HasPrefix(data, corpusMagic) {
+		panic("invalid vector corpus magic")
+	}
+	return decodeRecords(data[len(corpusMagic):])
+}
+
+// loadCorpus reads a binary vector corpus and its json index, which has the
+// same path with .json extension, and returns vectors of each section.
+func loadCorpus(path string) ([]corpusSection, error) {
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return nil, err
+	}
+	if !bytes.HasPrefix(data, corpusMagic) {
+		return nil, fmt.Errorf("%s: invalid vector corpus magic", path)
+	}
+	blob, err := os.ReadFile(strings.TrimSuffix(path, ".bin") + ".json")
+	if err != nil {
+		return nil, err
+	}
+	var index corpusIndex
+	if err := json.Unmarshal(blob, &index); err != nil {
+		return nil, err
+	}
+	sections := make([]corpusSection, 0, len(index.Sections))
+	for _, s := range index.Sections {
+		if s.Offset < len(corpusMagic) || s.Length < 0 || s.Offset+s.Length > len(data) {
+			return nil, fmt.Errorf("%s: section %s out of bounds", path, s.Name)
+		}
+		tests, failures := decodeRecords(data[s.Offset : s.Offset+s.Length])
+		sections = append(sections, corpusSection{
+			name:     s.Name,
+			addr:     fmt.Sprintf("%02x", s.Op),
+			tests:    tests,
+			failures: failures,
+		})
+	}
+	return sections, nil
+}
+
+// testCorpus runs every test and failure of a binary vector corpus. The test
+// is skipped if the corpus was not generated, hint is the generator flag that
+// generates it.
+func testCorpus(t *testing.T, path, hint string) {
+	sections, err := loadCorpus(path)
+	if os.IsNotExist(err) {
+		t.Skipf("%s not found, generate it with %s", path, hint)
+	}
+	if err != nil {
+		t.Fatal(err)
+	}
+	for _, section := range sections {
+		for _, test := range section.tests {
+			testPrecompiled(section.addr, test, t)
+		}
+		for _, test := range section.failures {
+			testPrecompiledFailure(section.addr, test, t)
+		}
+	}
+}
+
+// decodeRecords splits consecutive corpus records into tests that are expected
+// to succeed and tests that are expected to fail.
+func decodeRecords(data []byte) ([]precompiledTest, []precompiledFailureTest) {
+	var (
+		tests    []precompiledTest
+		failures []precompiledFailureTest
+	)
+	for len(data) > 0 {
+		if len(data) < corpusRecordHeaderSize {
+			panic("truncated vector corpus record")
+		}
+		code := int(data[1])
+		inputLen := int(binary.LittleEndian.Uint32(data[2:]))
+		expectedLen := int(binary.LittleEndian.Uint32(data[6:]))
+		nameLen := int(binary.LittleEndian.Uint16(data[10:]))
+		gas := binary.LittleEndian.Uint64(data[12:])
+		data = data[corpusRecordHeaderSize:]
+		if len(data) < inputLen+expectedLen+nameLen {
+			panic("truncated vector corpus record")
+		}
+		input := common.Bytes2Hex(data[:inputLen])
+		data = data[inputLen:]
+		expected := common.Bytes2Hex(data[:expectedLen])
+		data = data[expectedLen:]
+		name := string(data[:nameLen])
+		data = data[nameLen:]
+		switch {
+		case code == 0:
+			tests = append(tests, precompiledTest{input: input, expected: expected, gas: gas, name: name})
+		case code <= len(corpusErrors):
+			failures = append(failures, precompiledFailureTest{input: input, expectedError: corpusErrors[code-1], name: name})
+		default:
+			panic(fmt.Sprintf("unknown vector corpus error code %d", code))
+		}
+	}
+	return tests, failures
+}
@@ -1,6 +1,6 @@
 module github.com/kilic/eip2537
 
-go 1.12
+go 1.16
 
 require github.com/ethereum/go-ethereum v1.9.14
 
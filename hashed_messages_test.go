@@ -0,0 +1,83 @@
+// Copyright 2017 The go-ethereum Authors
+// This file is part of the go-ethereum library.
+//
+// The go-ethereum library is free software: you can redistribute it and/or modify
+// it under the terms of the GNU Lesser General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// The go-ethereum library is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+// GNU Lesser General Public License for more details.
+//
+// You should have received a copy of the GNU Lesser General Public License
+// along with the go-ethereum library. If not, see <http://www.gnu.org/licenses/>.
+
+package eip2537
+
+import (
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/ethereum/go-ethereum/common"
+)
+
+// Hashed message inputs are written by running
+// `python gen_eip2537_api_tests.py --hash-messages <file>` in test/.
+var hashedMessageInputs = []struct {
+	addr string
+	path string
+	size int
+}{
+	{"11", filepath.Join("testdata", "hashed_map_g1.bin"), 64},
+	{"12", filepath.Join("testdata", "hashed_map_g2.bin"), 128},
+}
+
+// BenchmarkPrecompiledBLS12381MapHashedMessages benchmarks map precompiles
+// with field elements hashed from messages, cycling through all inputs so
+// that time per call is averaged over the input distribution. Each input file
+// is a sub-benchmark that is skipped if the file was not generated.
+func BenchmarkPrecompiledBLS12381MapHashedMessages(b *testing.B) {
+	for _, file := range hashedMessageInputs {
+		file := file
+		b.Run(filepath.Base(file.path), func(b *testing.B) {
+			data, err := os.ReadFile(file.path)
+			if os.IsNotExist(err) {
+				b.Skipf("%s not found, generate it with --hash-messages", file.path)
+			}
+			if err != nil {
+				b.Fatal(err)
+			}
+			if len(data) == 0 || len(data)%file.size != 0 {
+				b.Fatalf("%s: length %d is not a multiple of %d", file.path, len(data), file.size)
+			}
+			n := len(data) / file.size
+			p := PrecompiledContractsBerlinOnly[common.HexToAddress(file.addr)]
+			reqGas := p.RequiredGas(data[:file.size])
+			in := make([]byte, file.size)
+			b.ReportAllocs()
+			start := time.Now()
+			b.ResetTimer()
+			for i := 0; i < b.N; i++ {
+				j := (i % n) * file.size
+				copy(in, data[j:j+file.size])
+				if _, err := p.Run(in); err != nil {
+					b.Fatal(err)
+				}
+			}
+			b.StopTimer()
+			elapsed := uint64(time.Since(start))
+			if elapsed < 1 {
+				elapsed = 1
+			}
+			b.ReportMetric(float64(n), "inputs")
+			b.ReportMetric(float64(reqGas), "gas/op")
+			// Keep it as uint64, multiply 100 to get two digit float later
+			mgasps := (100 * 1000 * reqGas * uint64(b.N)) / elapsed
+			b.ReportMetric(float64(mgasps)/100, "mgas/s")
+		})
+	}
+}
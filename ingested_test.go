@@ -0,0 +1,32 @@
+// Copyright 2017 The go-ethereum Authors
+// This file is part of the go-ethereum library.
+//
+// The go-ethereum library is free software: you can redistribute it and/or modify
+// it under the terms of the GNU Lesser General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// The go-ethereum library is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+// GNU Lesser General Public License for more details.
+//
+// You should have received a copy of the GNU Lesser General Public License
+// along with the go-ethereum library. If not, see <http://www.gnu.org/licenses/>.
+
+package eip2537
+
+import (
+	"path/filepath"
+	"testing"
+)
+
+// ingestedCorpus is written by running
+// `python gen_eip2537_api_tests.py --ingest <files>` in test/.
+var ingestedCorpus = filepath.Join("testdata", "ingested.bin")
+
+// TestPrecompiledBLS12381Ingested runs vector sets of other clients that are
+// ingested into a binary corpus.
+func TestPrecompiledBLS12381Ingested(t *testing.T) {
+	testCorpus(t, ingestedCorpus, "--ingest")
+}
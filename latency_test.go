@@ -0,0 +1,92 @@
+// Copyright 2017 The go-ethereum Authors
+// This file is part of the go-ethereum library.
+//
+// The go-ethereum library is free software: you can redistribute it and/or modify
+// it under the terms of the GNU Lesser General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// The go-ethereum library is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+// GNU Lesser General Public License for more details.
+//
+// You should have received a copy of the GNU Lesser General Public License
+// along with the go-ethereum library. If not, see <http://www.gnu.org/licenses/>.
+
+package eip2537
+
+import (
+	"os"
+	"path/filepath"
+	"reflect"
+	"testing"
+	"time"
+
+	"github.com/ethereum/go-ethereum/common"
+)
+
+// latencyCorpus is written by running
+// `python gen_eip2537_api_tests.py --corpus latency` in test/.
+var latencyCorpus = filepath.Join("testdata", "latency.bin")
+
+// benchmarkPrecompiledFailureTime checks the error of a precompile once and
+// then benchmarks it, returning measured time per call. A failing call still
+// consumes all of its gas so time per gas is reported as for successful calls.
+func benchmarkPrecompiledFailureTime(addr string, test precompiledFailureTest, b *testing.B) time.Duration {
+	p := PrecompiledContractsBerlinOnly[common.HexToAddress(addr)]
+	in := common.Hex2Bytes(test.input)
+	gas := p.RequiredGas(in)
+	var perOp time.Duration
+	b.Run(test.name, func(b *testing.B) {
+		if _, err := p.Run(in); !reflect.DeepEqual(err, test.expectedError) {
+			b.Fatalf("Expected error [%v], got [%v]", test.expectedError, err)
+		}
+		b.ReportAllocs()
+		b.ResetTimer()
+		start := time.Now()
+		for i := 0; i < b.N; i++ {
+			p.Run(in)
+		}
+		elapsed := time.Since(start)
+		b.StopTimer()
+		perOp = elapsed / time.Duration(b.N)
+		b.ReportMetric(float64(elapsed.Nanoseconds())/float64(uint64(b.N)*gas), "ns/gas")
+	})
+	return perOp
+}
+
+// BenchmarkPrecompiledBLS12381Latency benchmarks multiplications with worst
+// case scalars and multi pair inputs that fail at the first, middle or last
+// pair, and logs the worst time per gas of each section.
+func BenchmarkPrecompiledBLS12381Latency(b *testing.B) {
+	sections, err := loadCorpus(latencyCorpus)
+	if os.IsNotExist(err) {
+		b.Skipf("%s not found, generate it with --corpus latency", latencyCorpus)
+	}
+	if err != nil {
+		b.Fatal(err)
+	}
+	for _, section := range sections {
+		p := PrecompiledContractsBerlinOnly[common.HexToAddress(section.addr)]
+		var (
+			worst     float64
+			worstName string
+		)
+		update := func(name, input string, elapsed time.Duration) {
+			perGas := float64(elapsed) / float64(p.RequiredGas(common.Hex2Bytes(input)))
+			if perGas > worst {
+				worst, worstName = perGas, name
+			}
+		}
+		for _, test := range section.tests {
+			update(test.name, test.input, benchmarkPrecompiledTime(section.addr, test, b))
+		}
+		for _, test := range section.failures {
+			update(test.name, test.input, benchmarkPrecompiledFailureTime(section.addr, test, b))
+		}
+		if worstName != "" {
+			b.Logf("%s: worst %.2f ns/gas by %s", section.name, worst, worstName)
+		}
+	}
+}
@@ -0,0 +1,33 @@
+// Copyright 2017 The go-ethereum Authors
+// This file is part of the go-ethereum library.
+//
+// The go-ethereum library is free software: you can redistribute it and/or modify
+// it under the terms of the GNU Lesser General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// The go-ethereum library is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+// GNU Lesser General Public License for more details.
+//
+// You should have received a copy of the GNU Lesser General Public License
+// along with the go-ethereum library. If not, see <http://www.gnu.org/licenses/>.
+
+package eip2537
+
+import (
+	"path/filepath"
+	"testing"
+)
+
+// mapCorpus is written by running
+// `python gen_eip2537_api_tests.py --corpus map` in test/.
+var mapCorpus = filepath.Join("testdata", "map.bin")
+
+// TestPrecompiledBLS12381MapCorpus checks mappings of edge and random field
+// elements to G1 and G2 against the results of the generator's map to curve
+// engine.
+func TestPrecompiledBLS12381MapCorpus(t *testing.T) {
+	testCorpus(t, mapCorpus, "--corpus map")
+}
@@ -0,0 +1,111 @@
+// Copyright 2017 The go-ethereum Authors
+// This file is part of the go-ethereum library.
+//
+// The go-ethereum library is free software: you can redistribute it and/or modify
+// it under the terms of the GNU Lesser General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// The go-ethereum library is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+// GNU Lesser General Public License for more details.
+//
+// You should have received a copy of the GNU Lesser General Public License
+// along with the go-ethereum library. If not, see <http://www.gnu.org/licenses/>.
+
+package eip2537
+
+import (
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/ethereum/go-ethereum/common"
+	"github.com/ethereum/go-ethereum/params"
+)
+
+// multiExpCalibrationCorpus is written by running
+// `python gen_eip2537_api_tests.py --corpus multiexp_calibration` in test/.
+var multiExpCalibrationCorpus = filepath.Join("testdata", "multiexp_calibration.bin")
+
+// benchmarkPrecompiledTime checks the output of a precompile once and then
+// benchmarks it, returning measured time per call. Time per gas is reported
+// along with the usual metrics.
+func benchmarkPrecompiledTime(addr string, test precompiledTest, b *testing.B) time.Duration {
+	p := PrecompiledContractsBerlinOnly[common.HexToAddress(addr)]
+	in := common.Hex2Bytes(test.input)
+	gas := p.RequiredGas(in)
+	var perOp time.Duration
+	b.Run(test.name, func(b *testing.B) {
+		if res, err := p.Run(in); err != nil {
+			b.Fatal(err)
+		} else if common.Bytes2Hex(res) != test.expected {
+			b.Fatalf("Expected %v, got %v", test.expected, common.Bytes2Hex(res))
+		}
+		b.ReportAllocs()
+		b.ResetTimer()
+		start := time.Now()
+		for i := 0; i < b.N; i++ {
+			p.Run(in)
+		}
+		elapsed := time.Since(start)
+		b.StopTimer()
+		perOp = elapsed / time.Duration(b.N)
+		b.ReportMetric(float64(elapsed.Nanoseconds())/float64(uint64(b.N)*gas), "ns/gas")
+	})
+	return perOp
+}
+
+// fitDiscountTable returns a discount table, indexed by number of pairs as
+// RequiredGas does, under which gas of k pairs is proportional to measured[k].
+// The discount of a single pair is kept as anchor, the table is made non
+// increasing and entries that were not measured repeat the previous one.
+func fitDiscountTable(measured []time.Duration, table []uint64) []uint64 {
+	fitted := make([]uint64, len(table))
+	copy(fitted, table)
+	if len(measured) < 2 || measured[1] == 0 {
+		return fitted
+	}
+	for k := 2; k < len(fitted); k++ {
+		fitted[k] = fitted[k-1]
+		if k < len(measured) && measured[k] > 0 {
+			discount := float64(table[1]) * float64(measured[k]) / (float64(k) * float64(measured[1]))
+			if d := uint64(discount + 0.5); d < fitted[k] {
+				fitted[k] = d
+			}
+		}
+	}
+	return fitted
+}
+
+// BenchmarkPrecompiledBLS12381MultiExpCalibration benchmarks multiexp with
+// k = 1, 2, ... pairs of worst case scalars and logs the discount table that
+// fits measured times.
+func BenchmarkPrecompiledBLS12381MultiExpCalibration(b *testing.B) {
+	sections, err := loadCorpus(multiExpCalibrationCorpus)
+	if os.IsNotExist(err) {
+		b.Skipf("%s not found, generate it with --corpus multiexp_calibration", multiExpCalibrationCorpus)
+	}
+	if err != nil {
+		b.Fatal(err)
+	}
+	for _, section := range sections {
+		section := section
+		b.Run(section.name, func(b *testing.B) {
+			if len(section.tests) == 0 {
+				b.Skip("empty section")
+			}
+			pairLen := len(section.tests[0].input)
+			measured := make([]time.Duration, len(section.tests)+1)
+			for _, test := range section.tests {
+				k := len(test.input) / pairLen
+				if k < len(measured) {
+					measured[k] = benchmarkPrecompiledTime(section.addr, test, b)
+				}
+			}
+			b.Logf("fitted discount table: %v", fitDiscountTable(measured, params.Bls12381MultiExpDiscountTable[:]))
+		})
+	}
+}
@@ -0,0 +1,33 @@
+// Copyright 2017 The go-ethereum Authors
+// This file is part of the go-ethereum library.
+//
+// The go-ethereum library is free software: you can redistribute it and/or modify
+// it under the terms of the GNU Lesser General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// The go-ethereum library is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+// GNU Lesser General Public License for more details.
+//
+// You should have received a copy of the GNU Lesser General Public License
+// along with the go-ethereum library. If not, see <http://www.gnu.org/licenses/>.
+
+package eip2537
+
+import (
+	"path/filepath"
+	"testing"
+)
+
+// nonSubgroupCorpus is written by running
+// `python gen_eip2537_api_tests.py --corpus non_subgroup` in test/.
+var nonSubgroupCorpus = filepath.Join("testdata", "non_subgroup.bin")
+
+// TestPrecompiledBLS12381NonSubgroupCorpus checks that pairing rejects each of
+// many distinct G1 and G2 points that are on curve but not in the correct
+// subgroup.
+func TestPrecompiledBLS12381NonSubgroupCorpus(t *testing.T) {
+	testCorpus(t, nonSubgroupCorpus, "--corpus non_subgroup")
+}
@@ -0,0 +1,82 @@
+// Copyright 2017 The go-ethereum Authors
+// This file is part of the go-ethereum library.
+//
+// The go-ethereum library is free software: you can redistribute it and/or modify
+// it under the terms of the GNU Lesser General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// The go-ethereum library is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+// GNU Lesser General Public License for more details.
+//
+// You should have received a copy of the GNU Lesser General Public License
+// along with the go-ethereum library. If not, see <http://www.gnu.org/licenses/>.
+
+package eip2537
+
+import (
+	"math"
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/ethereum/go-ethereum/params"
+)
+
+// pairingCalibrationCorpus is written by running
+// `python gen_eip2537_api_tests.py --corpus pairing_calibration` in test/.
+var pairingCalibrationCorpus = filepath.Join("testdata", "pairing_calibration.bin")
+
+// fitLinear returns intercept and slope of the least squares line through
+// given points.
+func fitLinear(xs, ys []float64) (float64, float64) {
+	var sx, sy, sxx, sxy float64
+	for i := range xs {
+		sx += xs[i]
+		sy += ys[i]
+		sxx += xs[i] * xs[i]
+		sxy += xs[i] * ys[i]
+	}
+	n := float64(len(xs))
+	slope := (n*sxy - sx*sy) / (n*sxx - sx*sx)
+	return (sy - slope*sx) / n, slope
+}
+
+// BenchmarkPrecompiledBLS12381PairingCalibration benchmarks pairing checks of
+// k = 1, 2, 4 .. 256 pairs and logs base and per pair cost fitted to measured
+// times next to the ones of the gas model. The single pair vector has a point
+// at infinity which skips the Miller loop, so it is left out of the fit.
+func BenchmarkPrecompiledBLS12381PairingCalibration(b *testing.B) {
+	sections, err := loadCorpus(pairingCalibrationCorpus)
+	if os.IsNotExist(err) {
+		b.Skipf("%s not found, generate it with --corpus pairing_calibration", pairingCalibrationCorpus)
+	}
+	if err != nil {
+		b.Fatal(err)
+	}
+	for _, section := range sections {
+		var ks, measured []float64
+		for _, test := range section.tests {
+			k := len(test.input) / 768
+			elapsed := benchmarkPrecompiledTime(section.addr, test, b)
+			if k >= 2 && elapsed > 0 {
+				ks = append(ks, float64(k))
+				measured = append(measured, float64(elapsed))
+			}
+		}
+		if len(ks) < 2 {
+			continue
+		}
+		base, perPair := fitLinear(ks, measured)
+		var maxErr float64
+		for i := range ks {
+			maxErr = math.Max(maxErr, math.Abs(base+perPair*ks[i]-measured[i])/measured[i])
+		}
+		b.Logf("fitted base %v, per pair %v, max relative error %.2f%%", time.Duration(base), time.Duration(perPair), 100*maxErr)
+		b.Logf("base to per pair ratio: fitted %.2f, gas model %.2f", base/perPair,
+			float64(params.Bls12381PairingBaseGas)/float64(params.Bls12381PairingPerPairGas))
+	}
+}
@@ -0,0 +1,294 @@
+'''
+Timing comparisons for the curve backends used by EIP2537 test vector generator.
+Run it from this directory: python bench_generator.py
+'''
+
+import hashlib
+import time
+from gen_eip2537_api_tests import sqrt1, sqrt2, test_sqrt1, test_sqrt2
+from eip2537_encoding import concat_list, join_inputs, encode_g1_point_scalar_pair
+from py_ecc.bls12_381 import G1, G2, FQ, FQ2, FQ12, b, b2, add, neg, multiply, pairing, curve_order, is_on_curve
+from bls_field import fp_sqrt, fp2_sqrt, fp2_is_square
+from bls_pairing import pairing_check
+from py_ecc.bls.hash_to_curve import map_to_curve_G1, map_to_curve_G2
+from py_ecc.optimized_bls12_381 import FQ as OptimizedFQ, FQ2 as OptimizedFQ2, multiply_clear_cofactor_G1, multiply_clear_cofactor_G2, normalize as optimized_normalize
+from py_ecc.bls.hash_to_curve import hash_to_field_FQ, hash_to_field_FQ2
+from bls_map import map_to_g1, map_to_g2
+from bls_hash import DST_G1, DST_G2, hash_to_fp, hash_to_fp2
+from bls_curve import J_G1, J_G2, J_INFINITY1, J_INFINITY2, jacobian_add, jacobian_multiply, normalize, batch_normalize, to_jacobian, g1_subgroup_check, g2_subgroup_check, fixed_base_mul, multi_scalar_mul
+
+# scalars that are similar to the ones used in vector generation
+SCALARS = [2, 17, 91, 1001, 91**25, 2**255 - 19]
+
+
+# runs given function and returns elapsed seconds with its result
+def timed(f):
+  start = time.perf_counter()
+  r = f()
+  return time.perf_counter() - start, r
+
+
+# prints a single comparison line
+def report(name, base, new):
+  print("{:<36} {:>10.4f}s {:>10.4f}s {:>8.2f}x".format(name, base, new,
+                                                        base / new))
+
+
+# sums scalar multiples of a base point with given add and multiply
+def sum_of_multiples(p, inf, add_fn, mul_fn):
+  acc = inf
+  for e in SCALARS:
+    acc = add_fn(mul_fn(p, e), acc)
+  return acc
+
+
+# compares affine py_ecc arithmetic with jacobian arithmetic
+def bench_jacobian():
+  print("{:<36} {:>11} {:>11} {:>9}".format("jacobian vs affine", "affine",
+                                            "jacobian", "speedup"))
+  for name, p, jp, jinf in (("g1", G1, J_G1, J_INFINITY1), ("g2", G2, J_G2,
+                                                            J_INFINITY2)):
+    t0, r0 = timed(lambda: sum_of_multiples(p, None, add, multiply))
+    t1, r1 = timed(lambda: normalize(
+        sum_of_multiples(jp, jinf, jacobian_add, jacobian_multiply)))
+    assert r0 == r1
+    report("{} sum of {} multiples".format(name, len(SCALARS)), t0, t1)
+
+
+# returns points with given x coordinates that are on curve
+# points are not cleared so they are mostly out of subgroup
+# for fq2 exponent (q + 7) / 16 finds only some of the roots which is enough here
+def points_on_curve(field, curve_b, xs):
+  p = field.field_modulus
+  e = (p * p + 7) // 16 if field is FQ2 else (p + 1) // 4
+  points = []
+  for x in xs:
+    x = field.one() * x
+    y2 = x * x * x + curve_b
+    y = y2**e
+    if y * y == y2:
+      points.append((x, y))
+  return points
+
+
+# cross checks endomorphism based subgroup checks with multiplication by curve order
+# and compares their timings
+def bench_subgroup_checks():
+  print("{:<36} {:>11} {:>11} {:>9}".format("endomorphism subgroup check",
+                                            "slow", "fast", "speedup"))
+  cases = (
+      ("g1", FQ, b, G1, g1_subgroup_check),
+      ("g2", FQ2, b2, G2, g2_subgroup_check),
+  )
+  for name, field, curve_b, g, fast_check in cases:
+    points = [multiply(g, e) for e in SCALARS[:3]]
+    outliers = points_on_curve(field, curve_b, range(1, 40))
+    points += outliers + [add(points[0], q) for q in outliers]
+    assert all(is_on_curve(p, curve_b) for p in points)
+    t0, r0 = timed(lambda: [multiply(p, curve_order) is None for p in points])
+    t1, r1 = timed(lambda: [fast_check(to_jacobian(p, field)) for p in points])
+    assert r0 == r1
+    assert any(r0) and not all(r0)
+    report("{} {} points".format(name, len(points)), t0, t1)
+
+
+# compares generator multiples computed with double and add and fixed base tables
+# table building time is included in fixed base timing
+def bench_fixed_base():
+  print("{:<36} {:>11} {:>11} {:>9}".format("fixed base multiplication",
+                                            "double-add", "table", "speedup"))
+  scalars = [(91**i) % curve_order for i in range(1, 101)]
+  for name, g, n in (("g1", J_G1, 100), ("g2", J_G2, 20)):
+    t0, r0 = timed(lambda: [jacobian_multiply(g, e) for e in scalars[:n]])
+    t1, r1 = timed(lambda: [fixed_base_mul(g, e) for e in scalars[:n]])
+    assert [normalize(p) for p in r0] == [normalize(p) for p in r1]
+    report("{} {} multiples".format(name, n), t0, t1)
+    t3, _ = timed(lambda: [fixed_base_mul(g, e) for e in scalars[:n]])
+    report("{} {} multiples, table reused".format(name, n), t0, t3)
+
+
+# returns sum of scalars[i] * bases[i] with independent multiplications
+def sum_of_multiples_of(bases, scalars, inf):
+  acc = inf
+  for p, e in zip(bases, scalars):
+    acc = jacobian_add(jacobian_multiply(p, e), acc)
+  return acc
+
+
+# cross checks bucket method with naive sum of multiples and compares their timings
+def bench_multi_scalar_mul():
+  print("{:<36} {:>11} {:>11} {:>9}".format("multi scalar multiplication",
+                                            "naive", "pippenger", "speedup"))
+  cases = (("g1", J_G1, J_INFINITY1, (1, 3, 25, 128)), ("g2", J_G2, J_INFINITY2,
+                                                        (1, 3, 25)))
+  for name, g, inf, sizes in cases:
+    for k in sizes:
+      bases = [fixed_base_mul(g, 1001 + i) for i in range(k)]
+      scalars = [(91**(i + 1) * 0xffffffff) % 2**256 for i in range(k)]
+      t0, r0 = timed(lambda: sum_of_multiples_of(bases, scalars, inf))
+      t1, r1 = timed(lambda: multi_scalar_mul(bases, scalars))
+      assert normalize(r0) == normalize(r1)
+      report("{} k={}".format(name, k), t0, t1)
+
+
+# compares per point normalization with batch normalization that shares a
+# single inversion between all points
+def bench_batch_normalize():
+  print("{:<36} {:>11} {:>11} {:>9}".format("affine conversion", "per point",
+                                            "batch", "speedup"))
+  for name, g, n in (("g1", J_G1, 256), ("g2", J_G2, 256)):
+    points = [fixed_base_mul(g, 91**(i + 1)) for i in range(n)]
+    t0, r0 = timed(lambda: [normalize(p) for p in points])
+    t1, r1 = timed(lambda: batch_normalize(points))
+    assert r0 == r1
+    report("{} {} points".format(name, n), t0, t1)
+
+
+# input assembly and formatting as vector builders did before join_inputs
+def assemble_quadratic(pair, k):
+  acc_input = []
+  for _ in range(k):
+    acc_input = acc_input + pair
+  res = ""
+  for i, s in enumerate(acc_input):
+    res += "\"{}\"".format(s)
+    if i + 1 != len(acc_input):
+      res += " +\n"
+  return res
+
+
+# input assembly and formatting with join_inputs
+def assemble_linear(pair, k):
+  return concat_list(join_inputs(pair for _ in range(k)))
+
+
+# shows that time per pair of input assembly stays constant as k grows
+# same encoded pair is reused so that only assembly is measured
+def bench_input_assembly():
+  print("{:<36} {:>11} {:>11} {:>9}".format("input assembly", "quadratic",
+                                            "linear", "us/pair"))
+  pair = encode_g1_point_scalar_pair(J_G1, 91)
+  for k in (10, 100, 1000, 10000):
+    t0, r0 = timed(lambda: assemble_quadratic(pair, k))
+    t1, r1 = timed(lambda: assemble_linear(pair, k))
+    assert r0 == r1
+    print("{:<36} {:>10.4f}s {:>10.4f}s {:>9.3f}".format(
+        "k={}".format(k), t0, t1, t1 * 1e6 / k))
+
+
+# compares square roots of py_ecc FQ/FQ2 elements with integer backed ones
+# inputs are curve equation values x^3 + b of consecutive x as point searches use
+def bench_field():
+  test_sqrt1()
+  test_sqrt2()
+  print("{:<36} {:>11} {:>11} {:>9}".format("square root", "FQ", "int",
+                                            "speedup"))
+  xs = [FQ(i) for i in range(1, 201)]
+  ys = [x * x * x + b for x in xs]
+  t0, r0 = timed(lambda: [sqrt1(y) for y in ys])
+  t1, r1 = timed(lambda: [fp_sqrt(y.n) for y in ys])
+  assert [r if r is None else r.n for r in r0] == r1
+  report("fp {} candidates".format(len(ys)), t0, t1)
+  xs = [FQ2([i, j]) for i in range(1, 11) for j in range(2)]
+  ys = [x * x * x + b2 for x in xs]
+  t0, r0 = timed(lambda: [sqrt2(y) for y in ys])
+  t1, r1 = timed(lambda: [fp2_sqrt(tuple(c.n for c in y.coeffs)) for y in ys])
+  assert [r is None for r in r0] == [r is None for r in r1]
+  for r, y in zip(r1, ys):
+    assert r is None or FQ2(list(r))**2 == y
+  report("fp2 {} candidates".format(len(ys)), t0, t1)
+  t2, r2 = timed(
+      lambda: [fp2_is_square(tuple(c.n for c in y.coeffs)) for y in ys])
+  assert r2 == [r is not None for r in r1]
+  report("fp2 {} quadratic character tests".format(len(ys)), t0, t2)
+
+
+# returns py_ecc point pair with integer backed coordinates
+def int_pair(p, q):
+  return ((p[0].n, p[1].n), tuple(tuple(c.n for c in e.coeffs) for e in q))
+
+
+# compares product of py_ecc pairings with batched pairing check
+# pairs are e(s_i * G1, G2) with a last pair that makes the product one or not
+def bench_pairing():
+  print("{:<36} {:>11} {:>11} {:>9}".format("pairing check", "py_ecc",
+                                            "batched", "speedup"))
+  for k in (2, 4):
+    for valid in (True, False):
+      pairs = [(multiply(G1, 11 + i), G2) for i in range(k - 1)]
+      s = sum(11 + i for i in range(k - 1)) + (0 if valid else 1)
+      pairs.append((multiply(G1, s), neg(G2)))
+
+      def product_of_pairings():
+        r = FQ12.one()
+        for p, q in pairs:
+          r = r * pairing(q, p)
+        return r == FQ12.one()
+
+      t0, r0 = timed(product_of_pairings)
+      t1, r1 = timed(lambda: pairing_check([int_pair(p, q) for p, q in pairs]))
+      assert r0 == r1 == valid
+      report("k={} {}".format(k, "true" if valid else "false"), t0, t1)
+
+
+# compares py_ecc map to curve and cofactor multiplication with integer backed
+# map to curve that clears G2 cofactor with psi endomorphism
+def bench_map_to_curve():
+  print("{:<36} {:>11} {:>11} {:>9}".format("map to curve", "py_ecc", "int",
+                                            "speedup"))
+  us = [91**(i + 1) % curve_order for i in range(20)]
+
+  def py_ecc_g1():
+    return [
+        optimized_normalize(
+            multiply_clear_cofactor_G1(map_to_curve_G1(OptimizedFQ(u))))
+        for u in us
+    ]
+
+  t0, r0 = timed(py_ecc_g1)
+  t1, r1 = timed(lambda: [map_to_g1(u) for u in us])
+  assert [(int(p[0]), int(p[1])) for p in r0] == r1
+  report("g1 {} elements".format(len(us)), t0, t1)
+
+  def py_ecc_g2():
+    r = []
+    for u in us:
+      p = map_to_curve_G2(OptimizedFQ2([u, u + 1]))
+      r.append(optimized_normalize(multiply_clear_cofactor_G2(p)))
+    return r
+
+  t0, r0 = timed(py_ecc_g2)
+  t1, r1 = timed(lambda: [map_to_g2((u, u + 1)) for u in us])
+  assert [tuple(tuple(e.coeffs) for e in p) for p in r0] == r1
+  report("g2 {} elements".format(len(us)), t0, t1)
+
+
+# compares py_ecc hash to field with the one that reuses hash state of the
+# zero padded block
+def bench_hash_to_field():
+  print("{:<36} {:>11} {:>11} {:>9}".format("hash to field", "py_ecc", "int",
+                                            "speedup"))
+  msgs = [b"message %d" % i for i in range(10000)]
+  t0, r0 = timed(
+      lambda: [hash_to_field_FQ(m, 2, DST_G1, hashlib.sha256) for m in msgs])
+  t1, r1 = timed(lambda: [hash_to_fp(m) for m in msgs])
+  assert [[int(e) for e in u] for u in r0] == r1
+  report("fp {} messages".format(len(msgs)), t0, t1)
+  t0, r0 = timed(
+      lambda: [hash_to_field_FQ2(m, 2, DST_G2, hashlib.sha256) for m in msgs])
+  t1, r1 = timed(lambda: [hash_to_fp2(m) for m in msgs])
+  assert [[tuple(e.coeffs) for e in u] for u in r0] == r1
+  report("fp2 {} messages".format(len(msgs)), t0, t1)
+
+
+if __name__ == "__main__":
+  bench_jacobian()
+  bench_subgroup_checks()
+  bench_fixed_base()
+  bench_multi_scalar_mul()
+  bench_batch_normalize()
+  bench_input_assembly()
+  bench_field()
+  bench_pairing()
+  bench_map_to_curve()
+  bench_hash_to_field()
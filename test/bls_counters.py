@@ -0,0 +1,165 @@
+'''
+Operation counters for field arithmetic used by EIP2537 test vector generator.
+Multiplications, squarings, inversions and exponentiations of the integer
+backed fields of bls_field and bls_pairing and of py_ecc field elements are
+counted per field with keys such as "fp2.mul". Counts are of calls at every
+level of the tower, so an fp12 multiplication also counts the fp6 and fp2
+multiplications it is made of, and products with small integers are not
+counted. Instrumentation is installed only within counting() so that normal
+runs pay nothing for it, and only into CONSUMERS and the modules given to it.
+'''
+
+import collections
+import contextlib
+import bls_curve
+import bls_field
+import bls_map
+import bls_pairing
+from py_ecc.fields.field_elements import FQ, FQP
+
+# integer backed field functions by module and operation they are counted as
+INT_OPS = {
+    bls_field: {
+        "fp_mul": ("fp", "mul"),
+        "fp_sqr": ("fp", "sqr"),
+        "fp_inv": ("fp", "inv"),
+        "fp_pow": ("fp", "exp"),
+        "fp_legendre": ("fp", "exp"),
+        "fp_sqrt": ("fp", "exp"),
+        "fp2_mul": ("fp2", "mul"),
+        "fp2_mul_fp": ("fp2", "mul"),
+        "fp2_sqr": ("fp2", "sqr"),
+        "fp2_inv": ("fp2", "inv"),
+        "fp2_pow": ("fp2", "exp"),
+        "fp2_is_square": ("fp2", "exp"),
+        "fp2_sqrt": ("fp2", "exp"),
+        "fp6_mul": ("fp6", "mul"),
+        "fp6_mul_by_01": ("fp6", "mul"),
+        "fp6_mul_by_1": ("fp6", "mul"),
+        "fp6_sqr": ("fp6", "sqr"),
+        "fp6_inv": ("fp6", "inv"),
+        "fp12_mul": ("fp12", "mul"),
+        "fp12_mul_by_014": ("fp12", "mul"),
+        "fp12_sqr": ("fp12", "sqr"),
+        "fp12_cyclotomic_sqr": ("fp12", "sqr"),
+        "fp12_inv": ("fp12", "inv"),
+    },
+    bls_pairing: {
+        "cyclotomic_exp_by_u": ("fp12", "exp"),
+    },
+}
+
+# modules whose integer backed field functions and field tables are replaced,
+# functions are looked up in module globals when called so calls within
+# bls_field and calls through module attributes are counted as well
+CONSUMERS = [bls_field, bls_curve, bls_map, bls_pairing]
+
+
+# returns field name of a py_ecc field element
+def field_name(a):
+  if isinstance(a, FQP):
+    return "fp{}".format(a.degree)
+  return "fp"
+
+
+# returns wrapper of an integer backed function that counts its calls
+def count_calls(counts, f, key):
+
+  def counted(*args):
+    counts[key] += 1
+    return f(*args)
+
+  return counted
+
+
+# returns wrapper of py_ecc multiplication, products of an element with itself
+# are squarings and products with ints are not counted
+def count_mul(counts, f):
+
+  def counted(a, b):
+    if b is a:
+      counts[field_name(a) + ".sqr"] += 1
+    elif not isinstance(b, int):
+      counts[field_name(a) + ".mul"] += 1
+    return f(a, b)
+
+  return counted
+
+
+# returns wrapper of py_ecc fp division which is an inversion and a product
+def count_div(counts, f):
+
+  def counted(a, b):
+    if not isinstance(b, int):
+      counts["fp.inv"] += 1
+      counts["fp.mul"] += 1
+    return f(a, b)
+
+  return counted
+
+
+# returns wrapper of py_ecc method counted as given operation
+def count_op(counts, f, op):
+
+  def counted(a, *args):
+    counts[field_name(a) + "." + op] += 1
+    return f(a, *args)
+
+  return counted
+
+
+# installs counting wrappers and returns a function that restores originals
+# integer backed functions and field tables of bls_curve are replaced in
+# CONSUMERS and given modules under whatever name they are bound to, py_ecc
+# methods are replaced on field classes
+def install(counts, modules=()):
+  replaced = []
+  # wrappers by id of the function or table they replace
+  wrappers = {}
+  for module, ops in INT_OPS.items():
+    for name, (field, op) in ops.items():
+      f = getattr(module, name)
+      wrappers[id(f)] = count_calls(counts, f, field + "." + op)
+  for name in ("FP", "FP2"):
+    table = getattr(bls_curve, name)
+    wrappers[id(table)] = table._replace(**{
+        k: wrappers[id(f)]
+        for k, f in table._asdict().items()
+        if id(f) in wrappers
+    })
+  for m in CONSUMERS + [m for m in modules if m not in CONSUMERS]:
+    for name, f in list(vars(m).items()):
+      wrapper = wrappers.get(id(f))
+      if wrapper is not None:
+        replaced.append((m, name, f))
+        setattr(m, name, wrapper)
+  methods = [
+      (FQ, "__mul__", count_mul(counts, FQ.__mul__)),
+      (FQ, "__div__", count_div(counts, FQ.__div__)),
+      (FQ, "__pow__", count_op(counts, FQ.__pow__, "exp")),
+      (FQP, "__mul__", count_mul(counts, FQP.__mul__)),
+      (FQP, "inv", count_op(counts, FQP.inv, "inv")),
+      (FQP, "__pow__", count_op(counts, FQP.__pow__, "exp")),
+  ]
+  for cls, name, wrapper in methods:
+    replaced.append((cls, name, cls.__dict__[name]))
+    setattr(cls, name, wrapper)
+
+  def uninstall():
+    for target, name, f in reversed(replaced):
+      setattr(target, name, f)
+
+  return uninstall
+
+
+# counts field operations done within the block into the yielded counter
+# modules other than CONSUMERS that call field functions, such as the
+# generator, are given in modules
+@contextlib.contextmanager
+def counting(modules=()):
+  counts = collections.Counter()
+  uninstall = install(counts, modules)
+  try:
+    yield counts
+  finally:
+    uninstall()
@@ -0,0 +1,382 @@
+'''
+Jacobian coordinate arithmetic for BLS12-381 G1 and G2 points.
+A point is represented as (X, Y, Z) triple which corresponds to the affine
+point (X / Z^2, Y / Z^3). Point at infinity has Z = 0. Since both G1 and G2
+curves have a = 0 the same formulas work with coordinates of any field, they
+are written against the Field table of the point's coordinates so that
+py_ecc FQ and FQ2 points and integer backed fp and fp2 points of bls_field
+share one implementation.
+Subgroup checks use GLV endomorphism for G1 and psi endomorphism for G2
+instead of multiplying points by the curve order. Multiples of fixed bases
+such as generators are computed with precomputed window tables and
+multi scalar multiplications are computed with bucket method.
+'''
+
+import collections
+import math
+import operator
+from py_ecc.bls12_381 import G1, G2, FQ, FQ2, curve_order
+from bls_field import P, FP2_ZERO, FP2_ONE, fp_add, fp_sub, fp_neg, fp_mul, fp_sqr, fp_inv, fp_sqrt, fp2_add, fp2_sub, fp2_neg, fp2_conjugate, fp2_mul, fp2_sqr, fp2_inv, fp2_sqrt
+
+# absolute value of BLS12-381 curve parameter, parameter itself is negative
+# u = -0xd201000000010000
+U_ABS = 0xd201000000010000
+
+# cube root of unity in Fp that satisfies phi(P) = -u^2 * P for P in G1
+BETA = FQ(
+    0x5f19672fdf76ce51ba69c6076a0f77eaddb3a93be6f89688de17d813620a00022e01fffffffefffe
+)
+
+# psi endomorphism coefficients
+# PSI_X = 1 / (1 + i) ^ ((p - 1) / 3)
+# PSI_Y = 1 / (1 + i) ^ ((p - 1) / 2)
+PSI_X = FQ2([
+    0,
+    0x1a0111ea397fe699ec02408663d4de85aa0d857d89759ad4897d29650fb85f9b409427eb4f49fffd8bfd00000000aaad
+])
+PSI_Y = FQ2([
+    0x135203e60180a68ee2e9c448d77a2cd91c3dedd930b1cf60ef396489f61eb45e304466cf3e67fa0af1ee7b04121bdea2,
+    0x06af0e0437ff400b6831e36d6bd17ffe48395dabc2d3435e77f76e17009241c5ee67992f72ec05f4c81084fbede3cc09
+])
+
+
+# returns integer coefficients of a py_ecc FQ2 element as fp2 element
+def fq2_to_fp2(a):
+  return (int(a.coeffs[0]) % P, int(a.coeffs[1]) % P)
+
+
+# cube root of unity and psi endomorphism coefficients by type of coordinates
+# of a point
+BETA_COEFFS = {FQ: BETA, int: BETA.n}
+PSI_COEFFS = {
+    FQ2: (PSI_X, PSI_Y),
+    tuple: (fq2_to_fp2(PSI_X), fq2_to_fp2(PSI_Y)),
+}
+
+# arithmetic of a field that point formulas are written against
+# conjugate is only given for quadratic extension fields
+Field = collections.namedtuple("Field", [
+    "zero", "one", "add", "sub", "neg", "mul", "sqr", "inv", "sqrt", "conjugate"
+],
+                               defaults=[None])
+
+# integer backed fields of bls_field
+FP = Field(0, 1, fp_add, fp_sub, fp_neg, fp_mul, fp_sqr, fp_inv, fp_sqrt)
+FP2 = Field(FP2_ZERO, FP2_ONE, fp2_add, fp2_sub, fp2_neg, fp2_mul, fp2_sqr,
+            fp2_inv, fp2_sqrt, fp2_conjugate)
+
+
+def fq_sqr(a):
+  return a * a
+
+
+def fq_inv(a):
+  return type(a).one() / a
+
+
+# conjugate of fq2 element
+def fq2_conjugate(a):
+  return FQ2([a.coeffs[0], -a.coeffs[1]])
+
+
+# py_ecc fields, square roots of py_ecc elements are not needed by formulas
+PY_ECC_FQ = Field(FQ.zero(), FQ.one(), operator.add, operator.sub, operator.neg,
+                  operator.mul, fq_sqr, fq_inv, None)
+PY_ECC_FQ2 = Field(FQ2.zero(), FQ2.one(), operator.add, operator.sub,
+                   operator.neg, operator.mul, fq_sqr, fq_inv, None,
+                   fq2_conjugate)
+
+
+# returns field of a jacobian point from the type of its z coordinate
+# fields are looked up when called so that tables replaced by bls_counters are
+# used
+def point_field(p):
+  z = p[2]
+  if isinstance(z, int):
+    return FP
+  if isinstance(z, tuple):
+    return FP2
+  if isinstance(z, FQ2):
+    return PY_ECC_FQ2
+  return PY_ECC_FQ
+
+
+# returns jacobian point at infinity of a field
+def infinity(F):
+  return (F.one, F.one, F.zero)
+
+
+# converts affine py_ecc point into jacobian coordinates
+# py_ecc represents point at infinity with None so field of the point must be given
+def to_jacobian(p, field):
+  if p is None:
+    return (field.one(), field.one(), field.zero())
+  return (p[0], p[1], field.one())
+
+
+# jacobian generators and points at infinity
+J_G1 = to_jacobian(G1, FQ)
+J_G2 = to_jacobian(G2, FQ2)
+J_INFINITY1 = to_jacobian(None, FQ)
+J_INFINITY2 = to_jacobian(None, FQ2)
+
+
+# returns true if given jacobian point is point at infinity
+def is_infinity(p):
+  return p[2] == point_field(p).zero
+
+
+# converts jacobian point to affine py_ecc point
+# affine points and None are returned as they are
+def normalize(p):
+  if p is None or len(p) == 2:
+    return p
+  if is_infinity(p):
+    return None
+  F = point_field(p)
+  x, y, z = p
+  z_inv = F.inv(z)
+  z_inv2 = F.sqr(z_inv)
+  return (F.mul(x, z_inv2), F.mul(F.mul(y, z_inv2), z_inv))
+
+
+# converts a list of jacobian points to affine py_ecc points with a single
+# inversion that is shared by all points (Montgomery's trick)
+# products of z coordinates are accumulated, their product is inverted and
+# inverse of each z is recovered walking back the prefix products
+# affine points, None and points at infinity are returned as normalize does
+def batch_normalize(points):
+  out = [
+      normalize(p) if p is None or len(p) == 2 or is_infinity(p) else p
+      for p in points
+  ]
+  indices = [i for i, p in enumerate(out) if p is not None and len(p) == 3]
+  if not indices:
+    return out
+  F = point_field(out[indices[0]])
+  prefix = [out[indices[0]][2]]
+  for i in indices[1:]:
+    prefix.append(F.mul(prefix[-1], out[i][2]))
+  inv = F.inv(prefix[-1])
+  for j in range(len(indices) - 1, -1, -1):
+    x, y, z = out[indices[j]]
+    z_inv = F.mul(inv, prefix[j - 1]) if j > 0 else inv
+    inv = F.mul(inv, z)
+    z_inv2 = F.sqr(z_inv)
+    out[indices[j]] = (F.mul(x, z_inv2), F.mul(F.mul(y, z_inv2), z_inv))
+  return out
+
+
+# checks equality of two jacobian points without inversion
+def jacobian_eq(p, q):
+  p_inf, q_inf = is_infinity(p), is_infinity(q)
+  if p_inf or q_inf:
+    return p_inf and q_inf
+  F = point_field(p)
+  x1, y1, z1 = p
+  x2, y2, z2 = q
+  z1z1, z2z2 = F.sqr(z1), F.sqr(z2)
+  if F.mul(x1, z2z2) != F.mul(x2, z1z1):
+    return False
+  return F.mul(F.mul(y1, z2z2), z2) == F.mul(F.mul(y2, z1z1), z1)
+
+
+# returns -p
+def jacobian_neg(p):
+  return (p[0], point_field(p).neg(p[1]), p[2])
+
+
+# returns 2 * p
+# http://hyperelliptic.org/EFD/g1p/auto-shortw-jacobian-0.html#doubling-dbl-2009-l
+def jacobian_double(p):
+  if is_infinity(p):
+    return p
+  F = point_field(p)
+  x, y, z = p
+  a = F.sqr(x)
+  b = F.sqr(y)
+  c = F.sqr(b)
+  t = F.add(x, b)
+  d = F.sub(F.sub(F.sqr(t), a), c)
+  d = F.add(d, d)
+  e = F.add(F.add(a, a), a)
+  x3 = F.sub(F.sqr(e), F.add(d, d))
+  c8 = F.add(c, c)
+  c8 = F.add(c8, c8)
+  c8 = F.add(c8, c8)
+  y3 = F.sub(F.mul(e, F.sub(d, x3)), c8)
+  z3 = F.mul(y, z)
+  return (x3, y3, F.add(z3, z3))
+
+
+# returns p + q
+# http://hyperelliptic.org/EFD/g1p/auto-shortw-jacobian-0.html#addition-add-2007-bl
+def jacobian_add(p, q):
+  if is_infinity(p):
+    return q
+  if is_infinity(q):
+    return p
+  F = point_field(p)
+  x1, y1, z1 = p
+  x2, y2, z2 = q
+  z1z1 = F.sqr(z1)
+  z2z2 = F.sqr(z2)
+  u1 = F.mul(x1, z2z2)
+  u2 = F.mul(x2, z1z1)
+  s1 = F.mul(F.mul(y1, z2), z2z2)
+  s2 = F.mul(F.mul(y2, z1), z1z1)
+  h = F.sub(u2, u1)
+  r = F.sub(s2, s1)
+  if h == F.zero:
+    if r == F.zero:
+      return jacobian_double(p)
+    return infinity(F)
+  i = F.sqr(F.add(h, h))
+  j = F.mul(h, i)
+  r = F.add(r, r)
+  v = F.mul(u1, i)
+  x3 = F.sub(F.sub(F.sqr(r), j), F.add(v, v))
+  s1j = F.mul(s1, j)
+  y3 = F.sub(F.mul(r, F.sub(v, x3)), F.add(s1j, s1j))
+  t = F.add(z1, z2)
+  z3 = F.mul(F.sub(F.sub(F.sqr(t), z1z1), z2z2), h)
+  return (x3, y3, z3)
+
+
+# returns n * p with left to right double and add
+# scalar is not reduced by curve order so that it can be used for points out of subgroup
+def jacobian_multiply(p, n):
+  if n < 0:
+    return jacobian_multiply(jacobian_neg(p), -n)
+  r = infinity(point_field(p))
+  for bit in bin(n)[2:]:
+    r = jacobian_double(r)
+    if bit == '1':
+      r = jacobian_add(r, p)
+  return r
+
+
+# window size in bits of fixed base tables
+FIXED_BASE_WINDOW = 4
+
+# fixed base tables that are built on demand, keyed by base point coordinates
+fixed_base_tables = {}
+
+
+# returns coordinates of a jacobian point as integers to be used as dictionary key
+def point_key(p):
+  return tuple(
+      c.n if hasattr(c, 'n') else tuple(e.n for e in c.coeffs) for c in p)
+
+
+# builds window table of a base point
+# table[i][d] = d * 2^(w * i) * p for each window i and digit d
+def build_fixed_base_table(p):
+  w = FIXED_BASE_WINDOW
+  n_windows = (curve_order.bit_length() + w - 1) // w
+  table = []
+  base = p
+  for _ in range(n_windows):
+    row = [infinity(point_field(p)), base]
+    for _ in range(2, 1 << w):
+      row.append(jacobian_add(row[-1], base))
+    table.append(row)
+    base = jacobian_double(row[1 << (w - 1)])
+  return table
+
+
+# returns table of a base point, table is built only once
+def fixed_base_table(p):
+  key = point_key(p)
+  table = fixed_base_tables.get(key)
+  if table is None:
+    table = build_fixed_base_table(p)
+    fixed_base_tables[key] = table
+  return table
+
+
+# returns k * gen using precomputed window table of gen
+# gen must be in the correct subgroup since scalar is reduced by curve order
+def fixed_base_mul(gen, k):
+  table = fixed_base_table(gen)
+  w = FIXED_BASE_WINDOW
+  mask = (1 << w) - 1
+  k = k % curve_order
+  r = table[0][0]
+  i = 0
+  while k:
+    d = k & mask
+    if d:
+      r = jacobian_add(r, table[i][d])
+    k >>= w
+    i += 1
+  return r
+
+
+# returns window size of bucket method for given number of pairs
+def msm_window_size(n):
+  if n < 32:
+    return 3
+  return int(math.log(n)) + 2
+
+
+# returns sum of scalars[i] * points[i] with bucket method (Pippenger)
+# scalars are not reduced by curve order
+def multi_scalar_mul(points, scalars, window=None):
+  assert len(points) == len(scalars) and len(points) > 0
+  if len(points) == 1:
+    return jacobian_multiply(points[0], scalars[0])
+  zero = infinity(point_field(points[0]))
+  c = window or msm_window_size(len(points))
+  mask = (1 << c) - 1
+  n_bits = max(e.bit_length() for e in scalars)
+  r = zero
+  for shift in reversed(range(0, n_bits, c)):
+    for _ in range(c):
+      r = jacobian_double(r)
+    buckets = [zero] * mask
+    for p, e in zip(points, scalars):
+      d = (e >> shift) & mask
+      if d:
+        buckets[d - 1] = jacobian_add(buckets[d - 1], p)
+    # sum of j * buckets[j - 1] with running sums
+    running, window_sum = zero, zero
+    for bucket in reversed(buckets):
+      running = jacobian_add(running, bucket)
+      window_sum = jacobian_add(window_sum, running)
+    r = jacobian_add(r, window_sum)
+  return r
+
+
+# GLV endomorphism on G1, (x, y) -> (beta * x, y)
+def phi(p):
+  return (point_field(p).mul(p[0], BETA_COEFFS[type(p[2])]), p[1], p[2])
+
+
+# untwist-frobenius-twist endomorphism on G2
+def psi(p):
+  F = point_field(p)
+  psi_x, psi_y = PSI_COEFFS[type(p[2])]
+  x, y, z = p
+  return (F.mul(F.conjugate(x), psi_x), F.mul(F.conjugate(y),
+                                              psi_y), F.conjugate(z))
+
+
+# subgroup check g1 with endomorphism
+# p is in G1 iff phi(p) == -u^2 * p
+# https://eprint.iacr.org/2021/1130.pdf
+def g1_subgroup_check(p):
+  if is_infinity(p):
+    return True
+  t = jacobian_multiply(jacobian_multiply(p, U_ABS), U_ABS)
+  return jacobian_eq(phi(p), jacobian_neg(t))
+
+
+# subgroup check g2 with endomorphism
+# q is in G2 iff psi(q) == u * q
+# https://eprint.iacr.org/2021/1130.pdf
+def g2_subgroup_check(p):
+  if is_infinity(p):
+    return True
+  t = jacobian_multiply(p, U_ABS)
+  return jacobian_eq(psi(p), jacobian_neg(t))
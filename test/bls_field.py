@@ -0,0 +1,340 @@
+'''
+Integer backed arithmetic for BLS12-381 base field Fp and its quadratic
+extension Fp2 = Fp[i] / (i^2 + 1).
+Fp elements are python ints in [0, p) and Fp2 elements are (c0, c1) tuples
+of Fp elements. Unlike py_ecc field elements no objects are allocated other
+than ints and exponentiations use built-in pow.
+'''
+
+# field modulus
+P = 0x1a0111ea397fe69a4b1ba7b6434bacd764774b84f38512bf6730d2a0f6b0f6241eabfffeb153ffffb9feffffffffaaab
+
+# exponents for square roots and quadratic character
+P_PLUS1_OVER4 = (P + 1) // 4
+P_MINUS3_OVER4 = (P - 3) // 4
+P_MINUS1_OVER2 = (P - 1) // 2
+
+# inverse of 2
+INV2 = (P + 1) // 2
+
+FP2_ZERO = (0, 0)
+FP2_ONE = (1, 0)
+
+
+def fp_add(a, b):
+  return (a + b) % P
+
+
+def fp_sub(a, b):
+  return (a - b) % P
+
+
+def fp_neg(a):
+  return -a % P
+
+
+def fp_mul(a, b):
+  return a * b % P
+
+
+def fp_sqr(a):
+  return a * a % P
+
+
+def fp_inv(a):
+  return pow(a, -1, P)
+
+
+def fp_pow(a, e):
+  return pow(a, e, P)
+
+
+# quadratic character of a, returns 1, -1 or 0 for zero
+def fp_legendre(a):
+  r = pow(a, P_MINUS1_OVER2, P)
+  return -1 if r == P - 1 else r
+
+
+# returns true if a is a square in fp
+def fp_is_square(a):
+  return fp_legendre(a) != -1
+
+
+# returns x where x^2 = a if such element exists otherwise returns None
+# p = 3 mod 4 so that x = a^((p + 1) / 4)
+def fp_sqrt(a):
+  x = pow(a, P_PLUS1_OVER4, P)
+  return x if x * x % P == a % P else None
+
+
+def fp2_add(a, b):
+  return ((a[0] + b[0]) % P, (a[1] + b[1]) % P)
+
+
+def fp2_sub(a, b):
+  return ((a[0] - b[0]) % P, (a[1] - b[1]) % P)
+
+
+def fp2_neg(a):
+  return (-a[0] % P, -a[1] % P)
+
+
+def fp2_conjugate(a):
+  return (a[0], -a[1] % P)
+
+
+# karatsuba multiplication, three fp multiplications
+def fp2_mul(a, b):
+  a0, a1 = a
+  b0, b1 = b
+  t0 = a0 * b0
+  t1 = a1 * b1
+  return ((t0 - t1) % P, ((a0 + a1) * (b0 + b1) - t0 - t1) % P)
+
+
+# multiplication by an fp element
+def fp2_mul_fp(a, b):
+  return (a[0] * b % P, a[1] * b % P)
+
+
+# complex squaring, two fp multiplications
+def fp2_sqr(a):
+  a0, a1 = a
+  return ((a0 + a1) * (a0 - a1) % P, 2 * a0 * a1 % P)
+
+
+# norm of a which is an fp element, a0^2 + a1^2
+def fp2_norm(a):
+  return (a[0] * a[0] + a[1] * a[1]) % P
+
+
+def fp2_inv(a):
+  t = pow(fp2_norm(a), -1, P)
+  return (a[0] * t % P, -a[1] * t % P)
+
+
+def fp2_pow(a, e):
+  r = FP2_ONE
+  for bit in bin(e)[2:]:
+    r = fp2_sqr(r)
+    if bit == '1':
+      r = fp2_mul(r, a)
+  return r
+
+
+# a is a square in fp2 iff its norm is a square in fp
+def fp2_is_square(a):
+  return fp_is_square(fp2_norm(a))
+
+
+# returns x where x^2 = a if such element exists otherwise returns None
+# norm of a is tested and rooted with one exponentiation which is the
+# quadratic character pre-test, the root itself then costs one more
+# exponentiation that gives both square root and inverse square root of
+# t = (a0 + sqrt(norm)) / 2.
+# https://eprint.iacr.org/2012/685.pdf, algorithm 8 (complex method)
+def fp2_sqrt(a):
+  a0, a1 = a[0] % P, a[1] % P
+  if a1 == 0:
+    # every fp element is a square in fp2, either a0 or -a0 is a square in fp
+    x = fp_sqrt(a0)
+    if x is not None:
+      return (x, 0)
+    return (0, fp_sqrt(-a0 % P))
+  n = (a0 * a0 + a1 * a1) % P
+  s = pow(n, P_PLUS1_OVER4, P)
+  if s * s % P != n:
+    return None
+  t = (a0 + s) * INV2 % P
+  # y = 1 / sqrt(t) if t is square, otherwise 1 / sqrt(-t)
+  # since (p - 3) / 4 is even for BLS12-381
+  y = pow(t, P_MINUS3_OVER4, P)
+  if y * y % P * t % P == 1:
+    x0 = t * y % P
+    x1 = a1 * y % P * INV2 % P
+  else:
+    x0 = a1 * y % P * INV2 % P
+    x1 = -t * y % P
+  return (x0, x1)
+
+
+# Fp6 = Fp2[v] / (v^3 - xi) and Fp12 = Fp6[w] / (w^2 - v) where xi = 1 + i
+# Fp6 elements are (c0, c1, c2) tuples of fp2 elements and Fp12 elements are
+# (c0, c1) tuples of fp6 elements. With this tower w^6 = xi and an fp12
+# element is also sum of c_j * w^j where c0 = (c_0, c_2, c_4) and
+# c1 = (c_1, c_3, c_5)
+
+FP6_ZERO = (FP2_ZERO, FP2_ZERO, FP2_ZERO)
+FP6_ONE = (FP2_ONE, FP2_ZERO, FP2_ZERO)
+FP12_ONE = (FP6_ONE, FP6_ZERO)
+
+
+# multiplication by quadratic non residue xi = 1 + i
+def fp2_mul_by_nonresidue(a):
+  a0, a1 = a
+  return ((a0 - a1) % P, (a0 + a1) % P)
+
+
+def fp6_add(a, b):
+  return (fp2_add(a[0], b[0]), fp2_add(a[1], b[1]), fp2_add(a[2], b[2]))
+
+
+def fp6_sub(a, b):
+  return (fp2_sub(a[0], b[0]), fp2_sub(a[1], b[1]), fp2_sub(a[2], b[2]))
+
+
+def fp6_neg(a):
+  return (fp2_neg(a[0]), fp2_neg(a[1]), fp2_neg(a[2]))
+
+
+# https://eprint.iacr.org/2006/471.pdf, karatsuba
+def fp6_mul(a, b):
+  a0, a1, a2 = a
+  b0, b1, b2 = b
+  t0 = fp2_mul(a0, b0)
+  t1 = fp2_mul(a1, b1)
+  t2 = fp2_mul(a2, b2)
+  c0 = fp2_sub(fp2_sub(fp2_mul(fp2_add(a1, a2), fp2_add(b1, b2)), t1), t2)
+  c0 = fp2_add(fp2_mul_by_nonresidue(c0), t0)
+  c1 = fp2_sub(fp2_sub(fp2_mul(fp2_add(a0, a1), fp2_add(b0, b1)), t0), t1)
+  c1 = fp2_add(c1, fp2_mul_by_nonresidue(t2))
+  c2 = fp2_sub(fp2_sub(fp2_mul(fp2_add(a0, a2), fp2_add(b0, b2)), t0), t2)
+  c2 = fp2_add(c2, t1)
+  return (c0, c1, c2)
+
+
+def fp6_sqr(a):
+  return fp6_mul(a, a)
+
+
+# multiplication by v
+def fp6_mul_by_nonresidue(a):
+  return (fp2_mul_by_nonresidue(a[2]), a[0], a[1])
+
+
+# multiplication by sparse element (b0, b1, 0)
+def fp6_mul_by_01(a, b0, b1):
+  a0, a1, a2 = a
+  t0 = fp2_mul(a0, b0)
+  t1 = fp2_mul(a1, b1)
+  c0 = fp2_add(fp2_mul_by_nonresidue(fp2_mul(a2, b1)), t0)
+  c1 = fp2_sub(fp2_sub(fp2_mul(fp2_add(b0, b1), fp2_add(a0, a1)), t0), t1)
+  c2 = fp2_add(fp2_sub(fp2_mul(fp2_add(a0, a2), b0), t0), t1)
+  return (c0, c1, c2)
+
+
+# multiplication by sparse element (0, b1, 0)
+def fp6_mul_by_1(a, b1):
+  a0, a1, a2 = a
+  c0 = fp2_mul_by_nonresidue(fp2_mul(a2, b1))
+  return (c0, fp2_mul(a0, b1), fp2_mul(a1, b1))
+
+
+def fp6_inv(a):
+  a0, a1, a2 = a
+  t0 = fp2_sub(fp2_sqr(a0), fp2_mul_by_nonresidue(fp2_mul(a1, a2)))
+  t1 = fp2_sub(fp2_mul_by_nonresidue(fp2_sqr(a2)), fp2_mul(a0, a1))
+  t2 = fp2_sub(fp2_sqr(a1), fp2_mul(a0, a2))
+  t3 = fp2_add(fp2_mul(a0, t0),
+               fp2_mul_by_nonresidue(fp2_add(fp2_mul(a2, t1), fp2_mul(a1, t2))))
+  t3 = fp2_inv(t3)
+  return (fp2_mul(t0, t3), fp2_mul(t1, t3), fp2_mul(t2, t3))
+
+
+def fp12_mul(a, b):
+  a0, a1 = a
+  b0, b1 = b
+  t0 = fp6_mul(a0, b0)
+  t1 = fp6_mul(a1, b1)
+  c1 = fp6_sub(fp6_sub(fp6_mul(fp6_add(a0, a1), fp6_add(b0, b1)), t0), t1)
+  c0 = fp6_add(t0, fp6_mul_by_nonresidue(t1))
+  return (c0, c1)
+
+
+# complex squaring
+def fp12_sqr(a):
+  a0, a1 = a
+  t = fp6_mul(a0, a1)
+  c0 = fp6_mul(fp6_add(a0, a1), fp6_add(a0, fp6_mul_by_nonresidue(a1)))
+  c0 = fp6_sub(fp6_sub(c0, t), fp6_mul_by_nonresidue(t))
+  return (c0, fp6_add(t, t))
+
+
+# multiplication by sparse element ((b0, b1, 0), (0, b4, 0))
+# which is the form of line evaluations of M-type twist
+def fp12_mul_by_014(a, b0, b1, b4):
+  a0, a1 = a
+  t0 = fp6_mul_by_01(a0, b0, b1)
+  t1 = fp6_mul_by_1(a1, b4)
+  c1 = fp6_mul_by_01(fp6_add(a0, a1), b0, fp2_add(b1, b4))
+  c1 = fp6_sub(fp6_sub(c1, t0), t1)
+  c0 = fp6_add(fp6_mul_by_nonresidue(t1), t0)
+  return (c0, c1)
+
+
+# conjugation that is a^(p^6), equals to inverse in cyclotomic subgroup
+def fp12_conjugate(a):
+  return (a[0], fp6_neg(a[1]))
+
+
+def fp12_inv(a):
+  a0, a1 = a
+  t = fp6_sub(fp6_sqr(a0), fp6_mul_by_nonresidue(fp6_sqr(a1)))
+  t = fp6_inv(t)
+  return (fp6_mul(a0, t), fp6_neg(fp6_mul(a1, t)))
+
+
+# frobenius coefficients, FROBENIUS_COEFFS[j] = xi^(j * (p - 1) / 6)
+FROBENIUS_COEFFS = [fp2_pow((1, 1), j * (P - 1) // 6) for j in range(6)]
+
+
+# returns a^p
+# (sum c_j * w^j)^p = sum conjugate(c_j) * xi^(j * (p - 1) / 6) * w^j
+def fp12_frobenius(a):
+  (c0, c2, c4), (c1, c3, c5) = a
+  c0, c1, c2, c3, c4, c5 = [
+      fp2_mul(fp2_conjugate(c), g)
+      for c, g in zip((c0, c1, c2, c3, c4, c5), FROBENIUS_COEFFS)
+  ]
+  return ((c0, c2, c4), (c1, c3, c5))
+
+
+# squaring of an element of cyclotomic subgroup
+# https://eprint.iacr.org/2009/565.pdf, section 3.2
+def fp12_cyclotomic_sqr(a):
+  (z0, z4, z3), (z2, z1, z5) = a
+
+  # (t0 + t1 * y) = (z0 + z1 * y)^2 in Fp4
+  t = fp2_mul(z0, z1)
+  t0 = fp2_mul(fp2_add(z0, z1), fp2_add(z0, fp2_mul_by_nonresidue(z1)))
+  t0 = fp2_sub(fp2_sub(t0, t), fp2_mul_by_nonresidue(t))
+  t1 = fp2_add(t, t)
+  # (t2 + t3 * y) = (z2 + z3 * y)^2 in Fp4
+  t = fp2_mul(z2, z3)
+  t2 = fp2_mul(fp2_add(z2, z3), fp2_add(z2, fp2_mul_by_nonresidue(z3)))
+  t2 = fp2_sub(fp2_sub(t2, t), fp2_mul_by_nonresidue(t))
+  t3 = fp2_add(t, t)
+  # (t4 + t5 * y) = (z4 + z5 * y)^2 in Fp4
+  t = fp2_mul(z4, z5)
+  t4 = fp2_mul(fp2_add(z4, z5), fp2_add(z4, fp2_mul_by_nonresidue(z5)))
+  t4 = fp2_sub(fp2_sub(t4, t), fp2_mul_by_nonresidue(t))
+  t5 = fp2_add(t, t)
+
+  # z0 = 3 * t0 - 2 * z0, z1 = 3 * t1 + 2 * z1
+  z0 = fp2_sub(t0, z0)
+  z0 = fp2_add(fp2_add(z0, z0), t0)
+  z1 = fp2_add(t1, z1)
+  z1 = fp2_add(fp2_add(z1, z1), t1)
+  # z2 = 3 * (xi * t5) + 2 * z2, z3 = 3 * t4 - 2 * z3
+  t = fp2_mul_by_nonresidue(t5)
+  z2 = fp2_add(z2, t)
+  z2 = fp2_add(fp2_add(z2, z2), t)
+  z3 = fp2_sub(t4, z3)
+  z3 = fp2_add(fp2_add(z3, z3), t4)
+  # z4 = 3 * t2 - 2 * z4, z5 = 3 * t3 + 2 * z5
+  z4 = fp2_sub(t2, z4)
+  z4 = fp2_add(fp2_add(z4, z4), t2)
+  z5 = fp2_add(z5, t3)
+  z5 = fp2_add(fp2_add(z5, z5), t3)
+
+  return ((z0, z4, z3), (z2, z1, z5))
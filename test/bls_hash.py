@@ -0,0 +1,65 @@
+'''
+Hashing messages to BLS12-381 field elements with expand_message_xmd and
+SHA-256 as hash to curve suites of BLS signatures do. The field elements are
+inputs of MAP_FP_TO_G1 and MAP_FP2_TO_G2 precompiles, hash to curve maps two
+elements of each message and adds the points. Hash state after the zero block
+that precedes every message is computed once and copied for each message so
+that only the message and a single trailing block are hashed per message.
+https://www.rfc-editor.org/rfc/rfc9380.html#name-hashing-to-a-finite-field
+'''
+
+import hashlib
+from bls_field import P
+
+# length in bytes of the string a field element is reduced from
+# ceil((ceil(log2(p)) + k) / 8) with security parameter k = 128
+L = 64
+
+# number of field elements per message of random oracle suites
+COUNT = 2
+
+# domain separation tags of BLS signature suites with proof of possession
+DST_G1 = b"BLS_SIG_BLS12381G1_XMD:SHA-256_SSWU_RO_POP_"
+DST_G2 = b"BLS_SIG_BLS12381G2_XMD:SHA-256_SSWU_RO_POP_"
+
+# sha256 state after the zero padded block b_0 starts with
+Z_PAD_STATE = hashlib.sha256(bytes(hashlib.sha256().block_size))
+
+
+# returns len_in_bytes pseudo random bytes of message
+# https://www.rfc-editor.org/rfc/rfc9380.html#name-expand_message_xmd
+def expand_message_xmd(msg, dst, len_in_bytes):
+  assert len(dst) <= 255, "dst is longer than 255 bytes"
+  ell = (len_in_bytes + 31) // 32
+  assert ell <= 255, "too many bytes requested"
+  dst_prime = dst + bytes([len(dst)])
+  h = Z_PAD_STATE.copy()
+  h.update(msg)
+  h.update(len_in_bytes.to_bytes(2, "big") + b"\x00" + dst_prime)
+  b0 = h.digest()
+  b0_int = int.from_bytes(b0, "big")
+  bi = hashlib.sha256(b0 + b"\x01" + dst_prime).digest()
+  out = [bi]
+  for i in range(2, ell + 1):
+    t = (b0_int ^ int.from_bytes(bi, "big")).to_bytes(32, "big")
+    bi = hashlib.sha256(t + bytes([i]) + dst_prime).digest()
+    out.append(bi)
+  return b"".join(out)[:len_in_bytes]
+
+
+# returns count fp elements of message
+def hash_to_fp(msg, dst=DST_G1, count=COUNT):
+  data = expand_message_xmd(msg, dst, count * L)
+  return [
+      int.from_bytes(data[i * L:(i + 1) * L], "big") % P for i in range(count)
+  ]
+
+
+# returns count fp2 elements of message
+def hash_to_fp2(msg, dst=DST_G2, count=COUNT):
+  data = expand_message_xmd(msg, dst, count * 2 * L)
+  e = [
+      int.from_bytes(data[i * L:(i + 1) * L], "big") % P
+      for i in range(2 * count)
+  ]
+  return [(e[2 * i], e[2 * i + 1]) for i in range(count)]
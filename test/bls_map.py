@@ -0,0 +1,121 @@
+'''
+Mapping field elements to BLS12-381 G1 and G2 points as EIP2537 MAP_FP_TO_G1
+and MAP_FP2_TO_G2 precompiles do, with the integer backed fields of bls_field.
+An element is mapped to an isogenous curve with simplified SWU, carried to
+the target curve with the isogeny map and multiplied into the subgroup with
+effective cofactor. G2 cofactor is cleared with psi endomorphism which gives
+the same point as multiplication by h_eff with two multiplications by u.
+Point arithmetic is the one of bls_curve with the fields of its Field tables.
+Constant tables are converted from py_ecc once when the module is loaded.
+https://www.rfc-editor.org/rfc/rfc9380.html
+'''
+
+from py_ecc.optimized_bls12_381 import constants
+from bls_field import P
+from bls_curve import FP, FP2, U_ABS, fq2_to_fp2, infinity, jacobian_neg, jacobian_double, jacobian_add, jacobian_multiply, normalize, psi
+
+# isogenous curve y^2 = x^3 + A' * x + B' of G1 and Z of its SWU map
+ISO_11_A = int(constants.ISO_11_A)
+ISO_11_B = int(constants.ISO_11_B)
+ISO_11_Z = int(constants.ISO_11_Z)
+# isogeny map polynomials, x numerator, x denominator, y numerator and
+# y denominator, coefficients of each are from the lowest degree up
+ISO_11_MAP = [
+    [int(k) for k in poly] for poly in constants.ISO_11_MAP_COEFFICIENTS
+]
+
+# isogenous curve of G2 and Z of its SWU map
+ISO_3_A = fq2_to_fp2(constants.ISO_3_A)
+ISO_3_B = fq2_to_fp2(constants.ISO_3_B)
+ISO_3_Z = fq2_to_fp2(constants.ISO_3_Z)
+ISO_3_MAP = [
+    [fq2_to_fp2(k) for k in poly] for poly in constants.ISO_3_MAP_COEFFICIENTS
+]
+
+# effective cofactor of G1
+H_EFF_G1 = constants.H_EFF_G1
+
+
+# sign of fp element
+def sgn0_fp(a):
+  return a % 2
+
+
+# sign of fp2 element, sign of c0 unless c0 is zero
+def sgn0_fp2(a):
+  return a[0] % 2 or (a[0] == 0 and a[1] % 2)
+
+
+# returns (x, y) on isogenous curve y^2 = x^3 + a * x + b
+# https://www.rfc-editor.org/rfc/rfc9380.html#name-simplified-swu-method
+def sswu(F, a, b, z, sgn0, u):
+  u2 = F.sqr(u)
+  zu2 = F.mul(z, u2)
+  tv1 = F.add(F.sqr(zu2), zu2)
+  if tv1 == F.zero:
+    x1 = F.mul(b, F.inv(F.mul(z, a)))
+  else:
+    x1 = F.mul(F.mul(F.neg(b), F.inv(a)), F.add(F.one, F.inv(tv1)))
+  gx1 = F.add(F.mul(F.add(F.sqr(x1), a), x1), b)
+  x, y = x1, F.sqrt(gx1)
+  if y is None:
+    x = F.mul(zu2, x1)
+    gx2 = F.add(F.mul(F.add(F.sqr(x), a), x), b)
+    y = F.sqrt(gx2)
+  if sgn0(u) != sgn0(y):
+    y = F.neg(y)
+  return (x, y)
+
+
+# evaluates polynomial with coefficients from the lowest degree up
+def poly_eval(F, coeffs, x):
+  r = coeffs[-1]
+  for k in reversed(coeffs[:-1]):
+    r = F.add(F.mul(r, x), k)
+  return r
+
+
+# returns jacobian point of the target curve for point of isogenous curve
+# both denominators are inverted with a single inversion, point at infinity
+# is returned when a denominator is zero
+def iso_map(F, coeffs, p):
+  x, y = p
+  x_num, x_den, y_num, y_den = (poly_eval(F, poly, x) for poly in coeffs)
+  d = F.mul(x_den, y_den)
+  if d == F.zero:
+    return infinity(F)
+  d_inv = F.inv(d)
+  x = F.mul(F.mul(x_num, y_den), d_inv)
+  y = F.mul(F.mul(F.mul(y, y_num), x_den), d_inv)
+  return (x, y, F.one)
+
+
+def clear_cofactor_g1(p):
+  return jacobian_multiply(p, H_EFF_G1)
+
+
+# returns h_eff * p with psi endomorphism where c1 = u is negative
+# https://www.rfc-editor.org/rfc/rfc9380.html#name-clear_cofactor-for-bls12-38
+def clear_cofactor_g2(p):
+  t1 = jacobian_neg(jacobian_multiply(p, U_ABS))
+  t2 = psi(p)
+  t3 = psi(psi(jacobian_double(p)))
+  t3 = jacobian_add(t3, jacobian_neg(t2))
+  t2 = jacobian_add(t1, t2)
+  t2 = jacobian_neg(jacobian_multiply(t2, U_ABS))
+  t3 = jacobian_add(t3, t2)
+  t3 = jacobian_add(t3, jacobian_neg(t1))
+  return jacobian_add(t3, jacobian_neg(p))
+
+
+# maps fp element to affine G1 point, None is point at infinity
+def map_to_g1(u):
+  p = sswu(FP, ISO_11_A, ISO_11_B, ISO_11_Z, sgn0_fp, u % P)
+  return normalize(clear_cofactor_g1(iso_map(FP, ISO_11_MAP, p)))
+
+
+# maps fp2 element to affine G2 point, None is point at infinity
+def map_to_g2(u):
+  u = (u[0] % P, u[1] % P)
+  p = sswu(FP2, ISO_3_A, ISO_3_B, ISO_3_Z, sgn0_fp2, u)
+  return normalize(clear_cofactor_g2(iso_map(FP2, ISO_3_MAP, p)))
@@ -0,0 +1,93 @@
+'''
+Optimal ate pairing check for BLS12-381 over integer backed tower fields.
+G1 points are (x, y) integer pairs and G2 points are (x, y) pairs of fp2
+elements, None is point at infinity. Product of pairings is computed with a
+single Miller loop that shares squarings of the accumulator between all pairs
+and a single final exponentiation that uses cyclotomic squarings, so that
+checking k pairs costs far less than k pairings.
+'''
+
+from bls_field import FP12_ONE, fp_neg, fp2_add, fp2_sub, fp2_mul, fp2_mul_fp, fp2_sqr, fp2_inv, fp12_mul, fp12_sqr, fp12_mul_by_014, fp12_conjugate, fp12_inv, fp12_frobenius, fp12_cyclotomic_sqr
+
+# absolute value of BLS12-381 curve parameter, parameter itself is negative
+# u = -0xd201000000010000
+U_ABS = 0xd201000000010000
+
+
+# tangent line at t evaluated at p and 2 * t
+# t is on twisted curve, with untwisting (x, y) -> (x / w^2, y / w^3) the line
+# multiplied by w^3 is (lambda * x_t - y_t) - lambda * x_p * w^2 + y_p * w^3
+def double_step(t, p):
+  x, y = t
+  lam = fp2_mul(fp2_mul_fp(fp2_sqr(x), 3), fp2_inv(fp2_add(y, y)))
+  x3 = fp2_sub(fp2_sqr(lam), fp2_add(x, x))
+  y3 = fp2_sub(fp2_mul(lam, fp2_sub(x, x3)), y)
+  line = (fp2_sub(fp2_mul(lam, x), y), fp2_mul_fp(lam, fp_neg(p[0])), (p[1], 0))
+  return line, (x3, y3)
+
+
+# line through t and q evaluated at p and t + q
+def add_step(t, q, p):
+  x, y = t
+  lam = fp2_mul(fp2_sub(q[1], y), fp2_inv(fp2_sub(q[0], x)))
+  x3 = fp2_sub(fp2_sub(fp2_sqr(lam), x), q[0])
+  y3 = fp2_sub(fp2_mul(lam, fp2_sub(x, x3)), y)
+  line = (fp2_sub(fp2_mul(lam, x), y), fp2_mul_fp(lam, fp_neg(p[0])), (p[1], 0))
+  return line, (x3, y3)
+
+
+# product of Miller loops f_{|u|, q}(p) of all pairs
+# accumulator is squared once per iteration for all pairs
+# pairs with a point at infinity are skipped since their pairing is one
+def miller_loop(pairs):
+  pairs = [(p, q) for p, q in pairs if p is not None and q is not None]
+  f = FP12_ONE
+  ts = [q for _, q in pairs]
+  for bit in bin(U_ABS)[3:]:
+    f = fp12_sqr(f)
+    for i, (p, q) in enumerate(pairs):
+      line, ts[i] = double_step(ts[i], p)
+      f = fp12_mul_by_014(f, *line)
+    if bit == '1':
+      for i, (p, q) in enumerate(pairs):
+        line, ts[i] = add_step(ts[i], q, p)
+        f = fp12_mul_by_014(f, *line)
+  # u is negative
+  return fp12_conjugate(f)
+
+
+# returns a^u for a in cyclotomic subgroup
+def cyclotomic_exp_by_u(a):
+  r = a
+  for bit in bin(U_ABS)[3:]:
+    r = fp12_cyclotomic_sqr(r)
+    if bit == '1':
+      r = fp12_mul(r, a)
+  return fp12_conjugate(r)
+
+
+# returns f^(3 * (p^12 - 1) / r)
+# easy part is f^((p^6 - 1) * (p^2 + 1)) and hard part uses
+# 3 * (p^4 - p^2 + 1) / r = (u - 1)^2 * (u + p) * (u^2 + p^2 - 1) + 3
+# https://eprint.iacr.org/2020/875.pdf
+# cube of the pairing is one iff the pairing is one since r is not divisible by 3
+def final_exponentiation(f):
+  f = fp12_mul(fp12_conjugate(f), fp12_inv(f))
+  f = fp12_mul(fp12_frobenius(fp12_frobenius(f)), f)
+  # f^(u - 1)^2
+  t = fp12_mul(cyclotomic_exp_by_u(f), fp12_conjugate(f))
+  t = fp12_mul(cyclotomic_exp_by_u(t), fp12_conjugate(t))
+  # t^(u + p)
+  t = fp12_mul(cyclotomic_exp_by_u(t), fp12_frobenius(t))
+  # t^(u^2 + p^2 - 1)
+  t2 = cyclotomic_exp_by_u(cyclotomic_exp_by_u(t))
+  t2 = fp12_mul(t2, fp12_frobenius(fp12_frobenius(t)))
+  t = fp12_mul(t2, fp12_conjugate(t))
+  # f^3
+  return fp12_mul(t, fp12_mul(fp12_cyclotomic_sqr(f), f))
+
+
+# returns true if product of e(p, q) for all (p, q) pairs is one
+# points must be in correct subgroups
+def pairing_check(pairs):
+  return final_exponentiation(miller_loop(pairs)) == FP12_ONE
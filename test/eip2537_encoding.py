@@ -0,0 +1,294 @@
+'''
+Encoding of EIP2537 test vectors.
+Points and field elements are encoded into lists of hex strings, vectors are
+formatted as Go literals or binary corpus records. This module does not
+depend on py_ecc so that tools can use encoders without curve setup.
+'''
+
+import json
+import os
+import shutil
+import struct
+from eip2537_gas import required_gas
+
+# encoded g1 point at infility
+infinity_g1_encoded = 2 * ["{0:0{1}x}".format(0, 128)]
+
+# encoded g2 point at infility
+infinity_g2_encoded = 4 * ["{0:0{1}x}".format(0, 128)]
+
+ZERO32 = "{0:0{1}x}".format(0, 64)
+ZERO48 = "{0:0{1}x}".format(0, 96)
+ZERO64 = "{0:0{1}x}".format(0, 128)
+ZERO96 = "{0:0{1}x}".format(0, 192)
+ZERO128 = "{0:0{1}x}".format(0, 256)
+ZERO256 = "{0:0{1}x}".format(0, 512)
+ONE32 = "{0:0{1}x}".format(1, 64)
+
+# Expected Errors 'errBLS12381_XXX_'
+
+# msg : "invalid input length"
+ERROR_INVALID_INPUT_LENGHT = "errBLS12381InvalidInputLength"
+# msg : "invalid field element top bytes"
+ERROR_FIELD_ELEMENT_TOP_BYTES = "errBLS12381InvalidFieldElementTopBytes"
+# msg : "invalid field element"
+ERROR_INVALID_FIELD_ELEMENT = "errBLS12381InvalidFieldElement"
+# msg : "point is not on curve"
+ERROR_POINT_G1_IS_NOT_ON_CURVE = "errBLS12381G1PointIsNotOnCurve"
+# msg : "point is not on curve"
+ERROR_POINT_G2_IS_NOT_ON_CURVE = "errBLS12381G2PointIsNotOnCurve"
+# msg : "g1 point is not on correct subgroup"
+ERROR_POINT_G1_SUBGROUP = "errBLS12381G1PointSubgroup"
+# msg : "g2 point is not on correct subgroup"
+ERROR_POINT_G2_SUBGROUP = "errBLS12381G2PointSubgroup"
+
+# Utilities
+
+
+# given list of strings ["a", "b", "c"] returns "a" + "b" + "c"
+def concat_list(entries):
+  return " +\n".join("\"{}\"".format(s) for s in entries)
+
+
+# flattens encoded parts of an input into a single list of words
+# parts can be any iterable so inputs with many pairs are built in linear time
+def join_inputs(parts):
+  words = []
+  for part in parts:
+    words.extend(part)
+  return words
+
+
+# encode scalar into 32 bytes
+def encode_scalar(e):
+  return str("{0:0{1}x}".format(e, 64))
+
+
+# encode 48 bytes field to element to 64 bytes
+# element is either py_ecc FQ or integer backed fp element
+def encode_field_element(fe):
+  padded = "{0:0{1}x}"
+  if hasattr(fe, 'n'):
+    return padded.format(fe.n, 128)
+  return padded.format(fe, 128)
+
+
+# encodes field elements into larger byte string than expected
+def bad_encode_field_element_large(fe):
+  padded = "{0:0{1}x}"
+  if hasattr(fe, 'n'):
+    return padded.format(fe.n, 130)
+  return padded.format(fe, 130)
+
+
+# encodes field elements into shorter byte string than expected
+def bad_encode_field_element_short(fe):
+  padded = "{0:0{1}x}"
+  if hasattr(fe, 'n'):
+    return padded.format(fe.n, 126)
+  return padded.format(fe, 126)
+
+
+# encodes field element violating zero top bytes (top 16 bytes must be zeros)
+def bad_encode_field_element_top_bytes(fe):
+  padded = "{2:0{3}x}{0:0{1}x}"
+  if fe is None:
+    return padded.format(0, 96, 1, 32)
+  return padded.format(fe.n, 96, 1, 32)
+
+
+# converts jacobian point to affine point, affine points and None are returned
+# as they are
+# curve module is imported only for jacobian points so that encoders can be
+# used without py_ecc
+def affine(point):
+  if point is None or len(point) == 2:
+    return point
+  from bls_curve import normalize
+  return normalize(point)
+
+
+# encodes 48 * 2 bytse g1 point to 256 bytes
+# jacobian points are converted to affine here
+def encode_g1_point(point):
+  point = affine(point)
+  if point is None:
+    return infinity_g1_encoded
+  x = encode_field_element(point[0])
+  y = encode_field_element(point[1])
+  return [x, y]
+
+
+# encodes g1 point and scalar value pair into 128 + 32 bytes
+def encode_g1_point_scalar_pair(p, e):
+  return encode_g1_point(p) + [encode_scalar(e)]
+
+
+# returns coefficients of fp2 element
+# element is either py_ecc FQ2 or integer backed (c0, c1) tuple
+def fp2_coeffs(fe):
+  if hasattr(fe, 'coeffs'):
+    return tuple(c.n for c in fe.coeffs)
+  return fe
+
+
+# encodes a g2 point into 4 * 64 bytes
+# jacobian points are converted to affine here
+# coordinates are either py_ecc FQ2 or integer backed fp2 elements
+def encode_g2_point(point):
+  point = affine(point)
+  if point is None:
+    return infinity_g2_encoded
+  x0, x1 = fp2_coeffs(point[0])
+  y0, y1 = fp2_coeffs(point[1])
+  return [
+      encode_field_element(x0),
+      encode_field_element(x1),
+      encode_field_element(y0),
+      encode_field_element(y1)
+  ]
+
+
+# encodes g2 point and scalar value pair into 256 + 32 bytes
+def encode_g2_point_scalar_pair(p, e):
+  return encode_g2_point(p) + [encode_scalar(e)]
+
+
+# encodes g1 point and g2 point pair into 256 + 128 bytes
+def encode_g1_point_g2_point_pair(p1, p2):
+  return encode_g1_point(p1) + encode_g2_point(p2)
+
+
+# decodes 128 bytes g1 point into integer backed affine point
+# point at infinity is decoded as None, points are not checked
+def decode_g1_point(encoded):
+  assert len(encoded) == 256
+  c = [int(encoded[j:j + 128], 16) for j in range(0, 256, 128)]
+  return None if not any(c) else (c[0], c[1])
+
+
+# decodes 256 bytes g2 point into integer backed affine point
+def decode_g2_point(encoded):
+  assert len(encoded) == 512
+  c = [int(encoded[j:j + 128], 16) for j in range(0, 512, 128)]
+  return None if not any(c) else ((c[0], c[1]), (c[2], c[3]))
+
+
+# decodes concatenated point scalar pairs of given point decoder and length
+def decode_point_scalar_pairs(encoded, decode_point, point_len):
+  pair_len = point_len + 64
+  assert len(encoded) % pair_len == 0
+  return [(decode_point(encoded[i:i + point_len]),
+           int(encoded[i + point_len:i + pair_len], 16))
+          for i in range(0, len(encoded), pair_len)]
+
+
+def decode_g1_point_scalar_pairs(encoded):
+  return decode_point_scalar_pairs(encoded, decode_g1_point, 256)
+
+
+def decode_g2_point_scalar_pairs(encoded):
+  return decode_point_scalar_pairs(encoded, decode_g2_point, 512)
+
+
+# decodes concatenated g1 point and g2 point pairs into integer backed points
+# points at infinity are decoded as None
+def decode_g1_point_g2_point_pairs(encoded):
+  assert len(encoded) % 768 == 0
+  return [(decode_g1_point(encoded[i:i + 256]),
+           decode_g2_point(encoded[i + 256:i + 768]))
+          for i in range(0, len(encoded), 768)]
+
+
+# vectors are (inputs, expecteds, error, name) tuples where either expecteds or
+# error is None, they are formatted when a section is written
+def make_vector(inputs, expecteds, name):
+  return (inputs, expecteds, None, name)
+
+
+def make_fail_vector(inputs, error, name):
+  return (inputs, None, error, name)
+
+
+# formats a vector as go precompiledTest or precompiledFailureTest literal
+# vectors that are expected to succeed have gas required by precompile at op
+def format_go_vector(op, vector):
+  inputs, expecteds, error, name = vector
+  if error is None:
+    gas = required_gas(op, sum(len(e) for e in inputs) // 2)
+    return "{{\ninput:\n{},\nexpected:\n{},\ngas: {},\nname: \"{}\",\n}},".format(
+        concat_list(inputs), concat_list(expecteds), gas, name)
+  return "{{\ninput:\n{},\nexpectedError: {},\nname: \"{}\",\n}},".format(
+      concat_list(inputs), error, name)
+
+
+# error codes of binary corpus are one plus the index in this list
+# zero is used for vectors that are expected to succeed
+ERRORS = [
+    ERROR_INVALID_INPUT_LENGHT, ERROR_FIELD_ELEMENT_TOP_BYTES,
+    ERROR_INVALID_FIELD_ELEMENT, ERROR_POINT_G1_IS_NOT_ON_CURVE,
+    ERROR_POINT_G2_IS_NOT_ON_CURVE, ERROR_POINT_G1_SUBGROUP,
+    ERROR_POINT_G2_SUBGROUP
+]
+
+# binary corpus starts with magic and consists of records, each record is
+# header followed by input bytes, expected bytes and name
+# header is op id, error code, input length, expected length, name length and
+# expected gas which is zero for vectors that are expected to fail
+# all little endian
+CORPUS_MAGIC = b"EIP2537\x02"
+RECORD_HEADER = struct.Struct("<BBIIHQ")
+
+
+# encodes a vector as binary corpus record, op id is precompile address
+def encode_binary_vector(op, vector):
+  inputs, expecteds, error, name = vector
+  input_bytes = bytes.fromhex("".join(inputs))
+  expected_bytes = b"" if expecteds is None else bytes.fromhex(
+      "".join(expecteds))
+  code = 0 if error is None else ERRORS.index(error) + 1
+  gas = required_gas(op, len(input_bytes)) if error is None else 0
+  name = name.encode()
+  header = RECORD_HEADER.pack(op, code, len(input_bytes), len(expected_bytes),
+                              len(name), gas)
+  return header + input_bytes + expected_bytes + name
+
+
+# returns number of records in a binary corpus section file
+# only record headers are read, the rest of each record is skipped so memory
+# usage does not depend on the size of the section
+def count_binary_records(f):
+  n = 0
+  while True:
+    header = f.read(RECORD_HEADER.size)
+    if not header:
+      return n
+    _, _, input_len, expected_len, name_len, _ = RECORD_HEADER.unpack(header)
+    f.seek(input_len + expected_len + name_len, os.SEEK_CUR)
+    n += 1
+
+
+# concatenates binary sections into corpus file and writes a json index next
+# to it with offset, length and record count of each section
+# sections are copied in pieces so that corpora larger than memory can be
+# written
+def write_binary_output(sections, paths, out):
+  index = {"magic": CORPUS_MAGIC.hex(), "errors": ERRORS, "sections": []}
+  with open(out, "wb") as f:
+    f.write(CORPUS_MAGIC)
+    for section, path in zip(sections, paths):
+      offset = f.tell()
+      with open(path, "rb") as part:
+        count = count_binary_records(part)
+        part.seek(0)
+        shutil.copyfileobj(part, f)
+      index["sections"].append({
+          "name": section[0],
+          "op": section[2],
+          "offset": offset,
+          "length": f.tell() - offset,
+          "count": count,
+      })
+  with open(os.path.splitext(out)[0] + ".json", "w") as f:
+    json.dump(index, f, indent=2)
+    f.write("\n")
@@ -0,0 +1,67 @@
+'''
+Gas schedule of EIP2537 precompiles.
+Python copies of RequiredGas of contracts.go with go-ethereum params, used to
+record expected gas of test vectors. Formulas are copied as they are
+so that a vector fails when either side changes.
+'''
+
+# params.Bls12381XXXGas
+G1_ADD_GAS = 600
+G1_MUL_GAS = 12000
+G2_ADD_GAS = 4500
+G2_MUL_GAS = 55000
+PAIRING_BASE_GAS = 115000
+PAIRING_PER_PAIR_GAS = 23000
+MAP_G1_GAS = 5500
+MAP_G2_GAS = 110000
+
+# params.Bls12381MultiExpDiscountTable
+MULTIEXP_DISCOUNT_TABLE = [
+    1200, 888, 764, 641, 594, 547, 500, 453, 438, 423, 408, 394, 379, 364, 349,
+    334, 330, 326, 322, 318, 314, 310, 306, 302, 298, 294, 289, 285, 281, 277,
+    273, 269, 268, 266, 265, 263, 262, 260, 259, 257, 256, 254, 253, 251, 250,
+    248, 247, 245, 244, 242, 241, 239, 238, 236, 235, 233, 232, 231, 229, 228,
+    226, 225, 223, 222, 221, 220, 219, 219, 218, 217, 216, 216, 215, 214, 213,
+    213, 212, 211, 211, 210, 209, 208, 208, 207, 206, 205, 205, 204, 203, 202,
+    202, 201, 200, 199, 199, 198, 197, 196, 196, 195, 194, 193, 193, 192, 191,
+    191, 190, 189, 188, 188, 187, 186, 185, 185, 184, 183, 182, 182, 181, 180,
+    179, 179, 178, 177, 176, 176, 175, 174
+]
+
+
+# discounted gas of k multiplications, table is indexed by k as in contracts.go
+# and k past the table gets its last discount
+def multiexp_gas(k, mul_gas):
+  discount = MULTIEXP_DISCOUNT_TABLE[min(k, len(MULTIEXP_DISCOUNT_TABLE) - 1)]
+  return (k * mul_gas * discount) // 1000
+
+
+def g1_multiexp_gas(input_len):
+  return multiexp_gas(input_len // 160, G1_MUL_GAS)
+
+
+def g2_multiexp_gas(input_len):
+  return multiexp_gas(input_len // 288, G2_MUL_GAS)
+
+
+def pairing_gas(input_len):
+  return PAIRING_BASE_GAS + (input_len // 384) * PAIRING_PER_PAIR_GAS
+
+
+# gas functions of input length by precompile address
+REQUIRED_GAS = {
+    0x0a: lambda _: G1_ADD_GAS,
+    0x0b: lambda _: G1_MUL_GAS,
+    0x0c: g1_multiexp_gas,
+    0x0d: lambda _: G2_ADD_GAS,
+    0x0e: lambda _: G2_MUL_GAS,
+    0x0f: g2_multiexp_gas,
+    0x10: pairing_gas,
+    0x11: lambda _: MAP_G1_GAS,
+    0x12: lambda _: MAP_G2_GAS,
+}
+
+
+# returns gas required by precompile at given address for input of given length
+def required_gas(op, input_len):
+  return REQUIRED_GAS[op](input_len)
@@ -0,0 +1,253 @@
+'''
+Ingestion of external EIP2537 test vector sets into a binary corpus.
+Vectors of other clients are read from csv files with input and result
+columns as matter files have, from json arrays of go-ethereum precompile test
+objects or from json lines of such objects. Files are streamed record by
+record so that their size is not limited by memory. Input length of each
+vector is checked against the layout of its operation, a vector is dropped
+if an input of the same operation was already ingested and vectors are
+written as binary corpus with a json index that loadCorpus reads.
+'''
+
+import csv
+import hashlib
+import itertools
+import json
+import os
+import re
+import tempfile
+from eip2537_encoding import ERROR_INVALID_INPUT_LENGHT, ERROR_FIELD_ELEMENT_TOP_BYTES, ERROR_INVALID_FIELD_ELEMENT, ERROR_POINT_G1_IS_NOT_ON_CURVE, ERROR_POINT_G2_IS_NOT_ON_CURVE, ERROR_POINT_G1_SUBGROUP, ERROR_POINT_G2_SUBGROUP, ERRORS, encode_binary_vector, write_binary_output
+
+# operations with name used in corpus section names, aliases that file names
+# of vector sets start with, input length of a vector or of a pair in bytes
+# and output length in bytes
+# aliases are lower case without separators, file names of matter, go-ethereum
+# and EIP assets such as g1_add.csv, blsG1Add.json and add_G1_bls.json match
+INGEST_OPS = [
+    (0x0a, "G1Add", ["g1add", "addg1"], 256, None, 128),
+    (0x0b, "G1Mul", ["g1mul", "mulg1"], 160, None, 128),
+    (0x0c, "G1MultiExp", ["g1multiexp", "g1msm", "msmg1"], None, 160, 128),
+    (0x0d, "G2Add", ["g2add", "addg2"], 512, None, 256),
+    (0x0e, "G2Mul", ["g2mul", "mulg2"], 288, None, 256),
+    (0x0f, "G2MultiExp", ["g2multiexp", "g2msm", "msmg2"], None, 288, 256),
+    (0x10, "Pairing", ["pairing"], None, 384, 32),
+    (0x11, "MapG1", ["mapg1", "fptog1", "mapfptog1"], 64, None, 128),
+    (0x12, "MapG2", ["mapg2", "fp2tog2", "mapfp2tog2"], 128, None, 256),
+]
+
+# error names by error message of contracts.go, not on curve errors of g1 and
+# g2 have the same message so they are told apart by operation
+ERROR_MESSAGES = {
+    "invalid input length": ERROR_INVALID_INPUT_LENGHT,
+    "invalid field element top bytes": ERROR_FIELD_ELEMENT_TOP_BYTES,
+    "must be less than modulus": ERROR_INVALID_FIELD_ELEMENT,
+    "g1 point is not on correct subgroup": ERROR_POINT_G1_SUBGROUP,
+    "g2 point is not on correct subgroup": ERROR_POINT_G2_SUBGROUP,
+}
+
+# number of records that are validated and written at once
+INGEST_CHUNK = 4096
+
+# number of bytes of a json array that are read at once
+JSON_READ_SIZE = 1 << 16
+
+
+def normalize_name(s):
+  return re.sub("[^a-z0-9]", "", s.lower())
+
+
+# returns precompile address of an operation name or of a vector set file name
+# leading fail and bls prefixes are ignored and the longest matching alias is
+# taken so that g1_multiexp.csv is not taken as g1 multiplication
+def ingest_op(name):
+  stem = normalize_name(os.path.splitext(os.path.basename(name))[0])
+  for prefix in ("fail", "bls12381", "bls"):
+    if stem.startswith(prefix):
+      stem = stem[len(prefix):]
+  aliases = sorted(((alias, op)
+                    for op, section_name, aliases, _, _, _ in INGEST_OPS
+                    for alias in aliases + [normalize_name(section_name)]),
+                   key=lambda e: len(e[0]),
+                   reverse=True)
+  for alias, op in aliases:
+    if stem.startswith(alias):
+      return op
+  raise ValueError("{}: unknown operation".format(name))
+
+
+# yields objects of a json array reading the file in pieces
+def iter_json_array(f):
+  decoder = json.JSONDecoder()
+  buf, pos, eof = "", 0, False
+  started = False
+  while True:
+    while pos < len(buf) and buf[pos] in " \t\r\n,":
+      pos += 1
+    if not started and pos < len(buf):
+      assert buf[pos] == "[", "json vector set must be an array"
+      started = True
+      pos += 1
+      continue
+    if pos < len(buf) and buf[pos] == "]":
+      return
+    try:
+      if pos == len(buf):
+        raise ValueError("buffer is empty")
+      obj, end = decoder.raw_decode(buf, pos)
+    except ValueError:
+      if eof:
+        if buf[pos:].strip():
+          raise
+        return
+      piece = f.read(JSON_READ_SIZE)
+      eof = not piece
+      buf, pos = buf[pos:] + piece, 0
+      continue
+    yield obj
+    pos = end
+
+
+# yields records of a vector set file as dicts with lower case keys
+def read_records(path):
+  ext = os.path.splitext(path)[1].lower()
+  with open(path, newline='') as f:
+    if ext == ".csv":
+      records = csv.DictReader(f)
+    elif ext == ".jsonl":
+      records = (json.loads(line) for line in f if line.strip())
+    elif ext == ".json":
+      records = iter_json_array(f)
+    else:
+      raise ValueError("{}: unknown vector set format".format(path))
+    for record in records:
+      yield {k.lower(): v for k, v in record.items()}
+
+
+# returns input length check of an operation
+def valid_input_length(op, n):
+  for address, _, _, fixed_len, pair_len, _ in INGEST_OPS:
+    if address == op:
+      if fixed_len is not None:
+        return n == fixed_len
+      return n > 0 and n % pair_len == 0
+  raise ValueError("unknown operation {}".format(op))
+
+
+def output_length(op):
+  return next(e[5] for e in INGEST_OPS if e[0] == op)
+
+
+# returns error name of an expected error given by name or by message
+def error_name(op, error):
+  if error in ERRORS:
+    return error
+  if error == "point is not on curve":
+    if op in (0x0d, 0x0e, 0x0f, 0x12):
+      return ERROR_POINT_G2_IS_NOT_ON_CURVE
+    return ERROR_POINT_G1_IS_NOT_ON_CURVE
+  if error in ERROR_MESSAGES:
+    return ERROR_MESSAGES[error]
+  raise ValueError("unknown error {}".format(error))
+
+
+def decode_hex(s):
+  s = s.strip()
+  if s.startswith("0x"):
+    s = s[2:]
+  return bytes.fromhex(s)
+
+
+# returns vector of a record or raises ValueError with the reason it is
+# rejected, vectors that succeed must have input and output lengths of the
+# operation and vectors that fail with an input length error must not
+def record_vector(op, record, name):
+  data = decode_hex(record.get("input") or "")
+  expected = record.get("result") or record.get("expected") or None
+  error = record.get("expectederror") or record.get("error") or None
+  name = record.get("name") or name
+  if (expected is None) == (error is None):
+    raise ValueError("either expected result or error must be given")
+  if error is not None:
+    error = error_name(op, error)
+    if (error == ERROR_INVALID_INPUT_LENGHT) == valid_input_length(
+        op, len(data)):
+      raise ValueError("input length {} and error {} do not match".format(
+          len(data), error))
+    return ([data.hex()], None, error, name)
+  expected = decode_hex(expected)
+  if not valid_input_length(op, len(data)):
+    raise ValueError("invalid input length {}".format(len(data)))
+  if len(expected) != output_length(op):
+    raise ValueError("invalid output length {}".format(len(expected)))
+  return ([data.hex()], [expected.hex()], None, name)
+
+
+# returns key of an input that duplicates are found with and digest of its
+# expected result or error that conflicting duplicates are found with
+def vector_digests(op, vector):
+  inputs, expecteds, error, _ = vector
+  key = hashlib.sha256(bytes([op]) + bytes.fromhex(inputs[0])).digest()[:16]
+  outcome = error if error is not None else expecteds[0]
+  return key, hashlib.sha256(outcome.encode()).digest()[:8]
+
+
+# ingests vector sets into a binary corpus with a json index next to it
+# operation of each file is taken from its name unless op is given
+# records are validated and written in chunks, each operation into its own
+# section, and only the first vector of an input is kept
+# returns counts of records, written vectors, duplicates and conflicting
+# duplicates that have a different expected result, and rejected records as
+# (path, index, reason) tuples which include conflicting duplicates
+def ingest_vector_sets(paths, out, op=None):
+  stats = {"records": 0, "written": 0, "duplicates": 0, "conflicts": 0}
+  rejected = []
+  seen = {}
+  with tempfile.TemporaryDirectory() as tmp:
+    parts = {
+        address: open(os.path.join(tmp, "{:02x}".format(address)), "wb")
+        for address, _, _, _, _, _ in INGEST_OPS
+    }
+    try:
+      for path in paths:
+        path_op = ingest_op(op or path)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        records = enumerate(read_records(path))
+        while True:
+          chunk = list(itertools.islice(records, INGEST_CHUNK))
+          if not chunk:
+            break
+          encoded = []
+          for i, record in chunk:
+            stats["records"] += 1
+            try:
+              vector = record_vector(path_op, record, "{}_{}".format(stem, i))
+            except ValueError as e:
+              rejected.append((path, i, str(e)))
+              continue
+            key, outcome = vector_digests(path_op, vector)
+            if key in seen:
+              if seen[key] == outcome:
+                stats["duplicates"] += 1
+              else:
+                stats["conflicts"] += 1
+                rejected.append(
+                    (path, i, "conflicts with an earlier vector of the input"))
+              continue
+            seen[key] = outcome
+            encoded.append(encode_binary_vector(path_op, vector))
+          parts[path_op].write(b"".join(encoded))
+          stats["written"] += len(encoded)
+    finally:
+      for part in parts.values():
+        part.close()
+    # sections of operations without vectors are left out
+    sections, section_paths = [], []
+    for address, section_name, _, _, _, _ in INGEST_OPS:
+      path = os.path.join(tmp, "{:02x}".format(address))
+      if os.path.getsize(path):
+        sections.append(
+            ("bls{}Ingested".format(section_name), None, address, None, None))
+        section_paths.append(path)
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    write_binary_output(sections, section_paths, out)
+  return stats, rejected
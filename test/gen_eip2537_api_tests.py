@@ -4,25 +4,38 @@ Notice that test vectors generated with this script does not target
 underlying mathematical properties of BLS12-381 curve. Instead It is
 mostly targeting a few expected results, parsing errors and error propagation.
 Prints of vectors follows Go syntax.
+Importing this module has no side effects, vectors are generated only with
+generate_vectors or from the command line. It still loads py_ecc and sets up
+the curve on import, about half a second, encoders are in eip2537_encoding
+which can be imported without py_ecc.
 '''
 
-from py_ecc.bls12_381 import G1, G2, add, multiply, FQ, FQ2, Z1 as INFINITY1, Z1 as INFINITY2, curve_order, is_on_curve, b, b2, field_modulus, neg
+from py_ecc.bls12_381 import G1, G2, FQ, FQ2, Z1 as INFINITY1, Z1 as INFINITY2, curve_order, is_on_curve, b, b2, field_modulus
 from py_ecc.utils import prime_field_inv as inv
+from bls_field import FP2_ZERO, FP2_ONE, fp_add, fp_neg, fp_mul, fp_sqr, fp_inv, fp_sqrt, fp2_add, fp2_neg, fp2_mul, fp2_sqr, fp2_inv, fp2_sqrt
+from bls_curve import FP, FP2, J_G1, J_G2, J_INFINITY2, jacobian_add, jacobian_neg, jacobian_multiply, is_infinity, normalize, to_jacobian, g1_subgroup_check, g2_subgroup_check, batch_normalize, fixed_base_mul, fixed_base_tables, multi_scalar_mul
+from bls_pairing import pairing_check
+from bls_map import ISO_11_Z, ISO_3_Z, map_to_g1, map_to_g2
+from bls_hash import DST_G1, DST_G2, hash_to_fp, hash_to_fp2
+from eip2537_encoding import ZERO32, ZERO64, ONE32, ERROR_INVALID_INPUT_LENGHT, ERROR_FIELD_ELEMENT_TOP_BYTES, ERROR_INVALID_FIELD_ELEMENT, ERROR_POINT_G1_IS_NOT_ON_CURVE, ERROR_POINT_G2_IS_NOT_ON_CURVE, ERROR_POINT_G1_SUBGROUP, ERROR_POINT_G2_SUBGROUP, CORPUS_MAGIC, join_inputs, encode_scalar, encode_field_element, bad_encode_field_element_large, bad_encode_field_element_short, bad_encode_field_element_top_bytes, encode_g1_point, encode_g1_point_scalar_pair, fp2_coeffs, encode_g2_point, encode_g2_point_scalar_pair, encode_g1_point_g2_point_pair, decode_g1_point, decode_g2_point, decode_g1_point_scalar_pairs, decode_g2_point_scalar_pairs, decode_g1_point_g2_point_pairs, make_vector, make_fail_vector, format_go_vector, encode_binary_vector, write_binary_output
+import argparse
+import collections
+import contextlib
 import csv
-
-# encoded g1 point at infility
-infinity_g1_encoded = 2 * ["{0:0{1}x}".format(0, 128)]
-
-# encoded g2 point at infility
-infinity_g2_encoded = 4 * ["{0:0{1}x}".format(0, 128)]
-
-ZERO32 = "{0:0{1}x}".format(0, 64)
-ZERO48 = "{0:0{1}x}".format(0, 96)
-ZERO64 = "{0:0{1}x}".format(0, 128)
-ZERO96 = "{0:0{1}x}".format(0, 192)
-ZERO128 = "{0:0{1}x}".format(0, 256)
-ZERO256 = "{0:0{1}x}".format(0, 512)
-ONE32 = "{0:0{1}x}".format(1, 64)
+import functools
+import hashlib
+import itertools
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# matter vectors, sources and default outputs are located relative to the
+# directory of this module rather than the working directory
+HERE = os.path.dirname(os.path.abspath(__file__))
 
 
 # return invalid g1 point
@@ -57,47 +70,215 @@ def modulus():
 
 # subgroup check g1
 def g1_is_in_correct_subgroup(p):
-  return multiply(p, curve_order) is INFINITY1
+  return g1_subgroup_check(to_jacobian(p, FQ))
 
 
 # subgroup check g2
 def g2_is_in_correct_subgroup(p):
-  return multiply(p, curve_order) is INFINITY2
+  return g2_subgroup_check(to_jacobian(p, FQ2))
+
+
+# file of constants that are searched for or derived once, such as points
+# that are not in correct subgroup, constants of each curve are stored under a
+# key of its parameters so that they are not used if parameters change
+CONSTANTS_CACHE = os.path.join(HERE, ".vector_cache", "constants.json")
+
+# constants are computed without reading or writing CONSTANTS_CACHE when this
+# is False, as with --no-cache and while counting field operations
+USE_CONSTANTS_CACHE = True
+
+
+# sets whether constants are read from and written to CONSTANTS_CACHE, it is
+# also the initializer of worker processes
+def use_constants_cache(enabled):
+  global USE_CONSTANTS_CACHE
+  USE_CONSTANTS_CACHE = enabled
+
+
+# computes constants without reading or writing CONSTANTS_CACHE within the
+# block
+@contextlib.contextmanager
+def without_constants_cache():
+  enabled = USE_CONSTANTS_CACHE
+  use_constants_cache(False)
+  try:
+    yield
+  finally:
+    use_constants_cache(enabled)
+
+
+# returns key of curve parameters that cached constants depend on
+def curve_parameters_key():
+  params = [field_modulus, b.n, list(fp2_coeffs(b2)), curve_order]
+  return hashlib.sha256(json.dumps(params).encode()).hexdigest()[:32]
+
+
+def read_constants_cache():
+  try:
+    with open(CONSTANTS_CACHE) as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return {}
+
+
+# returns json value of a constant from the cache, the value is computed and
+# stored if it is not cached yet
+# the cache file is replaced atomically so that processes generating shards in
+# parallel never read a partially written file
+def cached_constant(name, compute):
+  if not USE_CONSTANTS_CACHE:
+    return compute()
+  key = curve_parameters_key()
+  value = read_constants_cache().get(key, {}).get(name)
+  if value is not None:
+    return value
+  value = compute()
+  cache = read_constants_cache()
+  cache.setdefault(key, {})[name] = value
+  try:
+    os.makedirs(os.path.dirname(CONSTANTS_CACHE), exist_ok=True)
+    tmp = "{}.{}.tmp".format(CONSTANTS_CACHE, os.getpid())
+    with open(tmp, "w") as f:
+      json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp, CONSTANTS_CACHE)
+  except OSError:
+    # a read only checkout still generates vectors, constants are only
+    # computed again the next time
+    pass
+  return value
+
+
+# returns x and y of the first g1 point with smallest x that is on curve
+# candidates are searched with integer backed field arithmetic
+# none of them is in correct subgroup since cofactor of G1 is not one
+def find_g1_point_not_in_correct_subgroup():
+  x = 1
+  while True:
+    y = fp_sqrt(fp_add(fp_mul(fp_sqr(x), x), b.n))
+    if y is not None:
+      return [x, y]
+    x += 1
 
 
-# return g1 point that is on curve but not in correct subgroup
-def g1_point_not_in_correct_subgroup():
-  one = FQ.one()
-  x = FQ.one()
+# returns x and y coefficients of the first g2 point with smallest x = (k, 0)
+# that is on curve
+def find_g2_point_not_in_correct_subgroup():
+  x = FP2_ONE
+  b2_coeffs = fp2_coeffs(b2)
+  while True:
+    y = fp2_sqrt(fp2_add(fp2_mul(fp2_sqr(x), x), b2_coeffs))
+    if y is not None:
+      return [list(x), list(y)]
+    x = fp2_add(x, FP2_ONE)
 
+
+# return g1 point that is on curve but not in correct subgroup
+# point is searched once and cached on disk, it is checked again when loaded
+@functools.lru_cache(maxsize=None)
+def g1_point_not_in_correct_subgroup():
   # expected point
   # (4, 1630892974828014537729259858097113969650871260980656934049590190201941782487224876496582135785777461178964897591404)
-  while True:
-    y = x * x * x + b
-    y = sqrt1(y)
-    if y is not None:
-      p = (x, y)
-      assert is_on_curve(p, b)
-      assert g1_is_in_correct_subgroup((x, y)) is False
-      return p
-    x += one
+  x, y = cached_constant("g1_point_not_in_correct_subgroup",
+                         find_g1_point_not_in_correct_subgroup)
+  p = (FQ(x), FQ(y))
+  assert is_on_curve(p, b)
+  assert g1_is_in_correct_subgroup(p) is False
+  return p
 
 
-# return g2 point that is on curve but not in correct subgroup
+# return g2 point that is on curve but not in correct subgroup
+# point is searched once and cached on disk, it is checked again when loaded
+@functools.lru_cache(maxsize=None)
 def g2_point_not_in_correct_subgroup():
-  one = FQ2.one()
-  x = FQ2.one()
-  # expected point
-  # ((2, 0), (188995492400578496451910581292546059920654572609832469388872107051048741028892423057992033888655218419282460458611, 434381874456081807472298918693162486998243066160460423017297172308631992219110538691921044767658182807847155297615))
-  while True:
-    y = x * x * x + b2
-    y = sqrt2(y)
-    if y is not None:
-      p = (x, y)
-      assert is_on_curve(p, b2)
-      assert g2_is_in_correct_subgroup(p) is False
-      return p
-    x += one
+  # expected point
+  # ((2, 0), (188995492400578496451910581292546059920654572609832469388872107051048741028892423057992033888655218419282460458611, 434381874456081807472298918693162486998243066160460423017297172308631992219110538691921044767658182807847155297615))
+  x, y = cached_constant("g2_point_not_in_correct_subgroup",
+                         find_g2_point_not_in_correct_subgroup)
+  p = (FQ2(x), FQ2(y))
+  assert is_on_curve(p, b2)
+  assert g2_is_in_correct_subgroup(p) is False
+  return p
+
+
+# returns r * p of a point that is not in correct subgroup, it is a nonzero
+# point of the torsion that the cofactor spans
+def torsion_component(p, field):
+  t = normalize(jacobian_multiply(to_jacobian(p, field), curve_order))
+  assert t is not None
+  return t
+
+
+# return torsion component of g1_point_not_in_correct_subgroup
+@functools.lru_cache(maxsize=None)
+def g1_torsion_point():
+
+  def compute():
+    x, y = torsion_component(g1_point_not_in_correct_subgroup(), FQ)
+    return [x.n, y.n]
+
+  x, y = cached_constant("g1_torsion_point", compute)
+  t = (FQ(x), FQ(y))
+  assert is_on_curve(t, b)
+  assert g1_is_in_correct_subgroup(t) is False
+  return t
+
+
+# return torsion component of g2_point_not_in_correct_subgroup
+@functools.lru_cache(maxsize=None)
+def g2_torsion_point():
+
+  def compute():
+    x, y = torsion_component(g2_point_not_in_correct_subgroup(), FQ2)
+    return [list(fp2_coeffs(x)), list(fp2_coeffs(y))]
+
+  x, y = cached_constant("g2_torsion_point", compute)
+  t = (FQ2(x), FQ2(y))
+  assert is_on_curve(t, b2)
+  assert g2_is_in_correct_subgroup(t) is False
+  return t
+
+
+# number of multiples of a torsion point that enumerated points cycle through
+TORSION_MULTIPLES = 16
+
+
+# returns multiples of torsion point t among its first TORSION_MULTIPLES ones
+# that are not infinity
+def torsion_multiples(t):
+  multiples = []
+  m = t
+  for _ in range(TORSION_MULTIPLES):
+    if not is_infinity(m):
+      multiples.append(m)
+    m = jacobian_add(m, t)
+  return multiples
+
+
+# returns affine point i of distinct points a * t + (i + 1) * gen where a * t
+# cycles through torsion multiples of t
+# a point splits uniquely into its torsion and subgroup components so points
+# of different i differ and none of them is in correct subgroup
+def point_not_in_correct_subgroup(multiples, gen, i):
+  assert i + 1 < curve_order
+  return normalize(
+      jacobian_add(multiples[i % len(multiples)], fixed_base_mul(gen, i + 1)))
+
+
+# returns torsion multiples of g1_torsion_point
+def g1_torsion_multiples():
+  return torsion_multiples(to_jacobian(g1_torsion_point(), FQ))
+
+
+# returns torsion multiples of g2_torsion_point
+def g2_torsion_multiples():
+  return torsion_multiples(to_jacobian(g2_torsion_point(), FQ2))
+
+
+# clears constants cached in memory so that they are computed or loaded again
+def clear_cached_constants():
+  for f in (g1_point_not_in_correct_subgroup, g2_point_not_in_correct_subgroup,
+            g1_torsion_point, g2_torsion_point):
+    f.cache_clear()
 
 
 # Constants that we need for calculating square root
@@ -146,91 +327,14 @@ def test_sqrt2():
   assert aa == a1 * a1
 
 
-# test sqrt implementations above
-test_sqrt1()
-test_sqrt2()
-
-# Expected Errors 'errBLS12381_XXX_'
-
-# msg : "invalid input length"
-ERROR_INVALID_INPUT_LENGHT = "errBLS12381InvalidInputLength"
-# msg : "invalid field element top bytes"
-ERROR_FIELD_ELEMENT_TOP_BYTES = "errBLS12381InvalidFieldElementTopBytes"
-# msg : "invalid field element"
-ERROR_INVALID_FIELD_ELEMENT = "errBLS12381InvalidFieldElement"
-# msg : "point is not on curve"
-ERROR_POINT_G1_IS_NOT_ON_CURVE = "errBLS12381G1PointIsNotOnCurve"
-# msg : "point is not on curve"
-ERROR_POINT_G2_IS_NOT_ON_CURVE = "errBLS12381G2PointIsNotOnCurve"
-# msg : "g1 point is not on correct subgroup"
-ERROR_POINT_G1_SUBGROUP = "errBLS12381G1PointSubgroup"
-# msg : "g2 point is not on correct subgroup"
-ERROR_POINT_G2_SUBGROUP = "errBLS12381G2PointSubgroup"
-
 # Utilities
 
 
-# given list of strings ["a", "b", "c"] returns "a" + "b" + "c"
-def concat_list(entries):
-  res = ""
-  for i, s in enumerate(entries):
-    res += "\"{}\"".format(s)
-    if i + 1 != len(entries):
-      res += " +\n"
-  return res
-
-
-# encode scalar into 32 bytes
-def encode_scalar(e):
-  return str("{0:0{1}x}".format(e, 64))
-
-
-# encode 48 bytes field to element to 64 bytes
-def encode_field_element(fe):
-  padded = "{0:0{1}x}"
-  if hasattr(fe, 'n'):
-    return padded.format(fe.n, 128)
-  return padded.format(fe, 128)
-
-
-# encodes field elements into larger byte string than expected
-def bad_encode_field_element_large(fe):
-  padded = "{0:0{1}x}"
-  if hasattr(fe, 'n'):
-    return padded.format(fe.n, 130)
-  return padded.format(fe, 130)
-
-
-# encodes field elements into shorter byte string than expected
-def bad_encode_field_element_short(fe):
-  padded = "{0:0{1}x}"
-  if hasattr(fe, 'n'):
-    return padded.format(fe.n, 126)
-  return padded.format(fe, 126)
-
-
-# encodes field element violating zero top bytes (top 16 bytes must be zeros)
-def bad_encode_field_element_top_bytes(fe):
-  padded = "{2:0{3}x}{0:0{1}x}"
-  if fe is None:
-    return padded.format(0, 96, 1, 32)
-  return padded.format(fe.n, 96, 1, 32)
-
-
 # encodes an invalid field element (that is larger than modulus)
 def bad_encode_invalid_field_element():
   return encode_field_element(invalid_field_element())
 
 
-# encodes 48 * 2 bytse g1 point to 256 bytes
-def encode_g1_point(point):
-  if point is INFINITY1:
-    return infinity_g1_encoded
-  x = encode_field_element(point[0])
-  y = encode_field_element(point[1])
-  return [x, y]
-
-
 # encodes g1 point into larger byte string than expected
 def bad_encode_g1_point_large():
   x = encode_field_element(G1[0])
@@ -260,11 +364,6 @@ def bad_encode_g1_point_top_bytes():
   return [x, y]
 
 
-# encodes g1 point and scalar value pair into 128 + 32 bytes
-def encode_g1_point_scalar_pair(p, e):
-  return encode_g1_point(p) + [encode_scalar(e)]
-
-
 # encodes g1 point and scalar value pair into shorher byte string than expected
 def bad_encode_g1_point_scalar_pair_short():
   return bad_encode_g1_point_short() + [encode_scalar(7)]
@@ -290,17 +389,6 @@ def encode_g1_point_not_on_curve():
   return encode_g1_point(g1_point_is_not_on_curve())
 
 
-# encodes a g2 point into 4 * 64 bytes
-def encode_g2_point(point):
-  if point is INFINITY2:
-    return infinity_g2_encoded
-  x0 = encode_field_element(point[0].coeffs[0])
-  x1 = encode_field_element(point[0].coeffs[1])
-  y0 = encode_field_element(point[1].coeffs[0])
-  y1 = encode_field_element(point[1].coeffs[1])
-  return [x0, x1, y0, y1]
-
-
 # encodes g2 point into larger byte string than expected
 def bad_encode_g2_point_large():
   x0 = encode_field_element(G2[0].coeffs[0])
@@ -337,11 +425,6 @@ def bad_encode_g2_point_top_bytes():
   return [x0, x1, y0, y1]
 
 
-# encodes g2 point and scalar value pair into 256 + 32 bytes
-def encode_g2_point_scalar_pair(p, e):
-  return encode_g2_point(p) + [encode_scalar(e)]
-
-
 # encodes g2 point and scalar value pair into shorher byte string than expected
 def bad_encode_g2_point_scalar_pair_short():
   return bad_encode_g2_point_short() + [encode_scalar(7)]
@@ -367,30 +450,218 @@ def encode_g2_point_not_on_curve():
   return encode_g2_point(g2_point_is_not_on_curve())
 
 
-# encodes g1 point and g2 point pair into 256 + 128 bytes
-def encode_g1_point_g2_point_pair(p1, p2):
-  return encode_g1_point(p1) + encode_g2_point(p2)
+# encodes g1 and g2 points as pairs, jacobian points of each group are
+# converted to affine with a single shared inversion
+def encode_g1_point_g2_point_pairs(g1_points, g2_points):
+  return [
+      encode_g1_point_g2_point_pair(p1, p2)
+      for p1, p2 in zip(batch_normalize(g1_points), batch_normalize(g2_points))
+  ]
+
+
+# returns integer backed jacobian point of decoded affine point
+def int_jacobian(F, p):
+  return (F.one, F.one, F.zero) if p is None else (p[0], p[1], F.one)
+
+
+# reference results are computed with integer backed arithmetic, each takes
+# concatenated input of a vector and returns its expected result
+
+
+# returns sum of the two points of input
+def reference_add(F, decode_point, encode_point, data):
+  half = len(data) // 2
+  r = jacobian_add(int_jacobian(F, decode_point(data[:half])),
+                   int_jacobian(F, decode_point(data[half:])))
+  return "".join(encode_point(normalize(r)))
+
+
+# returns sum of products of point scalar pairs of input, input of
+# multiplication is a single pair
+def reference_multiexp(F, decode_pairs, encode_point, data):
+  pairs = decode_pairs(data)
+  r = multi_scalar_mul([int_jacobian(F, p) for p, _ in pairs],
+                       [e for _, e in pairs])
+  return "".join(encode_point(normalize(r)))
+
+
+# returns result of batched pairing check
+def reference_pairing(data):
+  pairs = decode_g1_point_g2_point_pairs(data)
+  return ONE32 if pairing_check(pairs) else ZERO32
+
+
+def reference_map_g1(data):
+  return "".join(encode_g1_point(map_to_g1(int(data, 16))))
+
+
+def reference_map_g2(data):
+  u = (int(data[:128], 16), int(data[128:], 16))
+  return "".join(encode_g2_point(map_to_g2(u)))
 
 
-def make_vector(inputs, expecteds, name):
-  return "{{\ninput:\n{},\nexpected:\n{},\nname: \"{}\",\n}},".format(
-      concat_list(inputs), concat_list(expecteds), name)
+# reference result functions by name of matter csv
+MATTER_REFERENCES = {
+    "g1_add":
+        functools.partial(reference_add, FP, decode_g1_point, encode_g1_point),
+    "g1_mul":
+        functools.partial(reference_multiexp, FP, decode_g1_point_scalar_pairs,
+                          encode_g1_point),
+    "g1_multiexp":
+        functools.partial(reference_multiexp, FP, decode_g1_point_scalar_pairs,
+                          encode_g1_point),
+    "g2_add":
+        functools.partial(reference_add, FP2, decode_g2_point, encode_g2_point),
+    "g2_mul":
+        functools.partial(reference_multiexp, FP2, decode_g2_point_scalar_pairs,
+                          encode_g2_point),
+    "g2_multiexp":
+        functools.partial(reference_multiexp, FP2, decode_g2_point_scalar_pairs,
+                          encode_g2_point),
+    "pairing":
+        reference_pairing,
+    "fp_to_g1":
+        reference_map_g1,
+    "fp2_to_g2":
+        reference_map_g2,
+}
 
 
-def make_matter_vectors(op_name):
-  vectors = []
-  with open("./matter/{}.csv".format(op_name), newline='') as csvfile:
+# checks expected result of a pairing vector against batched pairing check
+def verify_pairing_vector(inputs, expecteds, name):
+  assert [reference_pairing("".join(inputs))] == expecteds, name
+
+
+# returns verify function of make_matter_vectors that checks expected result
+# of each vector against reference result of the operation
+def matter_verifier(op_name):
+  reference = MATTER_REFERENCES[op_name]
+
+  def verify(inputs, expecteds, name):
+    assert reference("".join(inputs)) == "".join(expecteds), name
+
+  return verify
+
+
+def matter_csv_path(op_name):
+  return os.path.join(HERE, "matter", "{}.csv".format(op_name))
+
+
+# returns a function that builds a vector after its expected result is checked
+# with verify, so that the check is done only by the shard that owns the vector
+# random generator that the function is called with is not used
+def verified_vector(inputs, expecteds, name, verify):
+
+  def build(rng):
+    verify(inputs, expecteds, name)
+    return make_vector(inputs, expecteds, name)
+
+  return build
+
+
+# returns a function that builds a vector with expected results of
+# expected(*args), they are computed only by the shard that owns the vector
+def deferred_vector(inputs, name, expected, *args):
+
+  def build(rng):
+    return make_vector(inputs, expected(*args), name)
+
+  return build
+
+
+# returns encoded multi scalar multiplication of bases and scalars
+def multiexp_expected(encode_point, bases, scalars):
+  return encode_point(multi_scalar_mul(bases, scalars))
+
+
+# verify is called with inputs, expected results and name of each vector
+def make_matter_vectors(op_name, verify=None):
+  with open(matter_csv_path(op_name), newline='') as csvfile:
     reader = csv.DictReader(csvfile)
     for i, row in enumerate(reader):
       name = "matter_{}_{}".format(op_name, i)
-      v = make_vector([row['input']], [row['result']], name)
-      vectors.append(v)
-  return vectors
-
-
-def make_fail_vector(inputs, error, name):
-  return "{{\ninput:\n{},\nexpectedError: {},\nname: \"{}\",\n}},".format(
-      concat_list(inputs), error, name)
+      if verify is not None:
+        yield verified_vector([row['input']], [row['result']], name, verify)
+      else:
+        yield make_vector([row['input']], [row['result']], name)
+
+
+# number of rows of a matter csv verified by a single task
+MATTER_CHUNK = 8
+
+
+# returns matter operation of a csv file, name of the file is the operation
+# optionally followed by an underscore and a suffix such as g1_add_large.csv
+def matter_csv_op(path):
+  stem = os.path.splitext(os.path.basename(path))[0]
+  for op_name in sorted(MATTER_REFERENCES, key=len, reverse=True):
+    if stem == op_name or stem.startswith(op_name + "_"):
+      return op_name
+  raise ValueError("{}: unknown matter operation".format(path))
+
+
+# yields (op name, path, index of first row, rows) chunks of matter csv files
+def matter_chunks(paths):
+  for path in paths:
+    op_name = matter_csv_op(path)
+    with open(path, newline='') as csvfile:
+      reader = csv.DictReader(csvfile)
+      start = 0
+      while True:
+        rows = [(row['input'], row['result'])
+                for row in itertools.islice(reader, MATTER_CHUNK)]
+        if not rows:
+          break
+        yield op_name, path, start, rows
+        start += len(rows)
+
+
+# returns (path, index, expected, result) of each row of a chunk whose
+# expected result differs from reference result, result is the error message
+# when the row cannot be decoded
+def verify_matter_chunk(chunk):
+  op_name, path, start, rows = chunk
+  reference = MATTER_REFERENCES[op_name]
+  mismatches = []
+  for i, (data, expected) in enumerate(rows, start):
+    try:
+      result = reference(data)
+    except (AssertionError, ValueError) as e:
+      result = "{} {}".format(type(e).__name__, e).strip()
+    if result != expected:
+      mismatches.append((path, i, expected, result))
+  return len(rows), mismatches
+
+
+# yields results of f over items in order from a process pool of given jobs,
+# at most twice as many items as jobs are in flight at a time
+def bounded_map(f, items, jobs):
+  with ProcessPoolExecutor(max_workers=jobs) as executor:
+    pending = collections.deque()
+    for item in items:
+      pending.append(executor.submit(f, item))
+      if len(pending) >= 2 * jobs:
+        yield pending.popleft().result()
+    while pending:
+      yield pending.popleft().result()
+
+
+# recomputes results of every row of matter csv files, all files of matter/
+# by default, and returns number of rows verified and mismatching rows
+# chunks of rows are spread over worker processes so that expensive rows such
+# as multi pair pairings of a single file are verified in parallel
+def verify_matter_csvs(paths=None, jobs=1):
+  paths = paths or [matter_csv_path(op_name) for op_name in MATTER_REFERENCES]
+  chunks = matter_chunks(paths)
+  n, mismatches = 0, []
+  if jobs > 1:
+    results = bounded_map(verify_matter_chunk, chunks, jobs)
+  else:
+    results = map(verify_matter_chunk, chunks)
+  for count, chunk_mismatches in results:
+    n += count
+    mismatches += chunk_mismatches
+  return n, mismatches
 
 
 '''
@@ -402,116 +673,102 @@ Generate Tests
 
 # generates G1ADD happy case tests
 def gen_G1ADD_tests():
-  vectors = []
-
   # 1
   # G1 + G1 == 2 * G1
   name = "bls_g1add_(g1+g1=2*g1)"
-  a = G1
-  b = G1
-  r = add(a, b)
-  inputs = encode_g1_point(a) + encode_g1_point(b)
+  a = J_G1
+  b = J_G1
+  r = jacobian_add(a, b)
+  inputs = join_inputs([encode_g1_point(a), encode_g1_point(b)])
   expected = encode_g1_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 2
   # 3 * G1 + 2 * G1 == 5 * G1
   name = "bls_g1add_(2*g1+3*g1=5*g1)"
-  a = multiply(G1, 2)
-  b = multiply(G1, 3)
-  r = add(a, b)
-  inputs = encode_g1_point(a) + encode_g1_point(b)
+  a = fixed_base_mul(J_G1, 2)
+  b = fixed_base_mul(J_G1, 3)
+  r = jacobian_add(a, b)
+  inputs = join_inputs([encode_g1_point(a), encode_g1_point(b)])
   expected = encode_g1_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 3
   # inf + G1 == G1
   name = "bls_g1add_(inf+g1=g1)"
-  inputs = encode_g1_point(G1) + encode_g1_point(INFINITY1)
+  inputs = join_inputs([encode_g1_point(G1), encode_g1_point(INFINITY1)])
   expected = encode_g1_point(G1)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 4
   # inf + inf == inf
   name = "bls_g1add_(inf+inf=inf)"
-  inputs = encode_g1_point(INFINITY1) + encode_g1_point(INFINITY1)
+  inputs = join_inputs([encode_g1_point(INFINITY1), encode_g1_point(INFINITY1)])
   expected = encode_g1_point(INFINITY1)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # append matter vectors
-  vectors = vectors + make_matter_vectors('g1_add')
-
-  generated = "\nvar blsG1ADDTests = []precompiledTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield from make_matter_vectors('g1_add')
 
 
 # generates G1ADD failure tests
 def gen_G1ADD_fail_tests():
-  vectors = []
-
   # 1
   # Empty input
   name = "bls_g1add_empty_input"
   inputs = ['']
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 1
   # Short input
   name = "bls_g1add_short_input"
-  inputs = bad_encode_g1_point_short() + encode_g1_point(G1)
+  inputs = join_inputs([bad_encode_g1_point_short(), encode_g1_point(G1)])
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 2
   # Large input
   name = "bls_g1add_large_input"
-  inputs = bad_encode_g1_point_large() + encode_g1_point(G1)
+  inputs = join_inputs([bad_encode_g1_point_large(), encode_g1_point(G1)])
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 3
   # Violate top bytes
   name = "bls_g1add_violate_top_bytes"
-  inputs = bad_encode_g1_point_top_bytes() + encode_g1_point(G1)
+  inputs = join_inputs([bad_encode_g1_point_top_bytes(), encode_g1_point(G1)])
   error = ERROR_FIELD_ELEMENT_TOP_BYTES
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 4
   # Invalid field element
   name = "bls_g1add_invalid_field_element"
-  inputs = bad_encode_g1_point_invalid_field_element() + encode_g1_point(G1)
+  inputs = join_inputs(
+      [bad_encode_g1_point_invalid_field_element(),
+       encode_g1_point(G1)])
   error = ERROR_INVALID_FIELD_ELEMENT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 5
   # Point is not on curve
   name = "bls_g1add_point_not_on_curve"
-  inputs = encode_g1_point_not_on_curve() + encode_g1_point(G1)
+  inputs = join_inputs([encode_g1_point_not_on_curve(), encode_g1_point(G1)])
   error = ERROR_POINT_G1_IS_NOT_ON_CURVE
-  vectors.append(make_fail_vector(inputs, error, name))
-
-  generated = "\nvar blsG1ADDFailTests = []precompiledFailureTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield make_fail_vector(inputs, error, name)
 
 
 # generates G1MUL happy case tests
 def gen_G1MUL_tests():
-  vectors = []
-
   # 1
   # 0 * G1 == inf
   name = "bls_g1mul_(0*g1=inf)"
-  a = G1
+  a = J_G1
   e = 0
-  r = multiply(a, e)
+  r = fixed_base_mul(a, e)
   inputs = encode_g1_point_scalar_pair(a, e)
   expected = encode_g1_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 2
   # x * inf == inf
@@ -519,307 +776,263 @@ def gen_G1MUL_tests():
   e = 17
   inputs = encode_g1_point_scalar_pair(INFINITY1, e)
   expected = encode_g1_point(INFINITY1)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 3
   # 1 * G1 == G1
   name = "bls_g1mul_(1*g1=g1)"
-  a = G1
+  a = J_G1
   e = 0
-  r = multiply(a, e)
+  r = fixed_base_mul(a, e)
   inputs = encode_g1_point_scalar_pair(a, e)
   expected = encode_g1_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 4
   # 17 * G1
   name = "bls_g1mul_(17*g1)"
-  a = G1
+  a = J_G1
   e = 17
-  r = multiply(a, e)
+  r = fixed_base_mul(a, e)
   inputs = encode_g1_point_scalar_pair(a, e)
   expected = encode_g1_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # append matter vectors
-  vectors = vectors + make_matter_vectors('g1_mul')
-
-  generated = "\nvar blsG1MULTests = []precompiledTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield from make_matter_vectors('g1_mul')
 
 
 # generates G1MUL failure tests
 def gen_G1MUL_fail_tests():
-  vectors = []
-
   # 1
   # Empty input
   name = "bls_g1mul_empty_input"
   inputs = ['']
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 1
   # Short input
   name = "bls_g1mul_short_input"
   inputs = bad_encode_g1_point_scalar_pair_short()
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 2
   # Large input
   name = "bls_g1mul_large_input"
   inputs = bad_encode_g1_point_scalar_pair_large()
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 3
   # Violate top bytes
   name = "bls_g1mul_violate_top_bytes"
   inputs = bad_encode_g1_point_scalar_pair_top_bytes()
   error = ERROR_FIELD_ELEMENT_TOP_BYTES
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 4
   # Invalid field element
   name = "bls_g1mul_invalid_field_element"
   inputs = bad_encode_g1_point_scalar_pair_invalid_field_element()
   error = ERROR_INVALID_FIELD_ELEMENT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 5
   # Point is not on curve
   name = "bls_g1mul_point_not_on_curve"
   inputs = encode_g1_point_scalar_pair(g1_point_is_not_on_curve(), 1)
   error = ERROR_POINT_G1_IS_NOT_ON_CURVE
-  vectors.append(make_fail_vector(inputs, error, name))
-
-  generated = "\nvar blsG1MULFailTests = []precompiledFailureTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield make_fail_vector(inputs, error, name)
 
 
 # generates G1MUL happy case tests
 def gen_G1MULTIEXP_tests():
-  vectors = []
-
   # 1
   # Single pair
   name = "bls_g1multiexp_single"
-  a = G1
+  a = J_G1
   e = 17
-  r = multiply(a, e)
+  r = multi_scalar_mul([a], [e])
   inputs = encode_g1_point_scalar_pair(a, e)
   expected = encode_g1_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 1
   # Multiple pairs
   name = "bls_g1multiexp_multiple"
-  bases = [G1, multiply(G1, 1001), multiply(G1, 1002)]
+  bases = [J_G1, fixed_base_mul(J_G1, 1001), fixed_base_mul(J_G1, 1002)]
   scalars = [50, 51, 52]
-  acc_result = INFINITY1
-  acc_input = []
-  for p, e in zip(bases, scalars):
-    acc_result = add(multiply(p, e), acc_result)
-    acc_input = acc_input + encode_g1_point_scalar_pair(p, e)
-  inputs = acc_input
-  expected = encode_g1_point(acc_result)
-  vectors.append(make_vector(inputs, expected, name))
+  inputs = join_inputs(
+      encode_g1_point_scalar_pair(p, e) for p, e in zip(bases, scalars))
+  yield deferred_vector(inputs, name, multiexp_expected, encode_g1_point, bases,
+                        scalars)
 
   # 2
   # Larger set
   name = "bls_g1multiexp_larger"
   N, b, ez = 25, 1, 91
   e = ez
-  acc_result = INFINITY1
-  acc_input = []
+  bases, scalars = [], []
   for _ in range(N):
-    base = multiply(G1, b)
-    acc_result = add(multiply(base, e), acc_result)
-    acc_input = acc_input + encode_g1_point_scalar_pair(base, e)
+    bases.append(fixed_base_mul(J_G1, b))
+    scalars.append(e)
     e = (e * ez) % curve_order
     b += 1
-  inputs = acc_input
-  expected = encode_g1_point(acc_result)
-  vectors.append(make_vector(inputs, expected, name))
+  inputs = join_inputs(
+      encode_g1_point_scalar_pair(p, e)
+      for p, e in zip(batch_normalize(bases), scalars))
+  yield deferred_vector(inputs, name, multiexp_expected, encode_g1_point, bases,
+                        scalars)
 
   # append matter vectors
-  vectors = vectors + make_matter_vectors('g1_multiexp')
-
-  generated = "\nvar blsG1MULTIEXPTests = []precompiledTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield from make_matter_vectors('g1_multiexp')
 
 
 # generates G1MUL fail tests
 def gen_G1MULTIEXP_fail_tests():
-  vectors = []
-
   # 1
   # Empty input
   name = "bls_g1multiexp_empty_input"
   inputs = ['']
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 1
   # Short input
   name = "bls_g1multiexp_short_input"
   inputs = bad_encode_g1_point_scalar_pair_short()
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 2
   # Large input
   name = "bls_g1multiexp_large_input"
   inputs = bad_encode_g1_point_scalar_pair_large()
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 3
   # Invalid field element
   name = "bls_g1multiexp_invalid_field_element"
   inputs = bad_encode_g1_point_scalar_pair_invalid_field_element()
   error = ERROR_INVALID_FIELD_ELEMENT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 4
   # Violate top bytes
   name = "bls_g1multiexp_violate_top_bytes"
   inputs = bad_encode_g1_point_scalar_pair_top_bytes()
   error = ERROR_FIELD_ELEMENT_TOP_BYTES
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 5
   # Point is not on curve
   name = "bls_g1multiexp_point_not_on_curve"
   inputs = encode_g1_point_scalar_pair(g1_point_is_not_on_curve(), 1)
   error = ERROR_POINT_G1_IS_NOT_ON_CURVE
-  vectors.append(make_fail_vector(inputs, error, name))
-
-  generated = "\nvar blsG1MULTIEXPFailTests = []precompiledFailureTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield make_fail_vector(inputs, error, name)
 
 
 # generates G2ADD happy case tests
 def gen_G2ADD_tests():
-  vectors = []
-
   # 1
   # G2 + G2 == 2 * G2
   name = "bls_g2add_(g2+g2=2*g2)"
-  a = G2
-  b = G2
-  r = add(a, b)
-  inputs = encode_g2_point(a) + encode_g2_point(b)
+  a = J_G2
+  b = J_G2
+  r = jacobian_add(a, b)
+  inputs = join_inputs([encode_g2_point(a), encode_g2_point(b)])
   expected = encode_g2_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 2
   # 2 * G2 + 3 * G2 = 5 * G2
   name = "bls_g2add_(2*g2+3*g2=5*g2)"
-  a = multiply(G2, 2)
-  b = multiply(G2, 3)
-  r = add(a, b)
-  inputs = encode_g2_point(a) + encode_g2_point(b)
+  a = fixed_base_mul(J_G2, 2)
+  b = fixed_base_mul(J_G2, 3)
+  r = jacobian_add(a, b)
+  inputs = join_inputs([encode_g2_point(a), encode_g2_point(b)])
   expected = encode_g2_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 3
   # inf + G2 == G2
   name = "bls_g2add_(inf+g2=g2)"
-  inputs = encode_g2_point(G2) + encode_g2_point(INFINITY2)
+  inputs = join_inputs([encode_g2_point(G2), encode_g2_point(INFINITY2)])
   expected = encode_g2_point(G2)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 4
   # inf + inf == inf
   name = "bls_g2add_(inf+inf=inf)"
-  inputs = encode_g2_point(INFINITY2) + encode_g2_point(INFINITY2)
+  inputs = join_inputs([encode_g2_point(INFINITY2), encode_g2_point(INFINITY2)])
   expected = encode_g2_point(INFINITY2)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # append matter vectors
-  vectors = vectors + make_matter_vectors('g2_add')
-
-  generated = "\nvar blsG2ADDTests = []precompiledTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield from make_matter_vectors('g2_add')
 
 
 # generates G2ADD failure tests
 def gen_G2ADD_fail_tests():
-  vectors = []
-
   # 1
   # Empty input
   name = "bls_g2add_empty_input"
   inputs = ['']
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 1
   # Short input
   name = "bls_g2add_short_input"
-  inputs = bad_encode_g2_point_short() + encode_g2_point(G2)
+  inputs = join_inputs([bad_encode_g2_point_short(), encode_g2_point(G2)])
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 2
   # Large input
   name = "bls_g2add_large_input"
-  inputs = bad_encode_g2_point_large() + encode_g2_point(G2)
+  inputs = join_inputs([bad_encode_g2_point_large(), encode_g2_point(G2)])
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 3
   # Violate top bytes
   name = "bls_g2add_violate_top_bytes"
-  inputs = bad_encode_g2_point_top_bytes() + encode_g2_point(G2)
+  inputs = join_inputs([bad_encode_g2_point_top_bytes(), encode_g2_point(G2)])
   error = ERROR_FIELD_ELEMENT_TOP_BYTES
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 4
   # Invalid field element
   name = "bls_g2add_invalid_field_element"
-  inputs = bad_encode_g2_point_invalid_field_element() + encode_g2_point(G2)
+  inputs = join_inputs(
+      [bad_encode_g2_point_invalid_field_element(),
+       encode_g2_point(G2)])
   error = ERROR_INVALID_FIELD_ELEMENT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 5
   # Point is not on curve
   name = "bls_g2add_point_not_on_curve"
-  inputs = encode_g2_point_not_on_curve() + encode_g2_point(G2)
+  inputs = join_inputs([encode_g2_point_not_on_curve(), encode_g2_point(G2)])
   error = ERROR_POINT_G2_IS_NOT_ON_CURVE
-  vectors.append(make_fail_vector(inputs, error, name))
-
-  generated = "\nvar blsG2ADDFailTests = []precompiledFailureTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield make_fail_vector(inputs, error, name)
 
 
 # generates G2MUL happy case tests
 def gen_G2MUL_tests():
-  vectors = []
-
   # 1
   # 0 * G2 == inf
   name = "bls_g2mul_(0*g2=inf)"
-  a = G2
+  a = J_G2
   e = 0
-  r = multiply(a, e)
+  r = fixed_base_mul(a, e)
   inputs = encode_g2_point_scalar_pair(a, e)
   expected = encode_g2_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 2
   # x * inf == inf
@@ -827,474 +1040,1366 @@ def gen_G2MUL_tests():
   e = 17
   inputs = encode_g2_point_scalar_pair(INFINITY2, e)
   expected = encode_g2_point(INFINITY2)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 3
   # 1 * G2 == G2
   name = "bls_g2mul_(1*g2=g2)"
-  a = G2
+  a = J_G2
   e = 0
-  r = multiply(a, e)
+  r = fixed_base_mul(a, e)
   inputs = encode_g2_point_scalar_pair(a, e)
   expected = encode_g2_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 4
   # 17 * G2
   name = "bls_g2mul_(17*g2)"
-  a = G2
+  a = J_G2
   e = 17
-  r = multiply(a, e)
+  r = fixed_base_mul(a, e)
   inputs = encode_g2_point_scalar_pair(a, e)
   expected = encode_g2_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # append matter vectors
-  vectors = vectors + make_matter_vectors('g2_mul')
-
-  generated = "\nvar blsG2MULTests = []precompiledTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield from make_matter_vectors('g2_mul')
 
 
 # generates G2MUL failure tests
 def gen_G2MUL_fail_tests():
-  vectors = []
-
   # 1
   # Empty input
   name = "bls_g2mul_empty_input"
   inputs = ['']
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 1
   # Short input
   name = "bls_g2mul_short_input"
   inputs = bad_encode_g2_point_scalar_pair_short()
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 2
   # Large input
   name = "bls_g2mul_large_input"
   inputs = bad_encode_g2_point_scalar_pair_large()
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 3
   # Violate top bytes
   name = "bls_g2mul_violate_top_bytes"
   inputs = bad_encode_g2_point_scalar_pair_top_bytes()
   error = ERROR_FIELD_ELEMENT_TOP_BYTES
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 4
   # Invalid field element
   name = "bls_g2mul_invalid_field_element"
   inputs = bad_encode_g2_point_scalar_pair_invalid_field_element()
   error = ERROR_INVALID_FIELD_ELEMENT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 5
   # Point is not on curve
   name = "bls_g2mul_point_not_on_curve"
   inputs = encode_g2_point_scalar_pair(g2_point_is_not_on_curve(), 1)
   error = ERROR_POINT_G2_IS_NOT_ON_CURVE
-  vectors.append(make_fail_vector(inputs, error, name))
-
-  generated = "\nvar blsG2MULFailTests = []precompiledFailureTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield make_fail_vector(inputs, error, name)
 
 
 # generates G2MULTIEXP happy case tests
 def gen_G2MULTIEXP_tests():
-  vectors = []
-
   # 1
   # Single pair
   name = "bls_g2multiexp_single"
-  a = G2
+  a = J_G2
   e = 17
-  r = multiply(a, e)
+  r = multi_scalar_mul([a], [e])
   inputs = encode_g2_point_scalar_pair(a, e)
   expected = encode_g2_point(r)
-  vectors.append(make_vector(inputs, expected, name))
+  yield make_vector(inputs, expected, name)
 
   # 1
   # Multiple pairs
   name = "bls_g2multiexp_multiple"
-  bases = [G2, multiply(G2, 1001), multiply(G2, 1002)]
+  bases = [J_G2, fixed_base_mul(J_G2, 1001), fixed_base_mul(J_G2, 1002)]
   scalars = [50, 51, 52]
-  acc_result = INFINITY2
-  acc_input = []
-  for p, e in zip(bases, scalars):
-    x = multiply(p, e)
-    acc_result = add(x, acc_result)
-    acc_input = acc_input + encode_g2_point_scalar_pair(p, e)
-  inputs = acc_input
-  expected = encode_g2_point(acc_result)
-  vectors.append(make_vector(inputs, expected, name))
+  inputs = join_inputs(
+      encode_g2_point_scalar_pair(p, e) for p, e in zip(bases, scalars))
+  yield deferred_vector(inputs, name, multiexp_expected, encode_g2_point, bases,
+                        scalars)
 
   # 2
   # Larger set
   name = "bls_g2multiexp_larger"
   N, b, ez = 25, 1, 91
   e = ez
-  acc_result = INFINITY2
-  acc_input = []
+  bases, scalars = [], []
   for _ in range(N):
-    base = multiply(G2, b)
-    acc_result = add(multiply(base, e), acc_result)
-    acc_input = acc_input + encode_g2_point_scalar_pair(base, e)
+    bases.append(fixed_base_mul(J_G2, b))
+    scalars.append(e)
     e = (e * ez) % curve_order
     b += 1
-  inputs = acc_input
-  expected = encode_g2_point(acc_result)
-  vectors.append(make_vector(inputs, expected, name))
+  inputs = join_inputs(
+      encode_g2_point_scalar_pair(p, e)
+      for p, e in zip(batch_normalize(bases), scalars))
+  yield deferred_vector(inputs, name, multiexp_expected, encode_g2_point, bases,
+                        scalars)
 
   # append matter vectors
-  vectors = vectors + make_matter_vectors('g2_multiexp')
-
-  generated = "\nvar blsG2MULTIEXPTests = []precompiledTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield from make_matter_vectors('g2_multiexp')
 
 
 # generates G2MULTIEXP fail tests
 def gen_G2MULTIEXP_fail_tests():
-  vectors = []
-
   # 1
   # Empty input
   name = "bls_g2multiexp_empty_input"
   inputs = ['']
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 2
   # Short input
   name = "bls_g2multiexp_short_input"
   inputs = bad_encode_g2_point_scalar_pair_short()
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 3
   # Large input
   name = "bls_g2multiexp_large_input"
   inputs = bad_encode_g2_point_scalar_pair_large()
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 4
   # Violate top bytes
   name = "bls_g2multiexp_violate_top_bytes"
   inputs = bad_encode_g2_point_scalar_pair_top_bytes()
   error = ERROR_FIELD_ELEMENT_TOP_BYTES
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 5
   # Invalid field element
   name = "bls_g2multiexp_invalid_field_element"
   inputs = bad_encode_g2_point_scalar_pair_invalid_field_element()
   error = ERROR_INVALID_FIELD_ELEMENT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 5
   # Point is not on curve
   name = "bls_g2multiexp_point_not_on_curve"
   inputs = encode_g2_point_scalar_pair(g2_point_is_not_on_curve(), 1)
   error = ERROR_POINT_G2_IS_NOT_ON_CURVE
-  vectors.append(make_fail_vector(inputs, error, name))
-
-  generated = "\nvar blsG2MULTIEXPFailTests = []precompiledFailureTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield make_fail_vector(inputs, error, name)
 
 
 # generates mapping fp to g1 test vectors
 def gen_MAPG1_tests():
-  vectors = []
-  # name = "bls_mapg1_expected"
   # append matter vectors
-  vectors = vectors + make_matter_vectors('fp_to_g1')
-
-  generated = "\nvar blsMAPG1Tests = []precompiledTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield from make_matter_vectors('fp_to_g1', matter_verifier('fp_to_g1'))
 
 
 # generates mapping fp2 to g2 test vectors
 def gen_MAPG2_tests():
-  vectors = []
-  # name = "bls_mapg2_expected"
   # append matter vectors
-  vectors = vectors + make_matter_vectors('fp2_to_g2')
-
-  generated = "\nvar blsMAPG2Tests = []precompiledTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield from make_matter_vectors('fp2_to_g2', matter_verifier('fp2_to_g2'))
 
 
 # generates mapping to curve failed test vectors
 def gen_MAPG1_fail_tests():
-  vectors = []
-
   # 1
   # Empty input
   name = "bls_mapg1_empty_input"
   inputs = ['']
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 2
   # Short input
   name = "bls_mapg1_short_input"
   inputs = [ZERO64[2:]]
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 3
   # Violate top bytes
   name = "bls_mapg1_top_bytes"
   inputs = [bad_encode_field_element_top_bytes(None)]
   error = ERROR_FIELD_ELEMENT_TOP_BYTES
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 4
   # Invalid field element
   name = "bls_mapg1_invalid_fq_element"
   inputs = [bad_encode_invalid_field_element()]
   error = ERROR_INVALID_FIELD_ELEMENT
-  vectors.append(make_fail_vector(inputs, error, name))
-
-  generated = "\nvar blsMAPG1FailTests = []precompiledFailureTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield make_fail_vector(inputs, error, name)
 
 
 # generates mapping to curve failed test vectors
 def gen_MAPG2_fail_tests():
-  vectors = []
-
   # 1
   # Empty input
   name = "bls_mapg2_empty_input"
   inputs = ['']
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 2
   # Short input
   name = "bls_mapg2_short_input"
   inputs = [ZERO64, ZERO64[2:]]
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 3
   # Violate top bytes
   name = "bls_mapg2_top_bytes"
   inputs = [ZERO64, bad_encode_field_element_top_bytes(None)]
   error = ERROR_FIELD_ELEMENT_TOP_BYTES
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 4
   # Invalid field element
   name = "bls_mapg2_invalid_fq_element"
   inputs = [ZERO64, bad_encode_invalid_field_element()]
   error = ERROR_INVALID_FIELD_ELEMENT
-  vectors.append(make_fail_vector(inputs, error, name))
-
-  generated = "\nvar blsMAPG2FailTests = []precompiledFailureTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield make_fail_vector(inputs, error, name)
 
 
 # generates mapping to curve failed test vectors
 def gen_PAIRING_tests():
-  vectors = []
-
   # 1
   # Two pair checks true
   # e(2 * G1, 3 * G2) == e(6 * G1, G2)
   name = "bls_pairing_e(2*G1,3*G2)=e(6*G1,G2)"
-  a0 = multiply(G1, 2)
-  a1 = multiply(G2, 3)
-  b0 = multiply(G1, 6)
-  b1 = neg(G2)
-  inputs = encode_g1_point(a0) + encode_g2_point(a1) + encode_g1_point(
-      b0) + encode_g2_point(b1)
+  a0 = fixed_base_mul(J_G1, 2)
+  a1 = fixed_base_mul(J_G2, 3)
+  b0 = fixed_base_mul(J_G1, 6)
+  b1 = jacobian_neg(J_G2)
+  inputs = join_inputs([
+      encode_g1_point(a0),
+      encode_g2_point(a1),
+      encode_g1_point(b0),
+      encode_g2_point(b1)
+  ])
   expected = [ONE32]
-  vectors.append(make_vector(inputs, expected, name))
+  yield verified_vector(inputs, expected, name, verify_pairing_vector)
 
   # 2
   # Two pair checks false
   # e(2 * G1, 3 * G2) == e(5 * G1, G2)
   name = "bls_pairing_e(2*G1,3*G2)=e(5*G1,G2)"
-  a0 = multiply(G1, 2)
-  a1 = multiply(G2, 3)
-  b0 = multiply(G1, 5)
-  b1 = neg(G2)
-  inputs = encode_g1_point(a0) + encode_g2_point(a1) + encode_g1_point(
-      b0) + encode_g2_point(b1)
+  a0 = fixed_base_mul(J_G1, 2)
+  a1 = fixed_base_mul(J_G2, 3)
+  b0 = fixed_base_mul(J_G1, 5)
+  b1 = jacobian_neg(J_G2)
+  inputs = join_inputs([
+      encode_g1_point(a0),
+      encode_g2_point(a1),
+      encode_g1_point(b0),
+      encode_g2_point(b1)
+  ])
   expected = [ZERO32]
-  vectors.append(make_vector(inputs, expected, name))
+  yield verified_vector(inputs, expected, name, verify_pairing_vector)
 
   # 3
   # Ten pair checks true
   name = "bls_pairing_10paircheckstrue"
   N, s1, s2 = 10, 11, 21
-  inputs = []
+  g1_points, g2_points = [], []
   acc_result = 0
   for _ in range(N - 1):
-    a1 = multiply(G1, s1)
-    a2 = multiply(G2, s2)
+    g1_points.append(fixed_base_mul(J_G1, s1))
+    g2_points.append(fixed_base_mul(J_G2, s2))
     acc_result += s1 * s2
     s1 += 1
     s2 += 1
-    inputs = inputs + encode_g1_point_g2_point_pair(a1, a2)
-  a1 = multiply(G1, acc_result)
-  a2 = neg(G2)
-  inputs = inputs + encode_g1_point_g2_point_pair(a1, a2)
+  a1 = fixed_base_mul(J_G1, acc_result)
+  a2 = jacobian_neg(J_G2)
+  inputs = join_inputs(
+      encode_g1_point_g2_point_pairs(g1_points + [a1], g2_points + [a2]))
   expected = [ONE32]
-  vectors.append(make_vector(inputs, expected, name))
+  yield verified_vector(inputs, expected, name, verify_pairing_vector)
 
   # 4
   # Ten pair checks false
   name = "bls_pairing_10pairchecksfalse"
   N, s1, s2 = 10, 11, 21
-  inputs = []
+  g1_points, g2_points = [], []
   acc_result = 0
   for _ in range(N - 1):
-    a1 = multiply(G1, s1)
-    a2 = multiply(G2, s2)
+    g1_points.append(fixed_base_mul(J_G1, s1))
+    g2_points.append(fixed_base_mul(J_G2, s2))
     acc_result += s1 * s2
     s1 += 1
     s2 += 1
-    inputs = inputs + encode_g1_point_g2_point_pair(a1, a2)
-  a1 = multiply(G1, acc_result)
+  a1 = fixed_base_mul(J_G1, acc_result)
   # same vector with #3 but omiting negation at the end
-  a2 = G2
-  inputs = inputs + encode_g1_point_g2_point_pair(a1, a2)
+  a2 = J_G2
+  inputs = join_inputs(
+      encode_g1_point_g2_point_pairs(g1_points + [a1], g2_points + [a2]))
   expected = [ZERO32]
-  vectors.append(make_vector(inputs, expected, name))
+  yield verified_vector(inputs, expected, name, verify_pairing_vector)
 
   # append matter vectors
-  vectors = vectors + make_matter_vectors('pairing')
-
-  generated = "\nvar blsPAIRINGTests = []precompiledTest{{\n{}\n}}".format(
-      "\n".join(vectors))
-
-  return generated
+  yield from make_matter_vectors('pairing', verify_pairing_vector)
 
 
 def gen_PAIRING_fail_tests():
-  vectors = []
-
   # 1
   # Empty input
   name = "bls_pairing_empty_input"
   inputs = ['']
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 2
   # Extra data
   name = "bls_pairing_extra_data"
-  inputs = encode_g1_point(G1) + encode_g2_point(G2) + encode_g1_point(
-      G1) + bad_encode_g2_point_large()
+  inputs = join_inputs([
+      encode_g1_point(G1),
+      encode_g2_point(G2),
+      encode_g1_point(G1),
+      bad_encode_g2_point_large()
+  ])
   error = ERROR_INVALID_INPUT_LENGHT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 3
   # Invalid field element
   name = "bls_pairing_invalid_field_element"
-  inputs = encode_g1_point(G1) + encode_g2_point(G2) + encode_g1_point(
-      G1) + bad_encode_g2_point_invalid_field_element()
+  inputs = join_inputs([
+      encode_g1_point(G1),
+      encode_g2_point(G2),
+      encode_g1_point(G1),
+      bad_encode_g2_point_invalid_field_element()
+  ])
   error = ERROR_INVALID_FIELD_ELEMENT
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 4
   # Violate top bytes
   name = "bls_pairing_top_bytes"
-  inputs = encode_g1_point(G1) + encode_g2_point(G2) + encode_g1_point(
-      G1) + bad_encode_g2_point_top_bytes()
+  inputs = join_inputs([
+      encode_g1_point(G1),
+      encode_g2_point(G2),
+      encode_g1_point(G1),
+      bad_encode_g2_point_top_bytes()
+  ])
   error = ERROR_FIELD_ELEMENT_TOP_BYTES
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 5
   # G1 Point is not on curve
   name = "bls_pairing_g1_not_on_curve"
-  inputs = encode_g1_point(G1) + encode_g2_point(G2) + encode_g1_point(
-      g1_point_is_not_on_curve()) + encode_g2_point(G2)
+  inputs = join_inputs([
+      encode_g1_point(G1),
+      encode_g2_point(G2),
+      encode_g1_point(g1_point_is_not_on_curve()),
+      encode_g2_point(G2)
+  ])
   error = ERROR_POINT_G1_IS_NOT_ON_CURVE
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 6
   # G2 Point is not on curve
   name = "bls_pairing_g2_not_on_curve"
-  inputs = encode_g1_point(G1) + encode_g2_point(G2) + encode_g1_point(
-      G1) + encode_g2_point(g2_point_is_not_on_curve())
+  inputs = join_inputs([
+      encode_g1_point(G1),
+      encode_g2_point(G2),
+      encode_g1_point(G1),
+      encode_g2_point(g2_point_is_not_on_curve())
+  ])
   error = ERROR_POINT_G2_IS_NOT_ON_CURVE
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 7
   # G1 Point is not in correct subgroup
   name = "bls_pairing_g1_not_in_correct_subgroup"
-  inputs = encode_g1_point(G1) + encode_g2_point(G2) + encode_g1_point(
-      g1_point_not_in_correct_subgroup()) + encode_g2_point(G2)
+  inputs = join_inputs([
+      encode_g1_point(G1),
+      encode_g2_point(G2),
+      encode_g1_point(g1_point_not_in_correct_subgroup()),
+      encode_g2_point(G2)
+  ])
   error = ERROR_POINT_G1_SUBGROUP
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
 
   # 8
   # G1 Point is not in correct subgroup
   name = "bls_pairing_g2_not_in_correct_subgroup"
-  inputs = encode_g1_point(G1) + encode_g2_point(G2) + encode_g1_point(
-      G1) + encode_g2_point(g2_point_not_in_correct_subgroup())
+  inputs = join_inputs([
+      encode_g1_point(G1),
+      encode_g2_point(G2),
+      encode_g1_point(G1),
+      encode_g2_point(g2_point_not_in_correct_subgroup())
+  ])
   error = ERROR_POINT_G2_SUBGROUP
-  vectors.append(make_fail_vector(inputs, error, name))
+  yield make_fail_vector(inputs, error, name)
+
+
+# returns jacobian points a * gen, a^2 * gen .. a^n * gen
+# each point is a times the previous one which takes fewer additions than a
+# fixed base multiplication by a^i reduced by curve order when a is small
+def power_multiples(gen, a, n):
+  points, p = [], gen
+  for _ in range(n):
+    p = jacobian_multiply(p, a)
+    points.append(p)
+  return points
+
+
+# length of params.Bls12381MultiExpDiscountTable
+MULTIEXP_DISCOUNT_TABLE_LEN = 128
+
+# multiexp calibration vectors are generated for k = 1 to this many pairs
+MULTIEXP_CALIBRATION_MAX_K = MULTIEXP_DISCOUNT_TABLE_LEN + 8
+
+# scalar with the maximum length and all bits set, every window of it is non
+# zero so both double and add and bucket method do the most additions
+WORST_CASE_SCALAR = 2**256 - 1
+
+
+# generates multiexp vectors of k = 1 .. MULTIEXP_CALIBRATION_MAX_K pairs
+# with worst case scalars, input of k pairs is prefix of input of k + 1 pairs
+# bases are a_i * g so expected result is (scalar * sum of a_i) * g
+# bases are shared by all vectors, expected result of a vector is computed
+# only by the shard that owns it
+def gen_multiexp_calibration(gen, encode_pair, encode_point, name):
+  ks = range(1, MULTIEXP_CALIBRATION_MAX_K + 1)
+  # a_k = 91^(k + 1) so bases start from the second power of 91
+  scalars = [(91**(k + 1)) % curve_order for k in ks]
+  bases = batch_normalize(
+      power_multiples(gen, 91, MULTIEXP_CALIBRATION_MAX_K + 1)[1:])
+  pairs = [encode_pair(base, WORST_CASE_SCALAR) for base in bases]
+
+  def vector(k, rng):
+    result = fixed_base_mul(gen, sum(scalars[:k]) * WORST_CASE_SCALAR)
+    return make_vector(join_inputs(pairs[:k]), encode_point(result),
+                       "{}_k={}".format(name, k))
+
+  for k in ks:
+    yield functools.partial(vector, k)
+
+
+def gen_G1MULTIEXP_calibration():
+  yield from gen_multiexp_calibration(J_G1, encode_g1_point_scalar_pair,
+                                      encode_g1_point,
+                                      "bls_g1multiexp_calibration")
+
+
+def gen_G2MULTIEXP_calibration():
+  yield from gen_multiexp_calibration(J_G2, encode_g2_point_scalar_pair,
+                                      encode_g2_point,
+                                      "bls_g2multiexp_calibration")
+
+
+# pairing calibration vectors are generated for k = 1, 2, 4 .. this many pairs
+PAIRING_CALIBRATION_MAX_K = 256
+
+
+# generates pairing vectors of k = 1, 2, 4 .. PAIRING_CALIBRATION_MAX_K pairs
+# that return true
+# first k - 1 pairs are e(a_i * G1, b_i * G2) and last one is
+# e(-(sum of a_i * b_i) * G1, G2) so that the product is one by construction
+# a single pair can only be true with point at infinity so k = 1 vector is
+# e(G1, infinity)
+# results are checked with a single batched pairing check per vector by the
+# shard that owns the vector
+def gen_PAIRING_calibration():
+  name = "bls_pairing_calibration_k=1"
+  inputs = join_inputs([encode_g1_point_g2_point_pair(J_G1, J_INFINITY2)])
+  yield verified_vector(inputs, [ONE32], name, verify_pairing_vector)
+  n = PAIRING_CALIBRATION_MAX_K - 1
+  a = [(91**(i + 1)) % curve_order for i in range(n)]
+  b = [(1001**(i + 1)) % curve_order for i in range(n)]
+  pairs = encode_g1_point_g2_point_pairs(power_multiples(J_G1, 91, n),
+                                         power_multiples(J_G2, 1001, n))
+
+  def vector(k, rng):
+    acc = sum(a[i] * b[i] for i in range(k - 1))
+    last = encode_g1_point_g2_point_pair(
+        fixed_base_mul(J_G1, -acc % curve_order), J_G2)
+    name = "bls_pairing_calibration_k={}".format(k)
+    inputs = join_inputs(pairs[:k - 1] + [last])
+    verify_pairing_vector(inputs, [ONE32], name)
+    return make_vector(inputs, [ONE32], name)
+
+  k = 2
+  while k <= PAIRING_CALIBRATION_MAX_K:
+    yield functools.partial(vector, k)
+    k *= 2
+
+
+# scalars of multiplication latency vectors, cost of double and add grows with
+# bit length and hamming weight of the scalar
+LATENCY_SCALARS = [
+    ("one", 1),
+    ("max_bit_length", 2**255),
+    ("alternating_bits", int("10" * 128, 2)),
+    ("curve_order_minus_one", curve_order - 1),
+    ("all_ones", WORST_CASE_SCALAR),
+]
+
+# number of pairs of inputs that have an invalid point
+LATENCY_PAIR_COUNTS = [2, 16, 128]
+
+
+# returns first, middle and last positions of k pairs
+def latency_positions(k):
+  return [("first", 0), ("middle", k // 2), ("last", k - 1)]
+
+
+# generates multiplication vectors of a fixed point with LATENCY_SCALARS
+def gen_mul_latency(gen, encode_pair, encode_point, name):
+  a = 91**25
+  for scalar_name, e in LATENCY_SCALARS:
+    inputs = encode_pair(fixed_base_mul(gen, a), e)
+    expected = encode_point(fixed_base_mul(gen, a * e))
+    yield make_vector(inputs, expected, "{}_{}".format(name, scalar_name))
+
+
+def gen_G1MUL_latency():
+  yield from gen_mul_latency(J_G1, encode_g1_point_scalar_pair, encode_g1_point,
+                             "bls_g1mul_latency")
+
+
+def gen_G2MUL_latency():
+  yield from gen_mul_latency(J_G2, encode_g2_point_scalar_pair, encode_g2_point,
+                             "bls_g2mul_latency")
+
+
+# generates fail vectors of LATENCY_PAIR_COUNTS pairs where one pair is
+# replaced with given bad pair at first, middle and last position
+# pairs are valid ones that would be evaluated before the bad one
+def gen_bad_pair_latency(pairs, bad_pair, error, name):
+  for k in LATENCY_PAIR_COUNTS:
+    for position_name, i in latency_positions(k):
+      inputs = join_inputs(pairs[:i] + [bad_pair] + pairs[i + 1:k])
+      yield make_fail_vector(inputs, error,
+                             "{}_k={}_{}".format(name, k, position_name))
+
+
+# multiexp does not check subgroups so a point that is not on curve is placed
+# instead, pairs have worst case scalars
+def gen_multiexp_latency(gen, encode_pair, bad_point, error, name):
+  bases = batch_normalize(power_multiples(gen, 91, max(LATENCY_PAIR_COUNTS)))
+  pairs = [encode_pair(p, WORST_CASE_SCALAR) for p in bases]
+  bad_pair = encode_pair(bad_point, WORST_CASE_SCALAR)
+  yield from gen_bad_pair_latency(pairs, bad_pair, error, name)
+
+
+def gen_G1MULTIEXP_latency():
+  yield from gen_multiexp_latency(J_G1, encode_g1_point_scalar_pair,
+                                  g1_point_is_not_on_curve(),
+                                  ERROR_POINT_G1_IS_NOT_ON_CURVE,
+                                  "bls_g1multiexp_latency_point_not_on_curve")
+
+
+def gen_G2MULTIEXP_latency():
+  yield from gen_multiexp_latency(J_G2, encode_g2_point_scalar_pair,
+                                  g2_point_is_not_on_curve(),
+                                  ERROR_POINT_G2_IS_NOT_ON_CURVE,
+                                  "bls_g2multiexp_latency_point_not_on_curve")
 
-  generated = "\nvar blsPAIRINGFailTests = []precompiledFailureTest{{\n{}\n}}".format(
-      "\n".join(vectors))
 
-  return generated
+# pairing vectors with a g1 or g2 point that is not in correct subgroup
+def gen_PAIRING_latency():
+  n = max(LATENCY_PAIR_COUNTS)
+  pairs = encode_g1_point_g2_point_pairs(power_multiples(J_G1, 91, n),
+                                         power_multiples(J_G2, 1001, n))
+  bad_pair = encode_g1_point_g2_point_pair(g1_point_not_in_correct_subgroup(),
+                                           J_G2)
+  yield from gen_bad_pair_latency(
+      pairs, bad_pair, ERROR_POINT_G1_SUBGROUP,
+      "bls_pairing_latency_g1_not_in_correct_subgroup")
+  bad_pair = encode_g1_point_g2_point_pair(J_G1,
+                                           g2_point_not_in_correct_subgroup())
+  yield from gen_bad_pair_latency(
+      pairs, bad_pair, ERROR_POINT_G2_SUBGROUP,
+      "bls_pairing_latency_g2_not_in_correct_subgroup")
 
 
-def generate_vectors():
+# number of random inputs of each section of map corpus
+MAP_CORPUS_VECTORS = 10000
 
-  f = open("../vectors_test.go", "w+")
-  f.write("package eip2537\n")
-  f.write(gen_G1ADD_tests())
-  f.write(gen_G1MUL_tests())
-  f.write(gen_G1MULTIEXP_tests())
-  f.write(gen_G2ADD_tests())
-  f.write(gen_G2MUL_tests())
-  f.write(gen_G2MULTIEXP_tests())
-  f.write(gen_PAIRING_tests())
-  f.write(gen_MAPG1_tests())
-  f.write(gen_MAPG2_tests())
 
-  f.write(gen_G1ADD_fail_tests())
-  f.write(gen_G1MUL_fail_tests())
-  f.write(gen_G1MULTIEXP_fail_tests())
-  f.write(gen_G2ADD_fail_tests())
-  f.write(gen_G2MUL_fail_tests())
-  f.write(gen_G2MULTIEXP_fail_tests())
-  f.write(gen_PAIRING_fail_tests())
-  f.write(gen_MAPG1_fail_tests())
-  f.write(gen_MAPG2_fail_tests())
-  f.close()
+# returns named inputs that take exceptional paths of simplified SWU
+# zero and roots of -1 / Z make Z^2 * u^4 + Z * u^2 zero, the roots exist
+# only for G1
+def map_edge_inputs(field_sqrt, field_neg, field_inv, z, zero, one):
+  inputs = [("zero", zero), ("one", one), ("minus_one", field_neg(one))]
+  root = field_sqrt(field_neg(field_inv(z)))
+  if root is not None:
+    inputs += [("exceptional", root), ("minus_exceptional", field_neg(root))]
+  return inputs
 
-  return
 
+# generates map vectors of edge inputs followed by MAP_CORPUS_VECTORS random
+# inputs, random vectors are built from their own random generator so that
+# they are split between shards
+def gen_map_corpus(edge_inputs, random_input, encode_input, map_to,
+                   encode_point, name):
+  for label, u in edge_inputs:
+    yield make_vector(encode_input(u), encode_point(map_to(u)),
+                      "{}_{}".format(name, label))
 
-generate_vectors()
+  def random_vector(i, rng):
+    u = random_input(rng)
+    return make_vector(encode_input(u), encode_point(map_to(u)),
+                       "{}_random_{}".format(name, i))
+
+  for i in range(MAP_CORPUS_VECTORS):
+    yield functools.partial(random_vector, i)
+
+
+def random_fp(rng):
+  return rng.randrange(field_modulus)
+
+
+def random_fp2(rng):
+  return (random_fp(rng), random_fp(rng))
+
+
+def encode_fp_input(u):
+  return [encode_field_element(u)]
+
+
+def encode_fp2_input(u):
+  return [encode_field_element(u[0]), encode_field_element(u[1])]
+
+
+def gen_MAPG1_corpus():
+  edge_inputs = map_edge_inputs(fp_sqrt, fp_neg, fp_inv, ISO_11_Z, 0, 1)
+  yield from gen_map_corpus(edge_inputs, random_fp, encode_fp_input, map_to_g1,
+                            encode_g1_point, "bls_mapg1_corpus")
+
+
+def gen_MAPG2_corpus():
+  edge_inputs = map_edge_inputs(fp2_sqrt, fp2_neg, fp2_inv, ISO_3_Z, FP2_ZERO,
+                                FP2_ONE)
+  yield from gen_map_corpus(edge_inputs, random_fp2, encode_fp2_input,
+                            map_to_g2, encode_g2_point, "bls_mapg2_corpus")
+
+
+# number of vectors of each section of non subgroup corpus
+NON_SUBGROUP_CORPUS_VECTORS = 1000
+
+
+# generates pairing vectors of distinct points that are not in correct
+# subgroup, each is paired with generator of the other group
+# subgroup check of a point is left to the shard that owns its vector
+def gen_non_subgroup_corpus(multiples, gen, is_in_correct_subgroup, encode_pair,
+                            error, name):
+
+  def vector(i, rng):
+    p = point_not_in_correct_subgroup(multiples, gen, i)
+    assert is_in_correct_subgroup(p) is False
+    return make_fail_vector(encode_pair(p), error, "{}_{}".format(name, i))
+
+  for i in range(NON_SUBGROUP_CORPUS_VECTORS):
+    yield functools.partial(vector, i)
+
+
+def gen_PAIRING_g1_non_subgroup_corpus():
+  yield from gen_non_subgroup_corpus(
+      g1_torsion_multiples(), J_G1, g1_is_in_correct_subgroup,
+      lambda p: encode_g1_point_g2_point_pair(p, G2), ERROR_POINT_G1_SUBGROUP,
+      "bls_pairing_g1_non_subgroup_corpus")
+
+
+def gen_PAIRING_g2_non_subgroup_corpus():
+  yield from gen_non_subgroup_corpus(
+      g2_torsion_multiples(), J_G2, g2_is_in_correct_subgroup,
+      lambda p: encode_g1_point_g2_point_pair(G1, p), ERROR_POINT_G2_SUBGROUP,
+      "bls_pairing_g2_non_subgroup_corpus")
+
+
+# sections in the order they are written to the output file
+# each section is go variable name, go type, precompile address, generator and
+# matter csv that is appended
+SECTIONS = [
+    ("blsG1ADDTests", "precompiledTest", 0x0a, gen_G1ADD_tests, "g1_add"),
+    ("blsG1MULTests", "precompiledTest", 0x0b, gen_G1MUL_tests, "g1_mul"),
+    ("blsG1MULTIEXPTests", "precompiledTest", 0x0c, gen_G1MULTIEXP_tests,
+     "g1_multiexp"),
+    ("blsG2ADDTests", "precompiledTest", 0x0d, gen_G2ADD_tests, "g2_add"),
+    ("blsG2MULTests", "precompiledTest", 0x0e, gen_G2MUL_tests, "g2_mul"),
+    ("blsG2MULTIEXPTests", "precompiledTest", 0x0f, gen_G2MULTIEXP_tests,
+     "g2_multiexp"),
+    ("blsPAIRINGTests", "precompiledTest", 0x10, gen_PAIRING_tests, "pairing"),
+    ("blsMAPG1Tests", "precompiledTest", 0x11, gen_MAPG1_tests, "fp_to_g1"),
+    ("blsMAPG2Tests", "precompiledTest", 0x12, gen_MAPG2_tests, "fp2_to_g2"),
+    ("blsG1ADDFailTests", "precompiledFailureTest", 0x0a, gen_G1ADD_fail_tests,
+     None),
+    ("blsG1MULFailTests", "precompiledFailureTest", 0x0b, gen_G1MUL_fail_tests,
+     None),
+    ("blsG1MULTIEXPFailTests", "precompiledFailureTest", 0x0c,
+     gen_G1MULTIEXP_fail_tests, None),
+    ("blsG2ADDFailTests", "precompiledFailureTest", 0x0d, gen_G2ADD_fail_tests,
+     None),
+    ("blsG2MULFailTests", "precompiledFailureTest", 0x0e, gen_G2MUL_fail_tests,
+     None),
+    ("blsG2MULTIEXPFailTests", "precompiledFailureTest", 0x0f,
+     gen_G2MULTIEXP_fail_tests, None),
+    ("blsPAIRINGFailTests", "precompiledFailureTest", 0x10,
+     gen_PAIRING_fail_tests, None),
+    ("blsMAPG1FailTests", "precompiledFailureTest", 0x11, gen_MAPG1_fail_tests,
+     None),
+    ("blsMAPG2FailTests", "precompiledFailureTest", 0x12, gen_MAPG2_fail_tests,
+     None),
+]
+
+# sections of gas calibration corpus of multiexp discount table
+MULTIEXP_CALIBRATION_SECTIONS = [
+    ("blsG1MultiExpCalibration", "precompiledTest", 0x0c,
+     gen_G1MULTIEXP_calibration, None),
+    ("blsG2MultiExpCalibration", "precompiledTest", 0x0f,
+     gen_G2MULTIEXP_calibration, None),
+]
+
+# sections of gas calibration corpus of pairing base and per pair gas
+PAIRING_CALIBRATION_SECTIONS = [
+    ("blsPairingCalibration", "precompiledTest", 0x10, gen_PAIRING_calibration,
+     None),
+]
+
+# sections of worst case latency corpus, scalars of multiplications and
+# position of invalid points in multi pair inputs
+LATENCY_SECTIONS = [
+    ("blsG1MulLatency", "precompiledTest", 0x0b, gen_G1MUL_latency, None),
+    ("blsG2MulLatency", "precompiledTest", 0x0e, gen_G2MUL_latency, None),
+    ("blsG1MultiExpLatency", "precompiledFailureTest", 0x0c,
+     gen_G1MULTIEXP_latency, None),
+    ("blsG2MultiExpLatency", "precompiledFailureTest", 0x0f,
+     gen_G2MULTIEXP_latency, None),
+    ("blsPairingLatency", "precompiledFailureTest", 0x10, gen_PAIRING_latency,
+     None),
+]
+
+# sections of map to curve corpus
+MAP_SECTIONS = [
+    ("blsMapG1Corpus", "precompiledTest", 0x11, gen_MAPG1_corpus, None),
+    ("blsMapG2Corpus", "precompiledTest", 0x12, gen_MAPG2_corpus, None),
+]
+
+# sections of non subgroup corpus, pairing inputs with distinct points that
+# are on curve but not in correct subgroup
+NON_SUBGROUP_SECTIONS = [
+    ("blsPairingG1NonSubgroup", "precompiledFailureTest", 0x10,
+     gen_PAIRING_g1_non_subgroup_corpus, None),
+    ("blsPairingG2NonSubgroup", "precompiledFailureTest", 0x10,
+     gen_PAIRING_g2_non_subgroup_corpus, None),
+]
+
+# sections of each corpus, api vectors are the ones tests use and the others
+# are only written as binary corpora into testdata/<corpus>.bin
+CORPORA = {
+    "api": SECTIONS,
+    "multiexp_calibration": MULTIEXP_CALIBRATION_SECTIONS,
+    "pairing_calibration": PAIRING_CALIBRATION_SECTIONS,
+    "latency": LATENCY_SECTIONS,
+    "map": MAP_SECTIONS,
+    "non_subgroup": NON_SUBGROUP_SECTIONS,
+}
+
+# sources that any section may depend on
+SOURCES = [
+    "gen_eip2537_api_tests.py", "eip2537_encoding.py", "eip2537_gas.py",
+    "bls_field.py", "bls_curve.py", "bls_pairing.py", "bls_map.py"
+]
+
+# default directory of generated sections
+CACHE_DIR = os.path.join(HERE, ".vector_cache")
+
+
+# returns cache key of a section
+# key is a hash of generator sources, matter csv of the section, py_ecc
+# version and seed so a section is regenerated only when one of them changes
+def section_key(section, fmt, seed=0):
+  # importlib.metadata is slow to import and only needed for generation
+  import importlib.metadata
+  var_name, _, _, _, matter = section
+  h = hashlib.sha256()
+  paths = [os.path.join(HERE, source) for source in SOURCES]
+  paths += [matter_csv_path(matter)] if matter else []
+  for path in paths:
+    with open(path, "rb") as f:
+      h.update(f.read())
+  h.update(importlib.metadata.version("py_ecc").encode())
+  h.update(str(seed).encode())
+  return "{}-{}.{}".format(var_name, h.hexdigest()[:32], fmt)
+
+
+# returns random generator of a vector
+# it is seeded with the seed of the run, section name and index of the vector
+# in the section so a vector does not depend on the shard that builds it
+def vector_rng(seed, var_name, index):
+  h = hashlib.sha256("{}/{}/{}".format(seed, var_name, index).encode())
+  return random.Random(h.digest())
+
+
+# yields (index, vector) pairs of a section that belong to given shard
+# generators yield either vectors or functions that build a vector from a
+# random generator of vector_rng, such functions are called only by the shard
+# that owns the index so that large random corpora are split between shards
+# only vectors with start <= index < end are yielded when a range is given
+def section_vectors(section, seed=0, shard=0, n_shards=1, start=0, end=None):
+  gen = section[3]
+  for index, vector in enumerate(itertools.islice(gen(), start, end), start):
+    if index % n_shards != shard:
+      continue
+    yield index, build_vector(section, seed, index, vector)
+
+
+# returns vector of given index of a section from what its generator yielded,
+# which is either the vector or a function that builds it
+def build_vector(section, seed, index, vector):
+  if callable(vector):
+    return vector(vector_rng(seed, section[0], index))
+  return vector
+
+
+# returns number of vectors of a section, vectors that are built by functions
+# are counted without being built
+def section_length(section):
+  return sum(1 for _ in section[3]())
+
+
+# returns (start, end) index ranges of a section that is split between jobs
+# workers, a chunk replays the generator up to its start so there is one chunk
+# per worker and each of them replays it once
+def section_chunks(n, jobs):
+  size = max(1, -(-n // jobs))
+  return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def go_section_start(section):
+  var_name, test_type, _, _, _ = section
+  return "\nvar {} = []{}{{\n".format(var_name, test_type).encode()
+
+
+# writes (index, vector) pairs of a section as go literals, every vector but
+# the first one of the section starts on a new line
+def write_go_vectors(f, section, vectors):
+  op = section[2]
+  for index, vector in vectors:
+    if index != 0:
+      f.write(b"\n")
+    f.write(format_go_vector(op, vector).encode())
+
+
+def write_binary_vectors(f, section, vectors):
+  op = section[2]
+  for _, vector in vectors:
+    f.write(encode_binary_vector(op, vector))
+
+
+# bytes a section starts with, writer of its vectors and bytes it ends with
+# for each output format
+SECTION_FORMATS = {
+    "go": (go_section_start, write_go_vectors, b"\n}"),
+    "binary": (lambda section: b"", write_binary_vectors, b""),
+}
+
+
+# streams (index, vector) pairs of a section into given file
+# each vector is written as soon as it is generated so memory usage does not
+# depend on the number of vectors in a section
+def write_section(f, section, fmt, vectors):
+  section_start, write_vectors, section_end = SECTION_FORMATS[fmt]
+  f.write(section_start(section))
+  write_vectors(f, section, vectors)
+  f.write(section_end)
+
+
+# writes a section into its own file
+# file is moved to its path only when the section is complete so that an
+# interrupted run does not leave a partial section in the cache
+def run_section(section, path, fmt, seed=0):
+  with open(path + ".tmp", "wb") as f:
+    write_section(f, section, fmt, section_vectors(section, seed))
+  os.replace(path + ".tmp", path)
+  return path
+
+
+# writes vectors start <= index < end of a section into a chunk file in a
+# worker process, chunk files of a section are joined by join_section_chunks
+def run_section_chunk(section, start, end, path, fmt, seed=0):
+  _, write_vectors, _ = SECTION_FORMATS[fmt]
+  with open(path, "wb") as f:
+    write_vectors(f, section,
+                  section_vectors(section, seed, start=start, end=end))
+  return path
+
+
+# joins chunk files of a section in order into the section file
+def join_section_chunks(section, chunk_paths, path, fmt):
+  section_start, _, section_end = SECTION_FORMATS[fmt]
+  with open(path + ".tmp", "wb") as f:
+    f.write(section_start(section))
+    for chunk_path in chunk_paths:
+      with open(chunk_path, "rb") as chunk:
+        shutil.copyfileobj(chunk, f)
+    f.write(section_end)
+  os.replace(path + ".tmp", path)
+
+
+# removes cached files of a section other than the given one
+def prune_section_cache(cache_dir, var_name, fmt, keep):
+  for entry in os.listdir(cache_dir):
+    if entry != keep and entry.startswith(var_name +
+                                          "-") and entry.endswith("." + fmt):
+      os.remove(os.path.join(cache_dir, entry))
+
+
+# precompile address, name used in go test variables and name of output files
+# of embedded format
+OPS = [
+    (0x0a, "G1Add", "g1_add"),
+    (0x0b, "G1Mul", "g1_mul"),
+    (0x0c, "G1MultiExp", "g1_multiexp"),
+    (0x0d, "G2Add", "g2_add"),
+    (0x0e, "G2Mul", "g2_mul"),
+    (0x0f, "G2MultiExp", "g2_multiexp"),
+    (0x10, "Pairing", "pairing"),
+    (0x11, "MapG1", "map_g1"),
+    (0x12, "MapG2", "map_g2"),
+]
+
+# go file of an operation in embedded format
+EMBED_GO_FILE = """package eip2537
+
+import _ "embed"
+
+//go:embed testdata/{file}.bin
+var bls{name}Corpus []byte
+
+var bls{name}Tests, bls{name}FailTests = decodeCorpus(bls{name}Corpus)
+"""
+
+
+# returns go file and data file paths of an operation in embedded format
+def embed_paths(out_dir, file):
+  return (os.path.join(out_dir, "vectors_{}_test.go".format(file)),
+          os.path.join(out_dir, "testdata", "{}.bin".format(file)))
+
+
+# writes a binary corpus and a small go file that embeds it for each operation
+# of given sections
+# corpus of an operation has records of both its success and failure sections
+# single vectors_test.go file declares the same variables so it is removed
+def write_embed_output(sections, paths, out_dir):
+  os.makedirs(os.path.join(out_dir, "testdata"), exist_ok=True)
+  ops = set(section[2] for section in sections)
+  for op, name, file in OPS:
+    if op not in ops:
+      continue
+    go_path, data_path = embed_paths(out_dir, file)
+    with open(data_path, "wb") as f:
+      f.write(CORPUS_MAGIC)
+      for section, path in zip(sections, paths):
+        if section[2] == op:
+          with open(path, "rb") as part:
+            shutil.copyfileobj(part, f)
+    with open(go_path, "w") as f:
+      f.write(EMBED_GO_FILE.format(name=name, file=file))
+  go_path = os.path.join(out_dir, "vectors_test.go")
+  if os.path.exists(go_path):
+    os.remove(go_path)
+
+
+# concatenates go sections into a go source file
+# go files of embedded format declare the same variables so the ones of
+# operations of given sections are removed
+def write_go_output(sections, paths, out):
+  ops = set(section[2] for section in sections)
+  for _, _, file in (op for op in OPS if op[0] in ops):
+    for path in embed_paths(os.path.dirname(out), file):
+      if os.path.exists(path):
+        os.remove(path)
+  with open(out, "wb") as f:
+    f.write(b"package eip2537\n")
+    for path in paths:
+      with open(path, "rb") as part:
+        shutil.copyfileobj(part, f)
+
+
+# section format, output writer and default output path of formats
+OUTPUTS = {
+    "go": ("go", write_go_output, os.path.join(HERE, "..", "vectors_test.go")),
+    "binary": ("binary", write_binary_output,
+               os.path.join(HERE, "..", "testdata", "vectors.bin")),
+    "embed": ("binary", write_embed_output, os.path.join(HERE, "..")),
+}
+
+
+# returns sections of given operations of a corpus in their order
+# all sections are returned if ops is None
+def select_sections(ops, corpus="api"):
+  if ops is None:
+    return CORPORA[corpus]
+  addresses = [op for op, _, file in OPS if file in ops]
+  return [section for section in CORPORA[corpus] if section[2] in addresses]
+
+
+# returns section format, output writer and default output path of a format
+def select_output(fmt, corpus="api"):
+  if corpus == "api":
+    return OUTPUTS[fmt]
+  assert fmt == "binary", "{} corpus is only written as binary".format(corpus)
+  fmt, write_output, _ = OUTPUTS[fmt]
+  return fmt, write_output, os.path.join(HERE, "..", "testdata",
+                                         corpus + ".bin")
+
+
+# generates sections of given operations, all of them by default, and writes
+# them to the output file, default output path of the format is used if out
+# is not given
+# each section is written into a file in cache directory named by its key and
+# sections that are already there are not generated again, without a cache
+# directory sections are written into a temporary directory
+# when jobs is larger than one sections are split into a chunk per worker
+# that are generated in a process pool so that a large section is spread over
+# all workers, chunks are joined in order and sections
+# are appended to the output in the order of SECTIONS so output is
+# deterministic
+# returns names of the sections that are generated
+def generate_vectors(jobs=1,
+                     cache_dir=None,
+                     fmt="go",
+                     ops=None,
+                     out=None,
+                     seed=0,
+                     corpus="api"):
+  fmt, write_output, default_out = select_output(fmt, corpus)
+  out = out or default_out
+  sections = select_sections(ops, corpus)
+  with tempfile.TemporaryDirectory() as tmp:
+    if cache_dir is None:
+      cache_dir = tmp
+    os.makedirs(cache_dir, exist_ok=True)
+    keys = [section_key(section, fmt, seed) for section in sections]
+    paths = [os.path.join(cache_dir, key) for key in keys]
+    missing = [(section, path)
+               for section, path in zip(sections, paths)
+               if not os.path.exists(path)]
+    if jobs > 1 and missing:
+      chunk_dir = os.path.join(tmp, "chunks")
+      os.makedirs(chunk_dir)
+      joins, futures = [], []
+      with ProcessPoolExecutor(max_workers=jobs,
+                               initializer=use_constants_cache,
+                               initargs=(USE_CONSTANTS_CACHE,)) as executor:
+        for section, path in missing:
+          chunk_paths = []
+          for start, end in section_chunks(section_length(section), jobs):
+            chunk_path = os.path.join(chunk_dir,
+                                      "{}-{}".format(section[0], start))
+            futures.append(
+                executor.submit(run_section_chunk, section, start, end,
+                                chunk_path, fmt, seed))
+            chunk_paths.append(chunk_path)
+          joins.append((section, chunk_paths, path))
+        for future in futures:
+          future.result()
+      for section, chunk_paths, path in joins:
+        join_section_chunks(section, chunk_paths, path, fmt)
+    else:
+      for section, path in missing:
+        run_section(section, path, fmt, seed)
+    for section, key in zip(sections, keys):
+      prune_section_cache(cache_dir, section[0], fmt, key)
+
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    write_output(sections, paths, out)
+
+  return [section[0] for section, _ in missing]
+
+
+# counts field operations of each vector of selected sections
+# setup counts of a section are the ones its generator does before it yields
+# the first vector, such as building tables and bases shared by its vectors,
+# counts of a vector are the ones done since previous vector of its section or
+# the setup was done
+# fixed base tables and cached constants are dropped before each section and
+# constants are not loaded from disk so that its counts do not depend on
+# sections or runs that were generated before
+# returns a dict with counts of each section, its setup and each of its vectors
+def count_field_ops(ops=None, seed=0, corpus="api"):
+  from bls_counters import counting
+  sections = []
+  with counting([sys.modules[__name__]]) as counts, without_constants_cache():
+    for section in select_sections(ops, corpus):
+      fixed_base_tables.clear()
+      clear_cached_constants()
+      start = counts.copy()
+      items = section[3]()
+      first = list(itertools.islice(items, 1))
+      setup = counts - start
+      vectors = []
+      vector_start = counts.copy()
+      for index, item in enumerate(itertools.chain(first, items)):
+        vector = build_vector(section, seed, index, item)
+        vectors.append({
+            "name": vector[3],
+            "counts": dict(sorted((counts - vector_start).items()))
+        })
+        vector_start = counts.copy()
+      sections.append({
+          "name": section[0],
+          "counts": dict(sorted((counts - start).items())),
+          "setup": dict(sorted(setup.items())),
+          "vectors": vectors
+      })
+  return {"corpus": corpus, "seed": seed, "sections": sections}
+
+
+# writes vectors of given shard of the selected sections as json lines
+# first line describes the run and each following line is a vector record
+# [section name, index, inputs, expecteds, error, name]
+def generate_shard(shard, n_shards, out, ops=None, seed=0, corpus="api"):
+  assert 0 <= shard < n_shards
+  sections = select_sections(ops, corpus)
+  with open(out, "w") as f:
+    header = {
+        "shard": shard,
+        "shards": n_shards,
+        "seed": seed,
+        "corpus": corpus,
+        "sections": [section[0] for section in sections],
+    }
+    f.write(json.dumps(header) + "\n")
+    for section in sections:
+      for index, vector in section_vectors(section, seed, shard, n_shards):
+        f.write(json.dumps([section[0], index] + list(vector)) + "\n")
+
+
+# yields (section name, index, vector) records of a shard file that follow
+# its header line
+def shard_records(f):
+  for line in f:
+    var_name, index, inputs, expecteds, error, name = json.loads(line)
+    yield var_name, index, (inputs, expecteds, error, name)
+
+
+# merges shard files of a run into the output a single run would write
+# shards must be generated with the same shard count, seed, corpus and
+# operations and every shard must be given exactly once
+# vector i of a section is in shard i % n and each shard lists the vectors of
+# a section in index order, so vectors are taken from shards in round robin
+# and written one by one without holding a section in memory
+# format defaults to go for api corpus and binary for the others
+def merge_shards(shard_paths, fmt=None, out=None):
+  with contextlib.ExitStack() as stack:
+    files = [stack.enter_context(open(path)) for path in shard_paths]
+    headers = [json.loads(f.readline()) for f in files]
+    header = dict(headers[0], shard=None)
+    assert all(
+        dict(h, shard=None) == header for h in headers), "mismatched shards"
+    assert sorted(h["shard"] for h in headers) == list(range(
+        header["shards"])), "missing or repeated shards"
+    readers = [
+        shard_records(f)
+        for _, f in sorted(zip(headers, files), key=lambda e: e[0]["shard"])
+    ]
+    pending = [next(reader, None) for reader in readers]
+
+    # yields (index, vector) pairs of a section in index order
+    def section_records(var_name):
+      index = 0
+      while True:
+        shard = index % len(readers)
+        record = pending[shard]
+        if record is None or record[0] != var_name:
+          break
+        assert record[1] == index, "{}: missing vector {}".format(
+            var_name, index)
+        yield index, record[2]
+        pending[shard] = next(readers[shard], None)
+        index += 1
+      assert all(r is None or r[0] != var_name for r in pending), var_name
+
+    corpus = header["corpus"]
+    fmt = fmt or ("go" if corpus == "api" else "binary")
+    sections = [
+        section for section in CORPORA[corpus]
+        if section[0] in header["sections"]
+    ]
+
+    fmt, write_output, default_out = select_output(fmt, corpus)
+    with tempfile.TemporaryDirectory() as tmp:
+      paths = []
+      for section in sections:
+        path = os.path.join(tmp, section[0])
+        with open(path, "wb") as f:
+          write_section(f, section, fmt, section_records(section[0]))
+        paths.append(path)
+      assert all(r is None for r in pending), "records of unknown sections"
+      out = out or default_out
+      os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+      write_output(sections, paths, out)
+
+
+# hash to field function, input encoder and default domain separation tag of
+# map operations
+HASH_TO_FIELD = {
+    "map_g1": (hash_to_fp, encode_fp_input, DST_G1),
+    "map_g2": (hash_to_fp2, encode_fp2_input, DST_G2),
+}
+
+# number of messages whose inputs are written at once
+HASH_BATCH = 4096
+
+
+# hashes messages of a file, one message per line without line ending, to
+# field elements and writes them as inputs of map operations into
+# hashed_<op>.bin files of out_dir, by default into testdata/
+# inputs are concatenated without a header, each message gives two inputs
+# messages are read and inputs are written in batches so memory usage does
+# not depend on the number of messages
+# returns number of messages
+def hash_messages(messages_path, ops=None, out_dir=None, dst=None):
+  ops = [op for op in (ops or HASH_TO_FIELD) if op in HASH_TO_FIELD]
+  assert ops, "messages are only hashed for map operations"
+  out_dir = out_dir or os.path.join(HERE, "..", "testdata")
+  os.makedirs(out_dir, exist_ok=True)
+  outs = [
+      open(os.path.join(out_dir, "hashed_{}.bin".format(op)), "wb")
+      for op in ops
+  ]
+  n = 0
+  try:
+    with open(messages_path, "rb") as f:
+      while True:
+        batch = [
+            line.rstrip(b"\r\n") for line in itertools.islice(f, HASH_BATCH)
+        ]
+        if not batch:
+          break
+        for op, out in zip(ops, outs):
+          hash_to_field, encode_input, default_dst = HASH_TO_FIELD[op]
+          words = []
+          for msg in batch:
+            for u in hash_to_field(msg, dst or default_dst):
+              words.extend(encode_input(u))
+          out.write(bytes.fromhex("".join(words)))
+        n += len(batch)
+  finally:
+    for out in outs:
+      out.close()
+  return n
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Generates EIP2537 test vectors")
+  parser.add_argument("--jobs",
+                      type=int,
+                      default=1,
+                      help="number of worker processes, 0 uses all cores")
+  parser.add_argument("--cache-dir",
+                      default=CACHE_DIR,
+                      help="directory of generated sections")
+  parser.add_argument("--no-cache",
+                      action="store_true",
+                      help="generate all sections and constants without "
+                      "reading or writing the cache")
+  parser.add_argument("--format",
+                      choices=sorted(OUTPUTS),
+                      help="go source, binary corpus with json index or go "
+                      "files per operation that embed binary corpora, "
+                      "defaults to go for api corpus and binary for others")
+  parser.add_argument("--corpus",
+                      choices=sorted(CORPORA),
+                      default="api",
+                      help="api test vectors or one of the binary corpora")
+  parser.add_argument("--ops",
+                      nargs="+",
+                      choices=[file for _, _, file in OPS],
+                      help="operations to generate, all of them by default")
+  parser.add_argument("--out",
+                      help="output file, or output directory of embed format, "
+                      "defaults to the repository root")
+  parser.add_argument("--seed",
+                      type=int,
+                      default=0,
+                      help="seed of random vectors")
+  parser.add_argument("--shard",
+                      help="generate only shard i of n given as i/n into a "
+                      "shard file")
+  parser.add_argument("--merge",
+                      nargs="+",
+                      metavar="SHARD",
+                      help="merge shard files into the output")
+  parser.add_argument("--count-ops",
+                      metavar="PATH",
+                      help="write field operation counts of each vector and "
+                      "section as json instead of generating the output")
+  parser.add_argument("--hash-messages",
+                      metavar="PATH",
+                      help="hash messages of a file, one per line, to inputs "
+                      "of map operations written into hashed_<op>.bin files "
+                      "of --out directory, defaults to testdata/")
+  parser.add_argument("--verify-matter",
+                      nargs="*",
+                      metavar="CSV",
+                      help="recompute results of matter csv files, all files "
+                      "of matter/ by default, and report mismatching rows, "
+                      "file names start with the operation such as g1_add")
+  parser.add_argument("--ingest",
+                      nargs="+",
+                      metavar="FILE",
+                      help="ingest csv, json or json lines vector sets into a "
+                      "binary corpus, --out defaults to testdata/ingested.bin")
+  parser.add_argument("--ingest-op",
+                      choices=[file for _, _, file in OPS],
+                      help="operation of --ingest files, taken from their "
+                      "names by default")
+  parser.add_argument("--dst",
+                      help="domain separation tag of --hash-messages, "
+                      "defaults to the ones of BLS signature suites")
+  args = parser.parse_args()
+  if args.no_cache:
+    use_constants_cache(False)
+  if args.count_ops:
+    with open(args.count_ops, "w") as f:
+      json.dump(count_field_ops(args.ops, args.seed, args.corpus), f, indent=2)
+      f.write("\n")
+  elif args.verify_matter is not None:
+    n, mismatches = verify_matter_csvs(args.verify_matter, args.jobs or
+                                       os.cpu_count())
+    for path, i, expected, result in mismatches:
+      print("{}:{}: expected {}, got {}".format(path, i, expected, result))
+    print("{} rows verified, {} mismatches".format(n, len(mismatches)))
+    if mismatches:
+      raise SystemExit(1)
+  elif args.ingest:
+    from eip2537_ingest import ingest_vector_sets
+    out = args.out or os.path.join(HERE, "..", "testdata", "ingested.bin")
+    stats, rejected = ingest_vector_sets(args.ingest, out, args.ingest_op)
+    for path, i, reason in rejected:
+      print("{}:{}: {}".format(path, i, reason))
+    print("{records} records, {written} written, {duplicates} duplicates, "
+          "{conflicts} conflicting duplicates, ".format(**stats) +
+          "{} rejected".format(len(rejected)))
+  elif args.hash_messages:
+    dst = args.dst.encode() if args.dst else None
+    hash_messages(args.hash_messages, args.ops, args.out, dst)
+  elif args.shard:
+    shard, n_shards = (int(e) for e in args.shard.split("/"))
+    out = args.out or "shard-{}-of-{}.jsonl".format(shard, n_shards)
+    generate_shard(shard, n_shards, out, args.ops, args.seed, args.corpus)
+  elif args.merge:
+    merge_shards(args.merge, args.format, args.out)
+  else:
+    fmt = args.format or ("go" if args.corpus == "api" else "binary")
+    generate_vectors(args.jobs or os.cpu_count(),
+                     None if args.no_cache else args.cache_dir, fmt, args.ops,
+                     args.out, args.seed, args.corpus)
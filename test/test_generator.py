@@ -0,0 +1,32 @@
+'''
+Checks of the EIP2537 test vector generator that pytest collects, run from
+test/ with python -m pytest test_generator.py.
+'''
+
+import os
+import tempfile
+from gen_eip2537_api_tests import generate_vectors
+
+
+# regenerating some of the cached sections in a process pool keeps the cached
+# files of the others and writes the same output as a full run
+def test_partial_cache_regeneration():
+  ops = ["g1_add", "map_g2"]
+  with tempfile.TemporaryDirectory() as tmp:
+    cache_dir = os.path.join(tmp, "cache")
+    full, partial = os.path.join(tmp,
+                                 "full.go"), os.path.join(tmp, "partial.go")
+    generate_vectors(cache_dir=cache_dir, ops=ops, out=full)
+    cached = sorted(os.listdir(cache_dir))
+    removed = ["blsG1ADDTests", "blsMAPG2FailTests"]
+    for entry in cached:
+      if entry.split("-")[0] in removed:
+        os.remove(os.path.join(cache_dir, entry))
+    generated = generate_vectors(jobs=4,
+                                 cache_dir=cache_dir,
+                                 ops=ops,
+                                 out=partial)
+    assert sorted(generated) == removed
+    assert sorted(os.listdir(cache_dir)) == cached
+    with open(full, "rb") as f, open(partial, "rb") as g:
+      assert f.read() == g.read()